@@ -0,0 +1,175 @@
+"""
+Artifact storage for screenshots, annotated renders and detection sidecars.
+
+- identical consecutive frames in a folder are written once (the earlier path is reused)
+- frames are encoded with a fast, configurable codec (ARTIFACT_CODEC=png|webp|jpeg)
+- finished articles can be packed into one zip (ARTIFACT_PACK=1)
+- size/age retention is enforced over `screenshots/` (ARTIFACT_MAX_GB, ARTIFACT_MAX_AGE_DAYS)
+"""
+import hashlib, json, shutil, time, zipfile
+from pathlib import Path
+from PIL import Image
+from .config import Settings
+
+CODECS = {
+    # suffix, PIL format, save kwargs builder (quality 1..100)
+    "png": (".png", "PNG", lambda q: {"compress_level": 1}),
+    "webp": (".webp", "WEBP", lambda q: {"quality": q, "method": 0}),
+    "jpeg": (".jpg", "JPEG", lambda q: {"quality": q, "optimize": False}),
+}
+# generated images are pipeline inputs, never expire them
+KEEP = {"generated_images"}
+
+class ArtifactStore:
+    def __init__(self, codec="png", quality=80, dedup=True):
+        if codec not in CODECS:
+            raise ValueError(f"Unknown artifact codec {codec!r} (expected one of {sorted(CODECS)})")
+        self.suffix, self._format, kwargs = CODECS[codec]
+        self._save_kwargs = kwargs(quality)
+        self.codec = codec
+        self.dedup = dedup
+        self._dirs = set()
+        self._last = {}  # folder -> (digest, path)
+        self.frames = self.deduped = self.files = 0
+        self.last_deduped = False
+        self.bytes_written = 0
+        self.write_seconds = 0.0
+
+    def _ensure_dir(self, folder: Path):
+        if folder not in self._dirs:
+            folder.mkdir(parents=True, exist_ok=True)
+            self._dirs.add(folder)
+
+    def _encode(self, im: Image.Image, path: Path) -> Path:
+        t0 = time.perf_counter()
+        im.save(path, format=self._format, **self._save_kwargs)
+        self.write_seconds += time.perf_counter() - t0
+        self.bytes_written += path.stat().st_size
+        self.files += 1
+        return path
+
+    def save_frame(self, im: Image.Image, folder: str | Path, stem: str) -> Path:
+        """
+        Write a captured frame as `<folder>/<stem><suffix>`, or return the previous path if unchanged
+        (`last_deduped` tells which, so callers can skip work they already did for that frame).
+        """
+        folder = Path(folder)
+        self._ensure_dir(folder)
+        self.frames += 1
+        digest = hashlib.blake2b(im.tobytes(), digest_size=16).digest() if self.dedup else None
+        last = self._last.get(folder)
+        self.last_deduped = bool(digest is not None and last and last[0] == digest and last[1].exists())
+        if self.last_deduped:
+            self.deduped += 1
+            return last[1]
+        path = folder / f"{stem}{self.suffix}"
+        n = 0
+        while path.exists():  # virtual clocks can take several frames within one millisecond
+            n += 1
+            path = folder / f"{stem}_{n}{self.suffix}"
+        self._encode(im, path)
+        self._last[folder] = (digest, path)
+        return path
+
+    def save_render(self, bgr, path_stem: Path) -> Path:
+        """Write a BGR numpy render (e.g. `Results.plot()`) next to a frame."""
+        path_stem = Path(path_stem)
+        self._ensure_dir(path_stem.parent)
+        return self._encode(Image.fromarray(bgr[:, :, ::-1]), path_stem.with_name(path_stem.name + self.suffix))
+
+    def save_json(self, obj, path: Path) -> Path:
+        path = Path(path)
+        self._ensure_dir(path.parent)
+        t0 = time.perf_counter()
+        data = json.dumps(obj, separators=(",", ":")).encode("utf-8")
+        path.write_bytes(data)
+        self.write_seconds += time.perf_counter() - t0
+        self.bytes_written += len(data)
+        self.files += 1
+        return path
+
+    def pack(self, folder: Path) -> Path | None:
+        """Pack a finished article folder into `<folder>.zip` and remove the folder."""
+        folder = Path(folder)
+        if not folder.is_dir():
+            return None
+        archive = folder.with_name(folder.name + ".zip")
+        with zipfile.ZipFile(archive, "w") as zf:
+            for p in sorted(folder.rglob("*")):
+                if p.is_file():
+                    # encoded images do not shrink further; only deflate the text sidecars
+                    method = zipfile.ZIP_DEFLATED if p.suffix in (".json", ".txt") else zipfile.ZIP_STORED
+                    zf.write(p, p.relative_to(folder.parent), compress_type=method)
+        shutil.rmtree(folder)
+        self._dirs = {d for d in self._dirs if folder not in (d, *d.parents)}
+        self._last = {d: v for d, v in self._last.items() if folder not in (d, *d.parents)}
+        return archive
+
+    def enforce_retention(self, root: Path, max_bytes: int | None = None, max_age_days: float | None = None,
+                          exclude=()) -> int:
+        """
+        Delete the oldest article folders/archives under `root`; returns bytes freed. Folders are
+        aged by their newest file (writes land in subfolders); `exclude` holds folders in use.
+        """
+        root = Path(root)
+        if not root.is_dir() or (max_bytes is None and max_age_days is None):
+            return 0
+        exclude = {Path(p) for p in exclude}
+        entries = []
+        for p in root.iterdir():
+            if p.name in KEEP:
+                continue
+            st = p.stat()
+            size, mtime = st.st_size, st.st_mtime
+            if p.is_dir():
+                size = 0
+                for f in p.rglob("*"):
+                    fst = f.stat()
+                    mtime = max(mtime, fst.st_mtime)
+                    if f.is_file():
+                        size += fst.st_size
+            entries.append((mtime, size, p))
+        entries.sort()
+        total = sum(size for _, size, _ in entries)
+        cutoff = time.time() - max_age_days * 86400 if max_age_days is not None else None
+        freed = 0
+        for mtime, size, p in entries:
+            too_old = cutoff is not None and mtime < cutoff
+            too_big = max_bytes is not None and total > max_bytes
+            if not (too_old or too_big) or p in exclude:
+                continue
+            if p.is_dir():
+                shutil.rmtree(p)
+            else:
+                p.unlink()
+            self._dirs = {d for d in self._dirs if p not in (d, *d.parents)}
+            total -= size
+            freed += size
+        return freed
+
+    def report(self) -> dict:
+        mb = self.bytes_written / 1e6
+        return {
+            "codec": self.codec,
+            "frames": self.frames,
+            "deduped": self.deduped,
+            "files_written": self.files,
+            "mb_written": round(mb, 2),
+            "write_mb_per_s": round(mb / self.write_seconds, 1) if self.write_seconds else 0.0,
+        }
+
+def disk_usage(root: Path) -> int:
+    return sum(f.stat().st_size for f in Path(root).rglob("*") if f.is_file())
+
+_store: ArtifactStore | None = None
+
+def get_store() -> ArtifactStore:
+    global _store
+    if _store is None:
+        s = Settings.default()
+        _store = ArtifactStore(codec=s.artifact_codec, quality=s.artifact_quality, dedup=s.artifact_dedup)
+    return _store
+
+def set_store(store: ArtifactStore | None):
+    global _store
+    _store = store
@@ -0,0 +1,87 @@
+"""
+Microbenchmark of GUI input actions: pyautogui/xclip backend vs the XTest fast mode.
+
+Runs each action N times on a live X display and reports per-action latency. Actions that
+change the page (click, type) are opt-in.
+
+    python -m agent.bench.input --iterations 50
+    python -m agent.bench.input --backends fast --actions move,key,hotkey,copy,paste,type
+"""
+import argparse, json, statistics, sys, time
+from pathlib import Path
+
+from .replay import _percentile
+
+SAFE_ACTIONS = ("move", "key", "hotkey", "scroll", "copy", "paste")
+PROMPT = "Summarise today's trending topic in technology. " * 20  # ~1 KB, like an agent prompt
+
+def _actions(backend):
+    return {
+        "move": lambda i: backend.moveTo(400 + i % 200, 300),
+        "key": lambda i: backend.press("shift"),
+        "hotkey": lambda i: backend.hotkey("ctrl", "shift"),
+        "scroll": lambda i: backend.scroll(1 if i % 2 else -1),
+        "copy": lambda i: backend.copy(f"{i} {PROMPT}"),
+        "paste": lambda i: backend.paste(),
+        "click": lambda i: backend.click(),
+        "type": lambda i: backend.typewrite("chatgpt.com"),
+        "move_click": lambda i: _move_click(backend, i),
+    }
+
+def _move_click(backend, i):
+    with backend.batch():
+        backend.moveTo(400 + i % 200, 300)
+        backend.click()
+
+def bench(backend, actions, iterations=50) -> dict:
+    table = _actions(backend)
+    out = {}
+    for name in actions:
+        fn = table[name]
+        fn(0)  # warm caches (keycodes, selection ownership)
+        lat = []
+        for i in range(iterations):
+            t0 = time.perf_counter()
+            fn(i)
+            lat.append((time.perf_counter() - t0) * 1000)
+        out[name] = {"p50_ms": round(_percentile(lat, 0.5), 3), "p95_ms": round(_percentile(lat, 0.95), 3),
+                     "mean_ms": round(statistics.fmean(lat), 3)}
+    return out
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Per-action latency of the GUI input backends")
+    ap.add_argument("--iterations", type=int, default=50)
+    ap.add_argument("--backends", default="pyautogui,fast", help="comma list of pyautogui,fast")
+    ap.add_argument("--actions", default=",".join(SAFE_ACTIONS),
+                    help="comma list of move,key,hotkey,scroll,copy,paste,click,type,move_click")
+    ap.add_argument("--json", type=Path, help="also write the report to this file")
+    args = ap.parse_args(argv)
+    actions = [a for a in args.actions.split(",") if a]
+
+    report = {}
+    for name in args.backends.split(","):
+        if name == "fast":
+            from ..gui.xfast import XTestBackend
+            backend = XTestBackend()
+        else:
+            from ..gui.backend import PyAutoGuiBackend
+            backend = PyAutoGuiBackend()
+        report[name] = bench(backend, actions, args.iterations)
+        if getattr(backend, "fallbacks", 0):
+            report[name]["fallbacks"] = backend.fallbacks
+
+    names = list(report)
+    print(f"{'action':>12} " + " ".join(f"{n + ' p50/p95 ms':>26}" for n in names)
+          + ("       saved/action" if len(names) == 2 else ""))
+    for action in actions:
+        cells = [f"{report[n][action]['p50_ms']:>12.3f} /{report[n][action]['p95_ms']:>11.3f}" for n in names]
+        saved = ""
+        if len(names) == 2:
+            saved = f"{report[names[0]][action]['mean_ms'] - report[names[1]][action]['mean_ms']:>14.3f} ms"
+        print(f"{action:>12} " + " ".join(f"{c:>26}" for c in cells) + f"  {saved}")
+    if args.json:
+        args.json.write_text(json.dumps(report, indent=2), encoding="utf-8")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
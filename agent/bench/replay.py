@@ -0,0 +1,156 @@
+"""
+Offline replay of recorded screenshot sessions through the vision loop.
+
+Streams frames from `screenshots/<article_id>/<agent>/` through `Detector` and the
+same ready / input-zone decisions used by `wait_for_ready` and `run_agent`, then
+compares them with the `_dets.json` files recorded by `_save_annotated`.
+
+    python -m agent.bench.replay screenshots/article_20250812_101500_123
+    python -m agent.bench.replay screenshots/article_... --weights models/best.onnx --roi 0,700,2560,740
+"""
+import argparse, json, resource, statistics, sys, time
+from pathlib import Path
+
+from ..config import Settings
+from ..vision.decisions import READY_LABELS, found_ready, pick_input_zone
+
+FRAME_SUFFIXES = (".png", ".webp", ".jpg", ".jpeg")
+
+def iter_frames(session: Path):
+    """Yield recorded raw frames (annotated renders and JSON sidecars are skipped), oldest first."""
+    frames = [p for p in session.rglob("screenshot_*")
+              if p.suffix.lower() in FRAME_SUFFIXES and "_ann" not in p.stem]
+    # timestamps are embedded in the file name, so name order is capture order per agent
+    yield from sorted(frames, key=lambda p: (p.parent.as_posix(), p.name))
+
+def load_recorded(frame: Path):
+    sidecar = frame.with_name(f"{frame.stem}_dets.json")
+    if not sidecar.exists():
+        return None
+    try:
+        return json.loads(sidecar.read_text(encoding="utf-8"))
+    except Exception:
+        return None
+
+def _parse_roi(value: str | None):
+    if not value:
+        return None
+    left, top, width, height = (int(v) for v in value.split(","))
+    return {"left": left, "top": top, "width": width, "height": height}
+
+def _offset(dets: dict, roi: dict | None) -> dict:
+    """Translate ROI-relative boxes back into full-frame coordinates."""
+    if not roi:
+        return dets
+    return {cls: [dict(d, center_x=d["center_x"] + roi["left"], center_y=d["center_y"] + roi["top"])
+                  for d in boxes]
+            for cls, boxes in dets.items()}
+
+def _load_frame(frame: Path, roi: dict | None):
+    if not roi:
+        return str(frame)
+    import numpy as np
+    from PIL import Image
+    with Image.open(frame) as im:
+        box = (roi["left"], roi["top"], roi["left"] + roi["width"], roi["top"] + roi["height"])
+        # YOLO expects BGR arrays, same as cv2.imread
+        return np.ascontiguousarray(np.asarray(im.convert("RGB").crop(box))[:, :, ::-1])
+
+def _percentile(values: list[float], q: float) -> float:
+    if not values:
+        return 0.0
+    values = sorted(values)
+    k = (len(values) - 1) * q
+    lo, hi = int(k), min(int(k) + 1, len(values) - 1)
+    return values[lo] + (values[hi] - values[lo]) * (k - lo)
+
+def _zones_agree(a, b, tolerance_px: int) -> bool:
+    if a is None or b is None:
+        return a is None and b is None
+    return (abs(a["center_x"] - b["center_x"]) <= tolerance_px
+            and abs(a["center_y"] - b["center_y"]) <= tolerance_px)
+
+def replay(session: Path, detector, *, conf=0.6, labels=READY_LABELS, roi=None,
+           limit=None, warmup=1, tolerance_px=25) -> dict:
+    frames = list(iter_frames(session))
+    if limit:
+        frames = frames[:limit]
+    if not frames:
+        raise SystemExit(f"❌ No recorded frames under {session}")
+
+    # pay model load / first-inference allocation outside the measured window
+    for frame in frames[:warmup]:
+        detector.detect(_load_frame(frame, roi), conf=conf)
+
+    latencies = []
+    compared = ready_agree = zone_agree = 0
+    ready_frames = 0
+    t0 = time.perf_counter()
+    for frame in frames:
+        image = _load_frame(frame, roi)
+        s = time.perf_counter()
+        _, dets = detector.detect(image, conf=conf)
+        latencies.append((time.perf_counter() - s) * 1000)
+        dets = _offset(dets, roi)
+
+        ready = found_ready(dets, labels)
+        ready_frames += ready
+        recorded = load_recorded(frame)
+        if recorded is None:
+            continue
+        compared += 1
+        ready_agree += ready == found_ready(recorded, labels)
+        zone_agree += _zones_agree(pick_input_zone(dets), pick_input_zone(recorded), tolerance_px)
+    wall = time.perf_counter() - t0
+
+    return {
+        "session": str(session),
+        "frames": len(frames),
+        "wall_seconds": round(wall, 3),
+        "frames_per_second": round(len(frames) / wall, 2) if wall else 0.0,
+        "latency_ms_p50": round(_percentile(latencies, 0.50), 2),
+        "latency_ms_p95": round(_percentile(latencies, 0.95), 2),
+        "latency_ms_mean": round(statistics.fmean(latencies), 2),
+        # ru_maxrss is reported in KiB on Linux
+        "peak_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+        "ready_frames": ready_frames,
+        "compared_frames": compared,
+        "ready_agreement": round(ready_agree / compared, 4) if compared else None,
+        "input_zone_agreement": round(zone_agree / compared, 4) if compared else None,
+    }
+
+def main(argv=None):
+    settings = Settings.default()
+    ap = argparse.ArgumentParser(description="Replay recorded screenshot sessions through the detector")
+    ap.add_argument("session", type=Path, help="screenshots/<article_id> or one of its agent folders")
+    ap.add_argument("--weights", default=settings.weights_path, help="YOLO weights / exported engine")
+    ap.add_argument("--conf", type=float, default=0.6)
+    ap.add_argument("--roi", help="left,top,width,height crop applied before inference")
+    ap.add_argument("--limit", type=int, help="replay at most N frames")
+    ap.add_argument("--warmup", type=int, default=1, help="frames run before timing starts")
+    ap.add_argument("--tolerance", type=int, default=25, help="input_zone center tolerance in px")
+    ap.add_argument("--track", action="store_true", help="put the template-matching tracker in front")
+    ap.add_argument("--track-refresh", type=int, default=10, help="full detection at least every N frames")
+    ap.add_argument("--json", type=Path, help="also write the report to this file")
+    args = ap.parse_args(argv)
+
+    from ..vision.detector import Detector
+    detector = Detector(args.weights)
+    if args.track:
+        from ..vision.tracker import TrackingDetector
+        detector = TrackingDetector(detector, refresh_every=args.track_refresh)
+    report = replay(args.session, detector, conf=args.conf, roi=_parse_roi(args.roi),
+                    limit=args.limit, warmup=args.warmup, tolerance_px=args.tolerance)
+    report["weights"] = args.weights
+    report["roi"] = args.roi
+    if args.track:
+        report["tracker"] = detector.stats()
+
+    for k, v in report.items():
+        print(f"{k:>22}: {v}")
+    if args.json:
+        args.json.write_text(json.dumps(report, indent=2), encoding="utf-8")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,299 @@
+"""
+SQLite catalog of articles and their artifacts (CATALOG_PATH, empty disables it).
+
+One row per article (topic, category, status, image, WordPress post/media IDs, timings), one
+row per registered artifact (stage outputs, the generated image, the published HTML) with its
+SHA-256 and size, and one row per timed stage. Everything is keyed or indexed, so "which image
+belongs to this article" or "what was published this week" is an index lookup instead of a
+directory glob.
+
+    python -m agent.catalog list --since 2026-10-01
+    python -m agent.catalog show article_20261019_082931_891
+    python -m agent.catalog stats
+    python -m agent.catalog import .          # index existing article_content/ and images
+"""
+import argparse, contextlib, hashlib, json, sqlite3, sys, threading, time
+from datetime import datetime
+from pathlib import Path
+from .config import Settings
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS articles (
+    article_id TEXT PRIMARY KEY,
+    topic TEXT, category TEXT,
+    status TEXT NOT NULL DEFAULT 'started',   -- started | captured | image | published | failed
+    created REAL, published REAL,
+    image_path TEXT, image_sha256 TEXT,
+    post_id INTEGER, media_id INTEGER, title TEXT, link TEXT
+);
+CREATE INDEX IF NOT EXISTS articles_published ON articles(published);
+CREATE INDEX IF NOT EXISTS articles_created ON articles(created);
+CREATE INDEX IF NOT EXISTS articles_topic ON articles(topic);
+CREATE INDEX IF NOT EXISTS articles_post ON articles(post_id);
+CREATE TABLE IF NOT EXISTS artifacts (
+    article_id TEXT NOT NULL, kind TEXT NOT NULL, name TEXT NOT NULL,
+    path TEXT, sha256 TEXT, bytes INTEGER, t REAL,
+    PRIMARY KEY (article_id, kind, name)
+);
+CREATE INDEX IF NOT EXISTS artifacts_sha ON artifacts(sha256);
+CREATE TABLE IF NOT EXISTS stages (
+    article_id TEXT NOT NULL, stage TEXT NOT NULL,
+    started REAL, seconds REAL, ok INTEGER,
+    PRIMARY KEY (article_id, stage)
+);
+"""
+ARTICLE_FIELDS = ("topic", "category", "status", "created", "published", "image_path", "image_sha256",
+                  "post_id", "media_id", "title", "link")
+IMAGE_SUFFIXES = (".png", ".jpg", ".jpeg", ".webp")
+
+def sha256(data: bytes | str | Path) -> str:
+    if isinstance(data, Path):
+        h = hashlib.sha256()
+        with data.open("rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                h.update(chunk)
+        return h.hexdigest()
+    return hashlib.sha256(data.encode("utf-8") if isinstance(data, str) else data).hexdigest()
+
+class Catalog:
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        # one connection shared by the GUI loop and publisher threads; autocommit, serialised by a lock
+        self.db = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        self.db.row_factory = sqlite3.Row
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        self.db.executescript(SCHEMA)
+        self._lock = threading.Lock()
+
+    def _exec(self, sql, args=()):
+        with self._lock:
+            return self.db.execute(sql, args).fetchall()
+
+    # -- registration
+    def article(self, article_id: str, **fields):
+        """Create or update an article row; only the given fields change."""
+        unknown = set(fields) - set(ARTICLE_FIELDS)
+        if unknown:
+            raise ValueError(f"Unknown article fields: {sorted(unknown)}")
+        fields.setdefault("created", None)
+        cols = ", ".join(fields)
+        marks = ", ".join("?" * len(fields))
+        updates = ", ".join(f"{k}=coalesce(excluded.{k}, {k})" if k == "created" else f"{k}=excluded.{k}"
+                            for k in fields)
+        self._exec(f"INSERT INTO articles (article_id, {cols}) VALUES (?, {marks}) "
+                   f"ON CONFLICT(article_id) DO UPDATE SET {updates}",
+                   (article_id, *fields.values()))
+
+    def add_artifact(self, article_id: str, kind: str, path: Path | None = None, *,
+                     name: str | None = None, data: bytes | str | None = None) -> str:
+        """Register a file (or in-memory content) produced for an article; returns its SHA-256."""
+        if data is not None:
+            digest = sha256(data)
+            size = len(data.encode("utf-8") if isinstance(data, str) else data)
+        else:
+            path = Path(path)
+            digest, size = sha256(path), path.stat().st_size
+        self._exec("INSERT OR REPLACE INTO artifacts VALUES (?, ?, ?, ?, ?, ?, ?)",
+                   (article_id, kind, name or Path(path).name, str(path) if path else None,
+                    digest, size, time.time()))
+        return digest
+
+    def record_stage(self, article_id: str, stage: str, started: float, seconds: float, ok=True):
+        self._exec("INSERT OR REPLACE INTO stages VALUES (?, ?, ?, ?, ?)",
+                   (article_id, stage, started, round(seconds, 3), int(bool(ok))))
+
+    @contextlib.contextmanager
+    def stage(self, article_id: str, stage: str, clock=time.time):
+        """Time a block as `stage` of the article; failures are recorded with ok=0 and re-raised."""
+        t0 = clock()
+        ok = False
+        try:
+            yield
+            ok = True
+        finally:
+            self.record_stage(article_id, stage, t0, clock() - t0, ok)
+
+    # -- queries
+    def get(self, article_id: str) -> dict | None:
+        rows = self._exec("SELECT * FROM articles WHERE article_id=?", (article_id,))
+        if not rows:
+            return None
+        out = dict(rows[0])
+        out["artifacts"] = [dict(r) for r in self._exec(
+            "SELECT kind, name, path, sha256, bytes, t FROM artifacts WHERE article_id=? ORDER BY t", (article_id,))]
+        out["stages"] = [dict(r) for r in self._exec(
+            "SELECT stage, started, seconds, ok FROM stages WHERE article_id=? ORDER BY started", (article_id,))]
+        return out
+
+    def has(self, article_id: str) -> bool:
+        return bool(self._exec("SELECT 1 FROM articles WHERE article_id=?", (article_id,)))
+
+    def image_for(self, article_id: str) -> Path | None:
+        """The downloaded image of an article, if it is registered and still on disk."""
+        rows = self._exec("SELECT image_path FROM articles WHERE article_id=?", (article_id,))
+        if rows and rows[0]["image_path"] and Path(rows[0]["image_path"]).exists():
+            return Path(rows[0]["image_path"])
+        return None
+
+    def find_post(self, article_id: str) -> int | None:
+        rows = self._exec("SELECT post_id FROM articles WHERE article_id=?", (article_id,))
+        return rows[0]["post_id"] if rows else None
+
+    def find_by_hash(self, digest: str) -> list[dict]:
+        return [dict(r) for r in self._exec("SELECT * FROM artifacts WHERE sha256=?", (digest,))]
+
+    def published(self, since: float | None = None, until: float | None = None, limit=None) -> list[dict]:
+        """Published articles (newest first) with their total and per-stage seconds."""
+        sql = ("SELECT a.*, a.published - a.created AS wall_seconds, "
+               "(SELECT sum(seconds) FROM stages s WHERE s.article_id=a.article_id) AS seconds "
+               "FROM articles a WHERE a.published IS NOT NULL AND a.published >= ? AND a.published < ? "
+               "ORDER BY a.published DESC")
+        args = [since or 0, until or 1e12]
+        if limit:
+            sql += " LIMIT ?"
+            args.append(limit)
+        return [dict(r) for r in self._exec(sql, args)]
+
+    def articles(self, status: str | None = None, since: float | None = None, limit=None) -> list[dict]:
+        sql = "SELECT * FROM articles WHERE created >= ?"
+        args = [since or 0]
+        if status:
+            sql += " AND status=?"
+            args.append(status)
+        sql += " ORDER BY created DESC"
+        if limit:
+            sql += " LIMIT ?"
+            args.append(limit)
+        return [dict(r) for r in self._exec(sql, args)]
+
+    def stats(self) -> dict:
+        by_status = {r["status"]: r["n"] for r in self._exec(
+            "SELECT status, count(*) AS n FROM articles GROUP BY status")}
+        stages = {r["stage"]: {"n": r["n"], "mean_s": round(r["mean"], 1), "max_s": round(r["max"], 1)}
+                  for r in self._exec("SELECT stage, count(*) AS n, avg(seconds) AS mean, max(seconds) AS max "
+                                      "FROM stages WHERE ok=1 GROUP BY stage ORDER BY mean DESC")}
+        artifacts = self._exec("SELECT count(*) AS n, coalesce(sum(bytes), 0) AS b FROM artifacts")[0]
+        return {"articles": by_status, "artifacts": artifacts["n"],
+                "artifact_mb": round(artifacts["b"] / 1e6, 1), "stages": stages}
+
+    # -- migration
+    def import_tree(self, base_dir: str | Path) -> int:
+        """Index article folders and images that predate the catalog (skips known articles)."""
+        base = Path(base_dir)
+        known = {r["article_id"] for r in self._exec("SELECT article_id FROM articles")}
+        images = {}
+        for p in (base / "screenshots" / "generated_images").glob("*"):
+            if p.suffix.lower() in IMAGE_SUFFIXES:
+                images[p.stem] = p
+        added = 0
+        for folder in sorted((base / "article_content").glob("article_*")):
+            article_id = folder.name
+            if article_id in known or not folder.is_dir():
+                continue
+            try:
+                created = datetime.strptime(article_id[8:23], "%Y%m%d_%H%M%S").timestamp()
+            except ValueError:
+                created = folder.stat().st_mtime
+            image = images.get(article_id)
+            self.article(article_id, created=created, status="image" if image else "captured",
+                         image_path=str(image) if image else None,
+                         image_sha256=self.add_artifact(article_id, "image", image) if image else None)
+            for p in sorted(folder.glob("*.txt")):
+                self.add_artifact(article_id, "output", p)
+            added += 1
+        return added
+
+_catalog: Catalog | None = None
+_configured = False
+
+def get_catalog() -> Catalog | None:
+    """The process catalog, or None when CATALOG_PATH is empty."""
+    global _catalog, _configured
+    if not _configured:
+        _configured = True
+        path = Settings.default().catalog_path
+        if path:
+            _catalog = Catalog(path)
+    return _catalog
+
+def set_catalog(catalog: Catalog | None):
+    global _catalog, _configured
+    _catalog, _configured = catalog, True
+
+@contextlib.contextmanager
+def use_catalog(catalog: Catalog | None):
+    """Swap the process catalog for a block (tools that must not touch CATALOG_PATH)."""
+    global _catalog, _configured
+    saved = _catalog, _configured
+    set_catalog(catalog)
+    try:
+        yield catalog
+    finally:
+        _catalog, _configured = saved
+
+def _ts(value: str | None) -> float | None:
+    return datetime.fromisoformat(value).timestamp() if value else None
+
+def _fmt(t) -> str:
+    return datetime.fromtimestamp(t).strftime("%Y-%m-%d %H:%M:%S") if t else "-"
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Query the article catalog")
+    ap.add_argument("--db", default=Settings.default().catalog_path or "cache/catalog.sqlite")
+    ap.add_argument("--json", action="store_true", help="print raw rows as JSON")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    p = sub.add_parser("list", help="published articles, newest first")
+    p.add_argument("--since", help="ISO date/time")
+    p.add_argument("--until", help="ISO date/time")
+    p.add_argument("--all", action="store_true", help="include articles that were not published")
+    p.add_argument("--limit", type=int, default=50)
+    p = sub.add_parser("show", help="one article with its artifacts and stage timings")
+    p.add_argument("article_id")
+    sub.add_parser("stats", help="counts and mean stage durations")
+    p = sub.add_parser("import", help="index existing article_content/ and generated images")
+    p.add_argument("base_dir", type=Path, nargs="?", default=Path("."))
+    args = ap.parse_args(argv)
+
+    catalog = Catalog(args.db)
+    if args.cmd == "list":
+        if args.all:
+            rows = catalog.articles(since=_ts(args.since), limit=args.limit)
+        else:
+            rows = catalog.published(since=_ts(args.since), until=_ts(args.until), limit=args.limit)
+        if args.json:
+            print(json.dumps(rows, indent=2))
+            return 0
+        print(f"{'published':<19}  {'article':<27}  {'status':<9}  {'post':>6}  {'stages_s':>8}  {'wall_s':>7}  topic")
+        for r in rows:
+            secs = f"{r['seconds']:.0f}" if r.get("seconds") else "-"
+            wall = f"{r['wall_seconds']:.0f}" if r.get("wall_seconds") else "-"
+            print(f"{_fmt(r['published']):<19}  {r['article_id']:<27}  {r['status']:<9}  "
+                  f"{r['post_id'] or '-':>6}  {secs:>8}  {wall:>7}  {(r['topic'] or '')[:60]}")
+    elif args.cmd == "show":
+        row = catalog.get(args.article_id)
+        if row is None:
+            print(f"{args.article_id}: not in {args.db}", file=sys.stderr)
+            return 1
+        if args.json:
+            print(json.dumps(row, indent=2))
+            return 0
+        for k in ("topic", "category", "status", "created", "published", "post_id", "media_id", "title",
+                  "link", "image_path"):
+            v = _fmt(row[k]) if k in ("created", "published") else row[k]
+            print(f"{k:>10}: {v if v is not None else '-'}")
+        print("    stages:")
+        for s in row["stages"]:
+            print(f"      {s['stage']:<32} {s['seconds']:>8.1f}s  {'ok' if s['ok'] else 'FAILED'}")
+        print(" artifacts:")
+        for a in row["artifacts"]:
+            print(f"      {a['kind']:<8} {a['name']:<32} {a['bytes']:>9} B  {a['sha256'][:12]}")
+    elif args.cmd == "stats":
+        print(json.dumps(catalog.stats(), indent=2))
+    elif args.cmd == "import":
+        print(f"Indexed {catalog.import_tree(args.base_dir)} articles into {args.db}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -12,7 +12,60 @@ class Settings:
     wp_user: str = os.getenv("WP_USER", "")
     wp_app_password: str = os.getenv("WP_APP_PASSWORD", "")
     default_image_url: str = os.getenv("DEFAULT_IMAGE_URL", "https://yourdomain.com/default-image.jpg")
+    # read Yoast meta back after publishing (one extra _fields-restricted GET)
+    yoast_verify: bool = os.getenv("YOAST_VERIFY", "0") == "1"
+    # XTest input + in-process clipboard owner instead of pyautogui/xclip (see agent/gui/xfast.py)
+    gui_fast: bool = os.getenv("GUI_FAST", "0") == "1"
+    # chat tabs driven round-robin by agent/gui/tabs.py (1 = sequential)
+    tabs: int = int(os.getenv("TABS", "1"))
     weights_path: str = os.getenv("YOLO_WEIGHTS", "models/best.pt")
+    # JSON override of the agent pipeline (see agent/pipeline/agents.py)
+    pipeline_path: str = os.getenv("PIPELINE_PATH", "agent/data/pipeline.json")
+    # agent response cache (see agent/pipeline/cache.py); TTL 0 (default) disables it
+    response_cache_dir: str = os.getenv("RESPONSE_CACHE_DIR", "cache/responses")
+    response_cache_ttl_hours: float = float(os.getenv("RESPONSE_CACHE_TTL_HOURS", "0"))
+    response_cache_max_mb: float = float(os.getenv("RESPONSE_CACHE_MAX_MB", "200"))
+    # near-duplicate topic check against published articles/topics (see agent/pipeline/dedup.py);
+    # threshold 0 disables it
+    dedup_index_path: str = os.getenv("DEDUP_INDEX_PATH", "cache/dedup_index.jsonl")
+    dedup_threshold: float = float(os.getenv("DEDUP_THRESHOLD", "0.6"))
+    dedup_window_days: float = float(os.getenv("DEDUP_WINDOW_DAYS", "14"))
+    # SQLite catalog of articles, artifacts and stage timings (see agent/catalog.py); empty disables it
+    catalog_path: str = os.getenv("CATALOG_PATH", "cache/catalog.sqlite")
+    # when set, use the shared detection service on this unix socket instead of a local model
+    detector_socket: str = os.getenv("DETECTOR_SOCKET", "")
+    # answer polls by template matching between full detections (see agent/vision/tracker.py)
+    detector_track: bool = os.getenv("DETECTOR_TRACK", "0") == "1"
+    detector_track_refresh: int = int(os.getenv("DETECTOR_TRACK_REFRESH", "10"))
+    # change (mean abs gray diff) where an untracked class was seen that forces a full detection; 0 disables it
+    detector_track_refresh_diff: float = float(os.getenv("DETECTOR_TRACK_REFRESH_DIFF", "12"))
+    # stall watchdog for ready waits (see agent/gui/watchdog.py); frozen 0 + no labels disables it
+    watchdog_expected_seconds: float = float(os.getenv("WATCHDOG_EXPECTED_SECONDS", "120"))
+    watchdog_frozen_seconds: float = float(os.getenv("WATCHDOG_FROZEN_SECONDS", "120"))
+    watchdog_error_labels: str = os.getenv("WATCHDOG_ERROR_LABELS", "error_banner,login_button")
+    watchdog_reloads: int = int(os.getenv("WATCHDOG_RELOADS", "1"))
+    # restart Chrome between articles past this memory (MB, summed over its processes) or every
+    # N articles (see agent/gui/browser.py); 0 disables each check
+    chrome_max_rss_mb: float = float(os.getenv("CHROME_MAX_RSS_MB", "6000"))
+    chrome_restart_every: int = int(os.getenv("CHROME_RESTART_EVERY", "0"))
+    # persistent profile Chrome is (re)started with, same as startup.sh
+    chrome_profile_dir: str = os.getenv("CHROME_PROFILE_DIR", "/app/chrome-profile")
+
+    # logging (see agent/logging_setup.py); rate limit 0 disables it
+    log_level: str = os.getenv("LOG_LEVEL", "INFO").upper()
+    log_json: bool = os.getenv("LOG_JSON", "0") == "1"
+    log_rate_limit_seconds: float = float(os.getenv("LOG_RATE_LIMIT_SECONDS", "10"))
+
+    # keep the last N poll frames in memory and dump them only on failures (see agent/recorder.py)
+    flight_frames: int = int(os.getenv("FLIGHT_FRAMES", "0"))
+
+    # screenshot / annotation artifacts (see agent/artifacts.py)
+    artifact_codec: str = os.getenv("ARTIFACT_CODEC", "png")
+    artifact_quality: int = int(os.getenv("ARTIFACT_QUALITY", "80"))
+    artifact_dedup: bool = os.getenv("ARTIFACT_DEDUP", "1") == "1"
+    artifact_pack: bool = os.getenv("ARTIFACT_PACK", "0") == "1"
+    artifact_max_gb: float = float(os.getenv("ARTIFACT_MAX_GB", "0")) or None
+    artifact_max_age_days: float = float(os.getenv("ARTIFACT_MAX_AGE_DAYS", "0")) or None
 
     # 1440p default
     screen_region: dict = None
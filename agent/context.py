@@ -1,5 +1,6 @@
 from dataclasses import dataclass
 from datetime import datetime
+from functools import cached_property
 from pathlib import Path
 
 @dataclass
@@ -8,13 +9,13 @@ class Context:
     base_dir: Path
     region: dict
 
-    @property
+    @cached_property
     def screenshots_dir(self) -> Path:
         p = self.base_dir / "screenshots" / self.article_id
         p.mkdir(parents=True, exist_ok=True)
         return p
 
-    @property
+    @cached_property
     def article_dir(self) -> Path:
         p = self.base_dir / "article_content" / self.article_id
         p.mkdir(parents=True, exist_ok=True)
@@ -0,0 +1,123 @@
+"""
+Pluggable GUI backend.
+
+Everything in `agent/gui` (and the tab handling in `agent.main`) talks to the screen, keyboard,
+clipboard and clock through `gui`, a proxy to the active backend. The default backend wraps
+pyautogui / pyperclip / mss; `agent.gui.sim.SimBackend` replaces it with scripted frames and a
+virtual clock.
+"""
+import abc, contextlib, time
+
+class GuiBackend(abc.ABC):
+    """Interface implemented by every backend. Method names mirror pyautogui."""
+
+    @abc.abstractmethod
+    def time(self) -> float: ...
+    @abc.abstractmethod
+    def sleep(self, seconds: float): ...
+    @abc.abstractmethod
+    def grab(self, region: dict): ...  # -> PIL.Image (RGB)
+    @abc.abstractmethod
+    def position(self) -> tuple[int, int]: ...
+    @abc.abstractmethod
+    def moveTo(self, x: int, y: int, duration: float = 0.0): ...
+    @abc.abstractmethod
+    def click(self): ...
+    @abc.abstractmethod
+    def rightClick(self): ...
+    @abc.abstractmethod
+    def press(self, key: str, presses: int = 1): ...
+    @abc.abstractmethod
+    def hotkey(self, *keys: str): ...
+    @abc.abstractmethod
+    def typewrite(self, text: str): ...
+    @abc.abstractmethod
+    def scroll(self, amount: int): ...
+    @abc.abstractmethod
+    def copy(self, text: str): ...
+    @abc.abstractmethod
+    def paste(self) -> str: ...
+
+    def batch(self):
+        """Group several input calls; backends that buffer events flush once at the end."""
+        return contextlib.nullcontext()
+
+class PyAutoGuiBackend(GuiBackend):
+    """Real X11 backend (pyautogui for input, pyperclip/xclip for the clipboard, mss for capture)."""
+
+    def __init__(self):
+        import pyautogui, pyperclip, mss
+        pyautogui.FAILSAFE = False
+        # Use xclip for clipboard operations (Linux/Xvfb)
+        try:
+            pyperclip.set_clipboard("xclip")
+        except Exception:
+            pass
+        self._pg, self._clip, self._mss = pyautogui, pyperclip, mss
+
+    def time(self) -> float:
+        return time.time()
+
+    def sleep(self, seconds: float):
+        time.sleep(seconds)
+
+    def grab(self, region: dict):
+        from PIL import Image
+        with self._mss.mss() as sct:
+            shot = sct.grab(region)
+        return Image.frombytes("RGB", shot.size, shot.rgb)
+
+    def position(self):
+        x, y = self._pg.position()
+        return int(x), int(y)
+
+    def moveTo(self, x, y, duration=0.0):
+        self._pg.moveTo(x, y, duration=duration)
+
+    def click(self):
+        self._pg.click()
+
+    def rightClick(self):
+        self._pg.rightClick()
+
+    def press(self, key, presses=1):
+        self._pg.press(key, presses=presses)
+
+    def hotkey(self, *keys):
+        self._pg.hotkey(*keys)
+
+    def typewrite(self, text):
+        self._pg.typewrite(text)
+
+    def scroll(self, amount):
+        self._pg.scroll(amount)
+
+    def copy(self, text):
+        self._clip.copy(text)
+
+    def paste(self) -> str:
+        return self._clip.paste()
+
+_backend: GuiBackend | None = None
+
+def get_backend() -> GuiBackend:
+    global _backend
+    if _backend is None:
+        from ..config import Settings
+        if Settings.default().gui_fast:
+            from .xfast import XTestBackend
+            _backend = XTestBackend()
+        else:
+            _backend = PyAutoGuiBackend()
+    return _backend
+
+def set_backend(backend: GuiBackend | None):
+    """Install `backend` for all GUI calls (None restores the default on next use)."""
+    global _backend
+    _backend = backend
+
+class _BackendProxy:
+    def __getattr__(self, name):
+        return getattr(get_backend(), name)
+
+gui = _BackendProxy()
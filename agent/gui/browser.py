@@ -0,0 +1,142 @@
+"""
+Chrome process helpers (read straight from /proc, no psutil needed) and the browser lifecycle
+manager that restarts Chrome between articles when its memory grows too large.
+"""
+import logging, os, shutil, signal, subprocess, time
+from pathlib import Path
+from .backend import gui
+
+log = logging.getLogger(__name__)
+
+# same flags as startup.sh
+CHROME_FLAGS = [
+    "--no-sandbox", "--disable-gpu", "--disable-dev-shm-usage", "--disable-extensions",
+    "--disable-background-networking", "--disable-sync", "--metrics-recording-only",
+    "--disable-default-apps", "--no-first-run", "--no-default-browser-check",
+    "--disable-popup-blocking", "--disable-translate", "--force-dark-mode", "--start-maximized",
+]
+CHROME_BINARIES = ("google-chrome", "google-chrome-stable", "chromium", "chromium-browser")
+
+def chrome_pids() -> list[int]:
+    pids = []
+    for d in Path("/proc").iterdir() if Path("/proc").is_dir() else ():
+        if not d.name.isdigit():
+            continue
+        try:
+            cmd = (d / "cmdline").read_bytes().split(b"\0")[0]
+        except OSError:
+            continue
+        if b"chrome" in os.path.basename(cmd):
+            pids.append(int(d.name))
+    return pids
+
+def wait_for_browser(timeout=60.0, interval=0.5) -> bool:
+    """Block until a Chrome process exists (startup.sh launches it alongside the agent)."""
+    deadline = time.monotonic() + timeout
+    while not chrome_pids():
+        if time.monotonic() >= deadline:
+            return False
+        time.sleep(interval)
+    return True
+
+def _proc_memory(pid: int) -> int:
+    """Proportional set size of a process in bytes (shared pages split between sharers), else RSS."""
+    try:
+        text = Path(f"/proc/{pid}/smaps_rollup").read_text()
+        key = "Pss:"
+    except OSError:
+        try:
+            text = Path(f"/proc/{pid}/status").read_text()
+        except OSError:
+            return 0
+        key = "VmRSS:"
+    for line in text.splitlines():
+        if line.startswith(key):
+            return int(line.split()[1]) * 1024
+    return 0
+
+def chrome_rss(pids=None) -> int:
+    """Memory of all Chrome processes in bytes (summed PSS, so shared pages count once)."""
+    return sum(_proc_memory(pid) for pid in (chrome_pids() if pids is None else pids))
+
+def stop_chrome(timeout=10.0):
+    """SIGTERM every Chrome process, SIGKILL what is left after `timeout`."""
+    for sig in (signal.SIGTERM, signal.SIGKILL):
+        for pid in chrome_pids():
+            try:
+                os.kill(pid, sig)
+            except OSError:
+                pass
+        deadline = time.monotonic() + timeout
+        while chrome_pids() and time.monotonic() < deadline:
+            time.sleep(0.2)
+        if not chrome_pids():
+            return
+
+def start_chrome(url="https://chatgpt.com", profile_dir="/app/chrome-profile", log_path="/root/chrome.log"):
+    """Launch Chrome like startup.sh: persistent profile, stale locks removed, output to `log_path`."""
+    binary = next(filter(None, map(shutil.which, CHROME_BINARIES)), None)
+    if binary is None:
+        raise RuntimeError("Chrome binary not found")
+    profile = Path(profile_dir)
+    for lock in [*profile.rglob("Singleton*"), *profile.rglob("*.pid")]:
+        lock.unlink(missing_ok=True)
+    with open(log_path, "ab") as out:
+        # the restore-pages bubble would cover the chat after a SIGTERM
+        subprocess.Popen([binary, *CHROME_FLAGS, "--hide-crash-restore-bubble", f"--user-data-dir={profile}", url],
+                         stdout=out, stderr=subprocess.STDOUT, start_new_session=True)
+
+def restart_chrome(url="https://chatgpt.com", profile_dir="/app/chrome-profile", timeout=60.0) -> bool:
+    stop_chrome()
+    start_chrome(url, profile_dir)
+    return wait_for_browser(timeout=timeout)
+
+class BrowserLifecycle:
+    """
+    Decides between articles whether Chrome should be restarted: its memory crossed
+    `max_rss_mb`, or `restart_every` articles ran since the last (re)start. `rss` and `restart`
+    default to the /proc reader and `restart_chrome`; the simulator passes its own.
+    """
+
+    def __init__(self, *, max_rss_mb=6000, restart_every=0, url="https://chatgpt.com",
+                 profile_dir="/app/chrome-profile", rss=None, restart=None):
+        self.max_rss_mb = max_rss_mb
+        self.restart_every = restart_every
+        self._rss = rss or (lambda: chrome_rss() / 2**20)
+        self._restart = restart or (lambda: restart_chrome(url, profile_dir))
+        self.articles = 0
+        self.restarts = 0
+        self.rss_mb = self.peak_rss_mb = 0.0
+
+    def article_done(self):
+        self.articles += 1
+
+    def sample(self) -> float:
+        self.rss_mb = self._rss()
+        self.peak_rss_mb = max(self.peak_rss_mb, self.rss_mb)
+        return self.rss_mb
+
+    def due(self) -> bool:
+        self.sample()
+        log.info("🧠 Chrome memory: %.0f MB after %d articles", self.rss_mb, self.articles)
+        if self.max_rss_mb and self.rss_mb >= self.max_rss_mb:
+            log.warning("🧠 Chrome memory %.0f MB is over %d MB, restart due",
+                        self.rss_mb, self.max_rss_mb)
+            return True
+        if self.restart_every and self.articles >= self.restart_every:
+            log.info("🧠 %d articles since the last Chrome start, restart due", self.articles)
+            return True
+        return False
+
+    def restart(self):
+        t0 = gui.time()
+        before = self.rss_mb
+        if not self._restart():
+            log.warning("⚠️ No Chrome process after restart, continuing anyway.")
+        self.restarts += 1
+        self.articles = 0
+        self.sample()
+        log.info("🔁 Chrome restarted in %.1fs (%.0f → %.0f MB)", gui.time() - t0, before, self.rss_mb)
+
+    def stats(self) -> dict:
+        return {"restarts": self.restarts, "rss_mb": round(self.rss_mb), "peak_rss_mb": round(self.peak_rss_mb)}
@@ -1,52 +1,73 @@
-import time, random, os
+import logging, random, os
 from pathlib import Path
-import pyautogui, pyperclip
+from .backend import gui
 from .screenshot import take_screenshot
+from .settle import snapshot, wait_until_stable
+from .watch import wait_for_download
+from ..catalog import get_catalog
+
+log = logging.getLogger(__name__)
 
 def _paste(text: str):
-    pyperclip.copy(text)
-    pyautogui.hotkey("ctrl", "v")
+    gui.copy(text)
+    gui.hotkey("ctrl", "v")
 
-def image_downloader(ctx):
+def image_downloader(ctx, timeout_seconds=30):
     debug_folder = ctx.screenshots_dir / "image_downloader"
     debug_folder.mkdir(parents=True, exist_ok=True)
     take_screenshot(ctx.region, debug_folder)
+    # absolute path typed into Chrome's save dialog (/app/... inside the container)
+    target = ctx.base_dir.resolve() / "screenshots" / "generated_images" / ctx.article_id
 
     def attempt_download():
-        print("🖼️ Attempting to download image...")
-        pyautogui.hotkey('ctrl', 'shift', 'J')  # Open save dialog (adjust for your env)
-        time.sleep(1)
-        pyautogui.moveTo(2400, 570, duration=1.0)
-        time.sleep(0.8)
-        pyautogui.click()
-        time.sleep(0.3)
+        log.info("🖼️ Attempting to download image...")
+        region = ctx.region
+        before = snapshot(region)
+        gui.hotkey('ctrl', 'shift', 'J')  # Open save dialog (adjust for your env)
+        wait_until_stable(region, max_wait=3, baseline=before)
+        with gui.batch():
+            gui.moveTo(2400, 570)
+            gui.click()
 
         helper_path = Path(__file__).resolve().parents[1] / "assets" / "image_downloader_helper.txt"
         content = helper_path.read_text(encoding="utf-8") if helper_path.exists() else ""
-        print(content)
+        log.debug("helper script: %s", content)
         _paste(content)
-        time.sleep(0.8)
-        pyautogui.press('enter')
-        time.sleep(0.8)
-        pyautogui.moveTo(1300, 570, duration=1.0)
-        time.sleep(0.8)
-        take_screenshot(ctx.region, debug_folder)
-        pyautogui.rightClick()
-        time.sleep(0.8)
-        take_screenshot(ctx.region, debug_folder)
-        pyautogui.press('down', presses=2)
-        time.sleep(0.6)
-        take_screenshot(ctx.region, debug_folder)
-        pyautogui.press('enter')
-        take_screenshot(ctx.region, debug_folder)
-        time.sleep(0.4)
-        folder = f"/app/screenshots/generated_images/{ctx.article_id}"
-        _paste(folder)
-        take_screenshot(ctx.region, debug_folder)
-        time.sleep(0.4)
-        pyautogui.press('enter')
-        take_screenshot(ctx.region, debug_folder)
-        time.sleep(0.4)
+        wait_until_stable(region, max_wait=1.5)
+        before = snapshot(region)
+        gui.press('enter')
+        # the helper opens the full-size image in a new tab
+        wait_until_stable(region, max_wait=5, baseline=before)
+        gui.moveTo(1300, 570)
+        take_screenshot(region, debug_folder)
+        before = snapshot(region)
+        gui.rightClick()
+        wait_until_stable(region, max_wait=2, baseline=before)
+        take_screenshot(region, debug_folder)
+        gui.press('down', presses=2)
+        wait_until_stable(region, max_wait=1)
+        take_screenshot(region, debug_folder)
+        before = snapshot(region)
+        gui.press('enter')
+        # "Save image as" dialog
+        wait_until_stable(region, max_wait=3, baseline=before)
+        take_screenshot(region, debug_folder)
+        _paste(str(target))
+        wait_until_stable(region, max_wait=1)
+        take_screenshot(region, debug_folder)
+        before = snapshot(region)
+        gui.press('enter')
+        wait_until_stable(region, max_wait=2, baseline=before)
+        take_screenshot(region, debug_folder)
 
     attempt_download()
-    print(f"✅ Image expected at: /app/screenshots/generated_images/{ctx.article_id}.png")
+    image_path = wait_for_download(target.parent, ctx.article_id, timeout=timeout_seconds)
+    if image_path is None:
+        log.warning("⚠️ No completed image for %s in %s after %ss", ctx.article_id, target.parent, timeout_seconds)
+    else:
+        log.info("✅ Image downloaded: %s", image_path)
+        catalog = get_catalog()
+        if catalog is not None:
+            digest = catalog.add_artifact(ctx.article_id, "image", image_path)
+            catalog.article(ctx.article_id, status="image", image_path=str(image_path), image_sha256=digest)
+    return image_path
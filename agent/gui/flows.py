@@ -1,78 +1,69 @@
-import time, os
+import logging, os
 from pathlib import Path
-import pyautogui
-from .screenshot import take_screenshot
+from .backend import gui
+from .screenshot import capture, take_screenshot
 from .io import human_type
-import pyperclip
-import cv2
-import json
-
-READY_LABELS = ("ready_button", "start_button")
-
-def _collect_detections(results, model, conf=0.6):
-    by_class = {}
-    if not results:
-        return by_class
-    for r in results:
-        # guard: some results may have no boxes
-        boxes = getattr(r, "boxes", None)
-        if not boxes:
-            continue
-        for b in boxes:
-            c = float(b.conf[0])
-            if c < conf:
-                continue
-            cls = model.names[int(b.cls[0])]
-            x, y, w, h = b.xywh[0].tolist()
-            by_class.setdefault(cls, []).append({
-                "center_x": int(x),
-                "center_y": int(y),
-                "width": int(w),
-                "height": int(h),
-                "conf": c,
-            })
-    return by_class
-
-def _pick_input_zone(dets: dict):
-    """Prefer the input_zone with the largest center_y (closest to bottom)."""
-    zs = dets.get("input_zone") or dets.get("input_zones")  # just in case
-    if not zs:
-        return None
-    return max(zs, key=lambda d: d["center_y"])
-
-def _found_ready(results, model, conf, labels):
-    if not results:
-        return False
-    for r in results:
-        boxes = getattr(r, "boxes", None)
-        if not boxes:
-            continue
-        for b in boxes:
-            if float(b.conf[0]) >= conf and model.names[int(b.cls[0])] in labels:
-                return True
-    return False
+from .settle import snapshot, wait_until_stable, wait_for_clipboard
+from .watchdog import get_watchdog
+from ..artifacts import get_store
+from ..recorder import get_recorder
+from ..logging_setup import RATE_LIMITED, log_context
+from ..vision.decisions import READY_LABELS, found_ready, pick_input_zone
+
+log = logging.getLogger(__name__)
 
 def _save_annotated(path:str, results, dets:dict=None):
     """
-    Save annotated image(s) next to `path` as *_ann.png.
+    Save annotated image(s) next to `path` as *_ann{i} (artifact store codec).
     Also saves detections JSON as *_dets.json if provided.
     """
     base = Path(path)
+    store = get_store()
     if results:
         for i, r in enumerate(results):
             try:
                 ann = r.plot()  # numpy image (BGR)
-                out = base.with_name(f"{base.stem}_ann{i}.png")
-                cv2.imwrite(str(out), ann)
+                store.save_render(ann, base.with_name(f"{base.stem}_ann{i}"))
             except Exception as e:
-                print(f"⚠️ annotate single frame failed: {e}")
+                log.warning("⚠️ annotate single frame failed: %s", e)
     if dets is not None:
         try:
-            (base.with_name(f"{base.stem}_dets.json")).write_text(
-                json.dumps(dets, indent=2), encoding="utf-8"
-            )
+            store.save_json(dets, base.with_name(f"{base.stem}_dets.json"))
+        except Exception as e:
+            log.warning("⚠️ write dets.json failed: %s", e)
+
+def _observe(ctx, detector, folder, conf, save_ann=True) -> dict:
+    """
+    One poll: capture + detect. With the flight recorder on, the frame stays in memory
+    (ring buffer); otherwise it is written with its annotations as before.
+    """
+    import numpy as np
+    recorder = get_recorder()
+    im = capture(ctx.region)
+    # BGR, same as what YOLO sees for a file path; detecting on the capture skips decoding it again
+    frame = np.ascontiguousarray(np.asarray(im)[:, :, ::-1])
+    if recorder is not None:
+        _, dets = detector.detect(frame, conf=conf)
+        recorder.record(im, dets, folder, gui.time())
+        return dets
+    path = take_screenshot(ctx.region, folder, im)
+    results, dets = detector.detect(frame, conf=conf)
+    # an unchanged frame keeps the annotations written when it was first saved
+    if save_ann and not get_store().last_deduped:
+        try:
+            _save_annotated(path, results, dets)
         except Exception as e:
-            print(f"⚠️ write dets.json failed: {e}")
+            log.warning("⚠️ annotate/save failed: %s", e)
+    return dets
+
+def flight_dump(ctx, reason: str):
+    recorder = get_recorder()
+    if recorder is not None:
+        recorder.dump(reason, ctx.screenshots_dir)
+
+def observe(ctx, detector, folder, conf=0.6) -> dict:
+    """One non-blocking poll of the visible chat (used by the tab scheduler)."""
+    return _observe(ctx, detector, folder, conf)
 
 def wait_for_ready(ctx, detector, *, folder, poll_seconds=10, timeout_seconds=600,
                    conf=0.6, labels=READY_LABELS, cooldown_seconds=10,
@@ -83,45 +74,56 @@ def wait_for_ready(ctx, detector, *, folder, poll_seconds=10, timeout_seconds=60
     If not seen within `timeout_seconds`, give up and return False.
 
     - `assume_ready_after=None` disables the soft-timeout behavior.
-    - `cooldown_seconds` avoids immediate re-detection on the next agent.
-    - If `save_ann` is True, every poll saves *_ann*.png (and dets.json when available).
+    - `cooldown_seconds` caps the wait for the page to settle after detection,
+      which avoids immediate re-detection on the next agent.
+    - If `save_ann` is True, every poll saves *_ann*.png (and dets.json when available),
+      unless the flight recorder keeps polls in memory (FLIGHT_FRAMES).
+    - The stall watchdog (agent/gui/watchdog.py) reloads the page or fails the wait early
+      when the chat shows an error state or stays frozen.
     """
-    start = time.time()
+    start = gui.time()
+    dog = get_watchdog()
+    watch = dog.watch(start) if dog is not None else None
+    horizon = assume_ready_after if assume_ready_after is not None else timeout_seconds
     while True:
-        path = take_screenshot(ctx.region, folder)
-        results = detector.raw(path)
+        dets = _observe(ctx, detector, folder, conf, save_ann)
 
-        if save_ann:
-            try:
-                # store a quick snapshot of detections too
-                dets = _collect_detections(results, detector.model, conf=conf)
-                _save_annotated(path, results, dets)
-            except Exception as e:
-                print(f"⚠️ annotate failed: {e}")
-
-        if _found_ready(results, detector.model, conf, labels):
-            print("✅ Successful: ready/start button appeared again.")
-            time.sleep(cooldown_seconds)
+        if found_ready(dets, labels):
+            log.info("✅ Successful: ready/start button appeared again.")
+            wait_until_stable(ctx.region, max_wait=cooldown_seconds, min_wait=0.5)
+            if watch is not None:
+                watch.finish(gui.time(), horizon)
             return True
 
-        elapsed = time.time() - start
+        if watch is not None:
+            reason = watch.check(dets, snapshot(ctx.region), gui.time())
+            if reason and not watch.stall(ctx, reason, gui.time()):
+                watch.finish(gui.time(), horizon)
+                return False
+
+        elapsed = gui.time() - start
 
         # Soft timeout → treat as success
         if assume_ready_after is not None and elapsed >= assume_ready_after:
-            print(f"⚠️ Assumed ready after {assume_ready_after}s without detection.")
-            time.sleep(cooldown_seconds)
+            log.warning("⚠️ Assumed ready after %ss without detection.", assume_ready_after)
+            wait_until_stable(ctx.region, max_wait=cooldown_seconds, min_wait=0.5)
             return True
 
         # Hard timeout → real failure
         if timeout_seconds is not None and elapsed >= timeout_seconds:
-            print("⏰ Timeout waiting for ready/start button.")
+            log.error("⏰ Timeout waiting for ready/start button.")
+            flight_dump(ctx, "ready_timeout")
             return False
 
-        print(f"⏳ Not ready yet... waiting {poll_seconds}s")
-        time.sleep(poll_seconds)
+        log.info("⏳ Not ready yet... waiting %ss", poll_seconds, extra=RATE_LIMITED)
+        gui.sleep(poll_seconds)
 
-def run_agent(ctx, detector, agent, timeout_seconds=600, conf=0.6,
-              fallback_click=(1300, 1100), scroll_attempts=2, scroll_amount=600):
+def run_agent(ctx, detector, agent, **kwargs):
+    """Run one chat turn; log records inside carry the agent name."""
+    with log_context(agent=agent["name"]):
+        return _run_agent(ctx, detector, agent, **kwargs)
+
+def _run_agent(ctx, detector, agent, timeout_seconds=600, conf=0.6, **submit_kwargs):
     folder = ctx.screenshots_dir / agent["name"]
     folder.mkdir(parents=True, exist_ok=True)
 
@@ -129,52 +131,56 @@ def run_agent(ctx, detector, agent, timeout_seconds=600, conf=0.6,
     if not wait_for_ready(ctx, detector, folder=folder, poll_seconds=10,
                           timeout_seconds=timeout_seconds, conf=conf,
                           assume_ready_after=600, save_ann=True):
-        print(f"⏰ Timeout: '{agent['name']}' never reached ready state.")
+        log.error("⏰ Timeout: '%s' never reached ready state.", agent["name"])
         return False
 
+    # 2-4) Find the input, type and submit
+    submit_agent(ctx, detector, agent, conf=conf, **submit_kwargs)
+
+    # 5) Wait until ready appears again (submission completed) — save annotated frames
+    return wait_for_ready(ctx, detector, folder=folder, poll_seconds=10,
+                          timeout_seconds=timeout_seconds, conf=conf,
+                          assume_ready_after=600, save_ann=True)
+
+def submit_agent(ctx, detector, agent, conf=0.6, fallback_click=(1300, 1100),
+                 scroll_attempts=2, scroll_amount=600):
+    """Type and send `agent["prompt"]` into a chat that is ready; does not wait for the reply."""
+    folder = ctx.screenshots_dir / agent["name"]
+    folder.mkdir(parents=True, exist_ok=True)
+
     # 2) Try to detect input_zone; if not found, scroll up a bit and retry
     input_xy = None
     for attempt in range(scroll_attempts + 1):  # initial + N scroll retries
-        fp = take_screenshot(ctx.region, folder)
-        results = detector.raw(fp)
-
-        # SAVE ANNOTATED on every YOLO call in this loop
-        try:
-            dets = _collect_detections(results, detector.model, conf=conf)
-            _save_annotated(fp, results, dets)
-        except Exception as e:
-            print(f"⚠️ annotate/save failed: {e}")
-            dets = {}
-
-        choice = _pick_input_zone(dets)
+        dets = _observe(ctx, detector, folder, conf)
+        choice = pick_input_zone(dets)
         if choice:
             input_xy = (choice["center_x"], choice["center_y"])
             break
 
         if attempt < scroll_attempts:
-            print(f"⚠️ '{agent['name']}' input zone not detected — scrolling up and retrying ({attempt+1}/{scroll_attempts})...")
-            pyautogui.scroll(scroll_amount)  # positive = up
-            time.sleep(0.4)
+            log.warning("⚠️ '%s' input zone not detected — scrolling up and retrying (%d/%d)...",
+                        agent["name"], attempt + 1, scroll_attempts)
+            gui.scroll(scroll_amount)  # positive = up
+            wait_until_stable(ctx.region, max_wait=1.5)
 
     # 3) Focus input
     if input_xy:
-        pyautogui.moveTo(*input_xy, duration=0.3)
-        pyautogui.click()
+        with gui.batch():
+            gui.moveTo(*input_xy)
+            gui.click()
     else:
-        print(f"⚠️ '{agent['name']}' input zone still not detected after scroll retries — using fallback click.")
-        pyautogui.moveTo(*fallback_click, duration=0.3)
-        pyautogui.click()
-        time.sleep(0.2)
-
-    # 4) Type + submit
+        log.warning("⚠️ '%s' input zone still not detected after scroll retries — using fallback click.", agent["name"])
+        flight_dump(ctx, "fallback_click")
+        with gui.batch():
+            gui.moveTo(*fallback_click)
+            gui.click()
+        wait_until_stable(ctx.region, max_wait=1.0)
+
+    # 4) Type + submit (wait for the pasted prompt to render before sending)
+    before = snapshot(ctx.region)
     human_type(agent["prompt"])
-    time.sleep(0.2)
-    pyautogui.press("enter")
-
-    # 5) Wait until ready appears again (submission completed) — save annotated frames
-    return wait_for_ready(ctx, detector, folder=folder, poll_seconds=10,
-                          timeout_seconds=timeout_seconds, conf=conf,
-                          assume_ready_after=600, save_ann=True)
+    wait_until_stable(ctx.region, max_wait=1.5, baseline=before)
+    gui.press("enter")
 
 def automate_text_capture(ctx):
     """
@@ -184,58 +190,62 @@ def automate_text_capture(ctx):
     3. Copy
     4. Save text + annotated screenshots
     """
-    print("🖱️ Move your mouse to the target browser area. Starting in 3 seconds...")
-    time.sleep(3)
+    region = {"top": 0, "left": 0, "width": 2560, "height": 1440}
+    log.info("🖱️ Waiting for the browser area to settle...")
+    wait_until_stable(region, max_wait=3)
 
     # 1️⃣ Click to make sure page is focused
-    pyautogui.moveTo(1250, 650, duration=0.5)
-    time.sleep(0.2)
-    pyautogui.click()
-    time.sleep(0.2)
+    with gui.batch():
+        gui.moveTo(1250, 650)
+        gui.click()
+    wait_until_stable(region, max_wait=1.0)
 
-    region = {"top": 0, "left": 0, "width": 2560, "height": 1440}
     base_folder = ctx.screenshots_dir
     Path(base_folder).mkdir(parents=True, exist_ok=True)
 
     # 2️⃣ Select all
-    print("➡️ Selecting all text")
-    pyautogui.hotkey('ctrl', 'a')
-    time.sleep(0.5)
+    log.info("➡️ Selecting all text")
+    before = snapshot(region)
+    gui.hotkey('ctrl', 'a')
+    wait_until_stable(region, max_wait=1.5, baseline=before)
     take_screenshot(region, base_folder)
 
-    # 3️⃣ Copy
-    print("➡️ Copying selection")
-    pyautogui.hotkey('ctrl', 'c')
-    time.sleep(0.6)
+    # 3️⃣ Copy (clear first so a completed copy is observable)
+    log.info("➡️ Copying selection")
+    gui.copy("")
+    gui.hotkey('ctrl', 'c')
+    text = wait_for_clipboard(max_wait=3)
     take_screenshot(region, base_folder)
 
     # 4️⃣ Save text
-    text = pyperclip.paste()
     out_path = Path(base_folder) / f"{ctx.article_id}.txt"
     out_path.write_text(text, encoding='utf-8')
-    print(f"✅ Text copied and saved to {out_path}")
+    log.info("✅ Text copied and saved to %s", out_path)
 
 def reset_interface(ctx):
     folder = ctx.screenshots_dir / "reset_interface"
     folder.mkdir(parents=True, exist_ok=True)
 
-    time.sleep(2)
-    pyautogui.press('f5')
-    time.sleep(1)
-    pyautogui.hotkey('ctrl', 'shift', 'o')
-    time.sleep(1)
-    take_screenshot(ctx.region, folder)
-
+    wait_until_stable(ctx.region, max_wait=2)
+    before = snapshot(ctx.region)
+    gui.press('f5')
+    # reload: require the page to change first, then settle
+    wait_until_stable(ctx.region, max_wait=5, baseline=before)
+    before = snapshot(ctx.region)
+    gui.hotkey('ctrl', 'shift', 'o')
+    wait_until_stable(ctx.region, max_wait=3, baseline=before)
     take_screenshot(ctx.region, folder)
 
     # Bootstrap conversation
     human_type("Hello", min_delay=0.05, max_delay=0.15)
-    pyautogui.press('enter')
-    time.sleep(0.4)
+    before = snapshot(ctx.region)
+    gui.press('enter')
+    wait_until_stable(ctx.region, max_wait=2, baseline=before)
     take_screenshot(ctx.region, folder)
 
     # Optional: click somewhere safe to close menus, etc.
-    pyautogui.moveTo(2040, 1280, duration=0.02)
-    pyautogui.click()
-    time.sleep(0.1)
+    with gui.batch():
+        gui.moveTo(2040, 1280)
+        gui.click()
+    wait_until_stable(ctx.region, max_wait=1.0)
     take_screenshot(ctx.region, folder)
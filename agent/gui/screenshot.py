@@ -1,34 +1,38 @@
-import mss, mss.tools
+import logging
 from PIL import Image, ImageDraw
 from datetime import datetime
 from pathlib import Path
-import pyautogui
+from .backend import gui
+from ..artifacts import get_store
 
-def take_screenshot(region: dict, folder: str | Path) -> str:
-    folder = Path(folder); folder.mkdir(parents=True, exist_ok=True)
-    ts = datetime.now().strftime("%Y%m%d_%H%M%S_%f")[:-3]
-    path = folder / f"screenshot_{ts}.png"
+log = logging.getLogger(__name__)
 
-    with mss.mss() as sct:
-        sct_img = sct.grab(region)
-        mss.tools.to_png(sct_img.rgb, sct_img.size, output=str(path))
-
-    cx, cy = pyautogui.position()
+def capture(region: dict) -> Image.Image:
+    """Grab `region` with the cursor drawn in, without touching the disk."""
+    im = gui.grab(region)
+    cx, cy = gui.position()
     # Translate to region space
-    rel_x, rel_y = cx - region["left"], cy - region["top"]
-    draw_cursor_on_image(str(path), rel_x, rel_y)
-    return str(path)
+    _draw_cursor(im, cx - region["left"], cy - region["top"])
+    return im
+
+def take_screenshot(region: dict, folder: str | Path, im: Image.Image | None = None) -> str:
+    """Save a capture of `region` (or the already captured `im`) and return its path."""
+    ts = datetime.fromtimestamp(gui.time()).strftime("%Y%m%d_%H%M%S_%f")[:-3]
+    return str(get_store().save_frame(capture(region) if im is None else im, folder, f"screenshot_{ts}"))
+
+def _draw_cursor(im: Image.Image, cx: int, cy: int):
+    w, h = im.size
+    # clamp so we don't draw out of bounds
+    cx = max(0, min(cx, w - 1))
+    cy = max(0, min(cy, h - 1))
+    draw = ImageDraw.Draw(im)
+    draw.line((cx - 10, cy, cx + 10, cy), fill="red", width=2)
+    draw.line((cx, cy - 10, cx, cy + 10), fill="red", width=2)
 
 def draw_cursor_on_image(path: str, cx: int, cy: int):
     try:
         with Image.open(path) as im:
-            w, h = im.size
-            # clamp so we don't draw out of bounds
-            cx = max(0, min(cx, w - 1))
-            cy = max(0, min(cy, h - 1))
-            draw = ImageDraw.Draw(im)
-            draw.line((cx - 10, cy, cx + 10, cy), fill="red", width=2)
-            draw.line((cx, cy - 10, cx, cy + 10), fill="red", width=2)
+            _draw_cursor(im, cx, cy)
             im.save(path)
     except Exception as e:
-        print(f"⚠️ cursor paint failed: {e}")
+        log.warning("⚠️ cursor paint failed: %s", e)
@@ -0,0 +1,55 @@
+"""
+Event-driven waits: return as soon as the screen stops changing (or an expected
+condition holds) instead of sleeping for a fixed time.
+"""
+from .backend import gui
+from ..imaging.compare import frame_diff
+
+SCALE = 8          # compare frames downsampled 8x (2560x1440 -> 320x180)
+THRESHOLD = 1.0    # mean abs pixel diff (0..255) still considered "unchanged"
+INTERVAL = 0.1
+
+def snapshot(region: dict, scale: int = SCALE):
+    im = gui.grab(region)
+    return im.reduce(scale) if scale > 1 else im
+
+def wait_until_stable(region: dict, threshold: float = THRESHOLD, max_wait: float = 3.0, *,
+                      interval: float = INTERVAL, stable_frames: int = 2, min_wait: float = 0.0,
+                      baseline=None, condition=None) -> bool:
+    """
+    Poll `region` until `stable_frames` consecutive frames differ by <= `threshold`,
+    or `condition(frame)` returns True. Returns False if `max_wait` elapses first.
+
+    - `baseline`: a `snapshot()` taken before the triggering action; the screen must
+      first move away from it before stability counts (so a reload that has not
+      started yet is not mistaken for a settled page).
+    - `min_wait`: never report stable earlier than this many seconds.
+    """
+    start = gui.time()
+    prev = snapshot(region)
+    changed = baseline is None or frame_diff(prev, baseline) > threshold
+    calm = 0
+    while True:
+        if condition is not None and condition(prev):
+            return True
+        if gui.time() - start >= max_wait:
+            return False
+        gui.sleep(interval)
+        cur = snapshot(region)
+        diff = frame_diff(prev, cur)
+        prev = cur
+        if not changed:
+            changed = frame_diff(cur, baseline) > threshold
+            continue
+        calm = calm + 1 if diff <= threshold else 0
+        if calm >= stable_frames and gui.time() - start >= min_wait:
+            return True
+
+def wait_for_clipboard(max_wait: float = 3.0, *, interval: float = INTERVAL) -> str:
+    """Wait until the clipboard holds non-empty text (clear it before copying)."""
+    start = gui.time()
+    while True:
+        text = gui.paste()
+        if text or gui.time() - start >= max_wait:
+            return text
+        gui.sleep(interval)
@@ -0,0 +1,287 @@
+"""
+Simulated GUI backend with a virtual clock.
+
+`SimBackend` stands in for pyautogui/pyperclip/mss: it serves scripted frames, keeps a fake
+clipboard, models a ChatGPT conversation per browser tab (paste + Enter submits a prompt, Ctrl+A/Ctrl+C
+copies the transcript; Ctrl+T/Ctrl+W/Ctrl+1..8 open, close and switch tabs; a rough memory model
+per tab lets the Chrome restart policy run) and advances a virtual clock instead of sleeping. `SimDetector` reports the
+ready/input-zone state of that conversation, so `agent.main.run` exercises the same code paths
+as production in seconds:
+
+    python -m agent.gui.sim --topics agent/data/trending_topics.json --max-topics 5 --base-dir /tmp/sim
+    python -m agent.gui.sim --max-topics 6 --tabs 3
+    python -m agent.gui.sim --max-topics 6 --tabs 2 --chrome-max-rss-mb 900
+"""
+import argparse, random, re, sys, time
+from pathlib import Path
+from PIL import Image
+from .backend import GuiBackend
+
+TAB_STATE = ("tab_id", "conversation", "busy_until", "stalled", "devtools", "_pending", "_selected", "opener")
+
+SAMPLE_HTML = """<!-- category: {category} -->
+<!-- tags: simulation, newsroom -->
+<meta name="description" content="Simulated article about {topic}.">
+<h1>{topic}</h1>
+<h2>Background</h2>
+<p>Simulated body text for {topic}.</p>
+<img src="https://example.com/sim.jpg" alt="{topic}">
+"""
+
+def default_responder(prompt: str) -> str:
+    """Canned ChatGPT answers shaped like the real agents' outputs."""
+    sections = re.findall(r"@@@ (\w+) @@@", prompt)
+    if sections:  # merged turn: answer every requested output under its marker line
+        canned = {"seo_optimizer": "Return only HTML", "article_image_generator": "dall e"}
+        return "\n".join(f"@@@ {name} @@@\n{default_responder(canned.get(name, name))}"
+                         for name in dict.fromkeys(sections))
+    if "HTML" in prompt:
+        return SAMPLE_HTML.format(category="Technology", topic=prompt[:60].strip())
+    if "dall e" in prompt.lower():
+        return "A photorealistic newsroom at dawn, wide angle, soft light."
+    return f"Simulated response to: {prompt[:80]}"
+
+class SimBackend(GuiBackend):
+    def __init__(self, *, frames=None, clipboard=None, responder=default_responder,
+                 generation_seconds=(20.0, 90.0), seed=0, start_time=None, frame_size=(320, 180),
+                 stall_rate=0.0):
+        self.now = time.time() if start_time is None else start_time
+        self.started = self.now
+        self._frames = [f if isinstance(f, Image.Image) else Image.open(f).convert("RGB")
+                        for f in (frames or [])]
+        self._frame_idx = 0
+        # blank frames are kept small: encoding full 1440p PNGs would dominate the run time
+        self._blank = Image.new("RGB", frame_size, (32, 33, 35))
+        self._scripted_clipboard = list(clipboard or [])
+        self.clipboard = ""
+        self.responder = responder
+        self.generation_seconds = generation_seconds
+        self.rng = random.Random(seed)
+        self.cursor = (0, 0)
+        self.events = []
+        self.conversation = []  # [(prompt, response)]
+        self.busy_until = 0.0
+        self.stall_rate = stall_rate  # share of prompts that freeze or end in an error banner
+        self.stalled = None           # None | "frozen" | "error"
+        self.devtools = False
+        self._pending = ""
+        self._selected = False
+        self.tab_id, self.opener = 0, None
+        self.tabs = [self._tab_state()]
+        self.tab = 0
+        self.max_open_tabs = 1
+        self.browser_restarts = 0
+        self.saved_files = []
+
+    # -- clock
+    def time(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += max(0.0, float(seconds))
+
+    # -- screen
+    def grab(self, region):
+        if self._frames:
+            im = self._frames[self._frame_idx % len(self._frames)]
+            self._frame_idx += 1
+            return im.copy()
+        return self._blank.copy()
+
+    def position(self):
+        return self.cursor
+
+    # -- input
+    def moveTo(self, x, y, duration=0.0):
+        self.events.append(("moveTo", x, y))
+        self.cursor = (int(x), int(y))
+        self.sleep(duration)
+
+    def click(self):
+        self.events.append(("click",) + self.cursor)
+
+    def rightClick(self):
+        self.events.append(("rightClick",) + self.cursor)
+
+    def scroll(self, amount):
+        self.events.append(("scroll", amount))
+
+    def typewrite(self, text):
+        self.events.append(("typewrite", text))
+        self._pending += text
+
+    def press(self, key, presses=1):
+        self.events.append(("press", key, presses))
+        if key == "enter":
+            self._submit()
+        elif key == "f5" and self.stalled:
+            # a reload shows the reply that finished server-side
+            self.stalled, self.busy_until = None, self.now
+
+    def hotkey(self, *keys):
+        self.events.append(("hotkey",) + keys)
+        combo = tuple(k.lower() for k in keys)
+        if combo == ("ctrl", "v"):
+            self._pending += self.clipboard
+        elif combo == ("ctrl", "a"):
+            self._selected = True
+        elif combo == ("ctrl", "c") and self._selected:
+            self.clipboard = self.transcript()
+        elif combo == ("ctrl", "shift", "j"):
+            self.devtools = True
+        elif combo == ("ctrl", "shift", "o"):
+            self._new_chat()
+        elif combo == ("ctrl", "t"):
+            self._open_tab(len(self.tabs))
+        elif combo == ("ctrl", "w"):
+            self._close_tab()
+        elif len(combo) == 2 and combo[0] == "ctrl" and combo[1] in "12345678":
+            self._switch_tab(min(int(combo[1]), len(self.tabs)) - 1)
+
+    # -- clipboard
+    def copy(self, text):
+        self.clipboard = text
+
+    def paste(self):
+        if self._scripted_clipboard:
+            return self._scripted_clipboard.pop(0)
+        return self.clipboard
+
+    # -- simulated chat
+    def transcript(self) -> str:
+        parts = [f"You said:\n{p}\nChatGPT said:\n{r}\n" for p, r in self.conversation]
+        return "\n".join(parts)
+
+    def is_busy(self) -> bool:
+        return self.now < self.busy_until
+
+    def _new_chat(self):
+        self.conversation, self.devtools, self._selected = [], False, False
+        self._pending, self.busy_until, self.stalled = "", 0.0, None
+
+    # -- simulated tabs (each holds its own chat)
+    def _tab_state(self) -> dict:
+        return {k: getattr(self, k) for k in TAB_STATE}
+
+    def _switch_tab(self, i):
+        self.tabs[self.tab] = self._tab_state()
+        self.tab = i
+        for k, v in self.tabs[i].items():
+            setattr(self, k, v)
+
+    def _open_tab(self, i, opener=None):
+        self.tabs[self.tab] = self._tab_state()
+        self._new_chat()
+        self.tab_id, self.opener = self.max_tab_id() + 1, opener
+        self.tabs.insert(i, self._tab_state())
+        self.tab = i
+        self.max_open_tabs = max(self.max_open_tabs, len(self.tabs))
+
+    def _close_tab(self):
+        if len(self.tabs) == 1:  # Chrome exits with its last tab; model it as a fresh chat
+            self._new_chat()
+            return
+        opener = self.opener
+        del self.tabs[self.tab]
+        ids = [t["tab_id"] for t in self.tabs]
+        # Chrome returns to the opener when closing a tab it opened, else to the right neighbour
+        self.tab = ids.index(opener) if opener in ids else min(self.tab, len(self.tabs) - 1)
+        for k, v in self.tabs[self.tab].items():
+            setattr(self, k, v)
+
+    def memory_mb(self) -> float:
+        """Stand-in for Chrome's memory: a browser base plus each tab, growing with its chat."""
+        self.tabs[self.tab] = self._tab_state()
+        return 300.0 + sum(120.0 + 40.0 * len(t["conversation"]) for t in self.tabs)
+
+    def restart_browser(self) -> bool:
+        """Chrome restarted with its profile: one fresh chat tab."""
+        self.now += 8.0
+        self._new_chat()
+        self.tab_id, self.opener = self.max_tab_id() + 1, None
+        self.tabs, self.tab = [self._tab_state()], 0
+        self.browser_restarts += 1
+        return True
+
+    def max_tab_id(self) -> int:
+        return max([t["tab_id"] for t in self.tabs] + [self.tab_id])
+
+    def _submit(self):
+        text, self._pending = self._pending.strip(), ""
+        if not text:
+            return
+        if "\n" not in text and text.startswith("/"):
+            # "Save image as" dialog: Chrome appends the extension
+            out = Path(text + ".png")
+            out.parent.mkdir(parents=True, exist_ok=True)
+            Image.new("RGB", (64, 64), (200, 120, 40)).save(out)
+            self.saved_files.append(out)
+            return
+        if self.devtools:
+            # the download helper opens the full-size image in a new tab next to the chat
+            self.devtools = False
+            self._open_tab(self.tab + 1, opener=self.tab_id)
+            return
+        if text == "chatgpt.com":
+            return
+        self.conversation.append((text, self.responder(text)))
+        self.busy_until = self.now + self.rng.uniform(*self.generation_seconds)
+        if self.stall_rate and self.rng.random() < self.stall_rate:
+            self.stalled, self.busy_until = self.rng.choice(("frozen", "error")), float("inf")
+
+class SimDetector:
+    """Answers `detect` from the simulated chat state instead of running YOLO."""
+
+    def __init__(self, backend: SimBackend, input_zone=(1280, 1250)):
+        self.backend = backend
+        self.input_zone = input_zone
+
+    def detect(self, image, conf=0.6):
+        x, y = self.input_zone
+        dets = {"input_zone": [{"center_x": x, "center_y": y, "width": 1200, "height": 90, "conf": 0.95}]}
+        if self.backend.stalled == "error":
+            dets["error_banner"] = [{"center_x": x, "center_y": y - 150, "width": 900, "height": 60, "conf": 0.9}]
+        if not self.backend.is_busy():
+            dets["ready_button"] = [{"center_x": x + 560, "center_y": y, "width": 40, "height": 40, "conf": 0.93}]
+        return [], dets
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Run the full pipeline against the simulated GUI backend")
+    ap.add_argument("--topics", type=Path, default=Path(__file__).resolve().parents[1] / "data" / "trending_topics.json")
+    ap.add_argument("--base-dir", type=Path, default=Path("sim_run"))
+    ap.add_argument("--max-topics", type=int)
+    ap.add_argument("--frames", type=Path, help="directory of recorded frames to serve instead of blank ones")
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--publish", action="store_true", help="publish to WP_SITE_URL at the end of each article")
+    ap.add_argument("--tabs", type=int, help="chat tabs to run round-robin (overrides TABS)")
+    ap.add_argument("--stall-rate", type=float, default=0.0, help="share of prompts whose chat freezes or errors")
+    ap.add_argument("--chrome-max-rss-mb", type=float, default=0.0, help="restart the simulated Chrome past this memory")
+    ap.add_argument("--chrome-restart-every", type=int, default=0, help="restart the simulated Chrome every N articles")
+    args = ap.parse_args(argv)
+
+    from ..main import run
+    from ..bench.replay import iter_frames
+    from .browser import BrowserLifecycle
+    frames = list(iter_frames(args.frames)) if args.frames else None
+    backend = SimBackend(frames=frames, seed=args.seed, stall_rate=args.stall_rate)
+    args.base_dir.mkdir(parents=True, exist_ok=True)
+    lifecycle = None
+    if args.chrome_max_rss_mb or args.chrome_restart_every:
+        lifecycle = BrowserLifecycle(max_rss_mb=args.chrome_max_rss_mb, restart_every=args.chrome_restart_every,
+                                     rss=backend.memory_mb, restart=backend.restart_browser)
+
+    t0 = time.perf_counter()
+    run(backend=backend, detector=SimDetector(backend), topics_path=args.topics,
+        base_dir=str(args.base_dir), publish=args.publish, max_topics=args.max_topics, tabs=args.tabs,
+        lifecycle=lifecycle)
+    wall = time.perf_counter() - t0
+
+    virtual = backend.now - backend.started
+    print(f"🧪 Simulated {virtual:.0f}s of GUI time in {wall:.2f}s wall "
+          f"({len(backend.events)} input events, {len(backend.saved_files)} images saved, "
+          f"{backend.max_open_tabs} tabs open at most, {len(backend.tabs)} at the end, "
+          f"{backend.browser_restarts} browser restarts)")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
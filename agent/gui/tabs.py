@@ -0,0 +1,245 @@
+"""
+Round-robin tab scheduler (TABS=N).
+
+Each article runs as a generator ("flow") that performs GUI actions in its own chat tab and
+yields the screenshot folder whenever it has submitted a prompt and needs the reply. The
+scheduler keeps up to N tabs, polls each waiting tab in turn (Ctrl+1..8 to switch), and resumes
+the first one whose chat is ready, so several articles overlap their generation time on one
+display and one Chrome. With TABS=1 it behaves like the sequential loop: poll, sleep, poll.
+
+A flow receives True when its tab became ready (or was assumed ready after the soft timeout)
+and False on a hard timeout. Its return value is the number of extra tabs it left open on top
+of its chat tab (the image download opens one). Finished chat tabs and their helper tabs are
+closed, so the strip holds only the live chats.
+
+With a `BrowserLifecycle`, Chrome's memory is checked after every article. When a restart is
+due, no new articles start; once the other tabs have finished theirs, Chrome is restarted with
+its profile and the slots are reopened, so no conversation is cut off.
+"""
+import itertools, logging
+from .backend import gui
+from .flows import observe, flight_dump
+from ..vision.decisions import found_ready
+from .settle import snapshot, wait_until_stable
+from .watchdog import get_watchdog
+from ..logging_setup import RATE_LIMITED, article_id_var, agent_var
+
+log = logging.getLogger(__name__)
+
+MAX_TABS = 8  # Ctrl+1..Ctrl+8 address tabs by position
+
+class Tab:
+    def __init__(self):
+        self.ctx = None
+        self.flow = None
+        self.folder = None  # where the pending wait's polls go
+        self.since = None   # gui.time() when the wait started
+        self.watch = None   # stall watchdog state of the pending wait
+        self.articles = 0
+
+class TabScheduler:
+    def __init__(self, detector, region, *, tabs=1, poll_seconds=10, conf=0.6,
+                 assume_ready_after=600, timeout_seconds=600, cooldown_seconds=10, url="chatgpt.com",
+                 lifecycle=None):
+        if not 1 <= tabs <= MAX_TABS:
+            raise ValueError(f"TABS must be between 1 and {MAX_TABS}")
+        self.detector = detector
+        self.region = region
+        self.tabs = tabs
+        self.poll_seconds = poll_seconds
+        self.conf = conf
+        self.assume_ready_after = assume_ready_after
+        self.timeout_seconds = timeout_seconds
+        self.cooldown_seconds = cooldown_seconds
+        self.url = url
+        self.order = []       # Tab objects in tab-strip order
+        self.slots = []       # all Tab objects, open or not
+        self.current = None
+        self.switches = self.polls = self.closed = 0
+        self.lifecycle = lifecycle
+        self.draining = False  # a restart is due: start nothing new until all tabs are idle
+        self.watchdog = get_watchdog()
+        self.horizon = assume_ready_after if assume_ready_after is not None else timeout_seconds
+
+    # -- browser tabs
+    def _switch(self, tab: Tab):
+        if tab is self.current:
+            return
+        pos = self.order.index(tab)
+        before = snapshot(self.region)
+        gui.hotkey("ctrl", str(pos + 1))
+        wait_until_stable(self.region, max_wait=2, baseline=before)
+        self.current = tab
+        self.switches += 1
+
+    def _new_tab(self, tab: Tab):
+        """Open a fresh chat tab at the end of the strip for `tab`."""
+        before = snapshot(self.region)
+        gui.hotkey("ctrl", "t")
+        wait_until_stable(self.region, max_wait=2, baseline=before)
+        gui.typewrite(self.url)
+        before = snapshot(self.region)
+        gui.press("enter")
+        wait_until_stable(self.region, max_wait=10, baseline=before)
+        if tab in self.order:
+            self.order.remove(tab)
+        self.order.append(tab)
+        self.current = tab
+
+    def _close(self):
+        before = snapshot(self.region)
+        gui.hotkey("ctrl", "w")
+        wait_until_stable(self.region, max_wait=2, baseline=before)
+        self.closed += 1
+
+    def _close_helpers(self, extra_tabs: int):
+        # helper tabs open next to their chat and shift the tabs after it, so `order` only holds
+        # once they are closed; focus returns to the opener, the used chat tab
+        for _ in range(extra_tabs):
+            self._close()
+
+    def _recycle(self, tab: Tab, extra_tabs: int):
+        """Give a finished tab a clean chat for its next article and close the used one."""
+        self._close_helpers(extra_tabs)
+        if len(self.order) > 1:
+            # other chats keep Chrome open; positions of the other tabs stay known
+            self._close()
+            self.current = None
+            self._new_tab(tab)
+            return
+        # only tab: Chrome would exit with it, so open the new chat first, then close the old
+        # one (first in the strip); focus moves to its neighbour, the new chat
+        self._new_tab(tab)
+        gui.hotkey("ctrl", "1")
+        self._close()
+        wait_until_stable(self.region, max_wait=5, min_wait=0.5)
+
+    # -- flows
+    def _resume(self, tab: Tab, value):
+        """Run the tab's flow up to its next wait; returns its extra-tab count once it finishes."""
+        article_id_var.set(tab.ctx.article_id)
+        agent_var.set("")
+        try:
+            tab.folder = tab.flow.send(value)
+            tab.since = gui.time()
+            tab.watch = self.watchdog.watch(tab.since) if self.watchdog is not None else None
+            return None
+        except StopIteration as done:
+            tab.flow, tab.folder = None, None
+            tab.articles += 1
+            return done.value or 0
+
+    def _start(self, tab: Tab, articles) -> bool:
+        """Start the next article in `tab` (runs it up to its first wait)."""
+        while True:
+            item = next(articles, None)
+            if item is None:
+                tab.flow = None
+                return False
+            tab.ctx, tab.flow = item
+            extra = self._resume(tab, None)
+            if tab.flow is not None:
+                return True
+            self._recycle(tab, extra)  # finished without waiting (e.g. fully cached)
+
+    def _finished(self, tab: Tab, extra_tabs: int, articles):
+        """A tab's article is done: recycle the tab, or hold it while a Chrome restart is due."""
+        if self.lifecycle is not None and not self.draining:
+            self.lifecycle.article_done()
+            self.draining = self.lifecycle.due()
+        if self.draining:
+            # the used chat stays open (and in place) until the restart
+            self._close_helpers(extra_tabs)
+            return
+        self._recycle(tab, extra_tabs)
+        self._start(tab, articles)
+
+    def _restart(self, articles):
+        """Restart Chrome (all tabs idle) and reopen the slots; returns the remaining articles."""
+        self.draining = False
+        item = next(articles, None)
+        if item is None:
+            return articles  # nothing left to run, no point in restarting
+        articles = itertools.chain([item], articles)
+        self.lifecycle.restart()
+        wait_until_stable(self.region, max_wait=15, min_wait=1.0)
+        tabs = self.slots
+        self.order, self.current = [tabs[0]], tabs[0]
+        if self._start(tabs[0], articles):
+            for tab in tabs[1:]:
+                self._new_tab(tab)
+                if not self._start(tab, articles):
+                    break
+        return articles
+
+    def _poll(self, tab: Tab):
+        """True/False when the tab's wait is over (ready / hard timeout), None while still busy."""
+        self.polls += 1
+        agent_var.set(tab.folder.name)
+        article_id_var.set(tab.ctx.article_id)
+        dets = observe(tab.ctx, self.detector, tab.folder, self.conf)
+        if found_ready(dets):
+            log.info("✅ Successful: ready/start button appeared again.")
+            wait_until_stable(self.region, max_wait=self.cooldown_seconds, min_wait=0.5)
+            if tab.watch is not None:
+                tab.watch.finish(gui.time(), self.horizon)
+            return True
+        if tab.watch is not None:
+            reason = tab.watch.check(dets, snapshot(self.region), gui.time())
+            if reason and not tab.watch.stall(tab.ctx, reason, gui.time()):
+                tab.watch.finish(gui.time(), self.horizon)
+                return False
+        elapsed = gui.time() - tab.since
+        if self.assume_ready_after is not None and elapsed >= self.assume_ready_after:
+            log.warning("⚠️ Assumed ready after %ss without detection.", self.assume_ready_after)
+            wait_until_stable(self.region, max_wait=self.cooldown_seconds, min_wait=0.5)
+            return True
+        if self.timeout_seconds is not None and elapsed >= self.timeout_seconds:
+            log.error("⏰ Timeout waiting for ready/start button.")
+            flight_dump(tab.ctx, "ready_timeout")
+            return False
+        return None
+
+    def run(self, articles):
+        """
+        Drive `articles`, an iterator of (ctx, flow) pairs, to completion. The current
+        browser tab becomes the first slot; the other slots are opened as new tabs.
+        """
+        articles = iter(articles)
+        first = Tab()
+        self.order, self.current = [first], first
+        self.slots = [first]
+        if not self._start(first, articles):
+            return
+        for _ in range(self.tabs - 1):
+            tab = Tab()
+            self.slots.append(tab)
+            self._new_tab(tab)
+            if not self._start(tab, articles):
+                break
+
+        while True:
+            if self.draining and not any(t.flow for t in self.order):
+                articles = self._restart(articles)
+            if not any(t.flow for t in self.order):
+                break
+            progressed = False
+            for tab in [t for t in self.order if t.flow]:
+                self._switch(tab)
+                done = self._poll(tab)
+                if done is None:
+                    continue
+                progressed = True
+                extra = self._resume(tab, done)
+                if tab.flow is None:
+                    self._finished(tab, extra, articles)
+            if not progressed:
+                if len(self.order) == 1:
+                    log.info("⏳ Not ready yet... waiting %ss", self.poll_seconds, extra=RATE_LIMITED)
+                gui.sleep(self.poll_seconds)
+        article_id_var.set("")
+        agent_var.set("")
+
+    def stats(self) -> dict:
+        return {"tabs": self.tabs, "articles": sum(t.articles for t in self.slots),
+                "polls": self.polls, "tab_switches": self.switches, "tabs_closed": self.closed}
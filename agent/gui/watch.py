@@ -0,0 +1,84 @@
+"""
+Download completion detection.
+
+Blocks on inotify (Linux) until a finished file for an article shows up in the download
+folder, skipping Chrome's `.crdownload` temporaries and anything PIL cannot decode.
+Falls back to short-interval polling where inotify is unavailable.
+"""
+import ctypes, ctypes.util, os, select, struct, time
+from pathlib import Path
+
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+_EVENT = struct.Struct("iIII")
+
+TEMP_SUFFIXES = (".crdownload", ".part", ".tmp")
+
+def _libc():
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+    except OSError:
+        return None
+    return libc if hasattr(libc, "inotify_init1") else None
+
+def is_complete_image(path: Path) -> bool:
+    from PIL import Image
+    try:
+        with Image.open(path) as im:
+            im.verify()
+        return True
+    except Exception:
+        return False
+
+def _candidate(folder: Path, article_id: str, name: str | None = None):
+    names = [name] if name else [p.name for p in folder.glob(f"{article_id}.*")]
+    for n in names:
+        if not n.startswith(f"{article_id}.") or n.endswith(TEMP_SUFFIXES):
+            continue
+        p = folder / n
+        if p.is_file() and is_complete_image(p):
+            return p
+    return None
+
+def wait_for_download(folder: str | Path, article_id: str, timeout: float = 30.0,
+                      poll_interval: float = 0.25) -> Path | None:
+    """Return the path of the completed `<article_id>.*` image in `folder`, or None on timeout."""
+    folder = Path(folder)
+    folder.mkdir(parents=True, exist_ok=True)
+    deadline = time.monotonic() + timeout
+
+    libc = _libc()
+    fd = -1
+    if libc is not None:
+        fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if fd >= 0 and libc.inotify_add_watch(fd, os.fsencode(folder), IN_CLOSE_WRITE | IN_MOVED_TO) < 0:
+            os.close(fd)
+            fd = -1
+    try:
+        # the file may already be there (watch is armed first so nothing slips in between)
+        found = _candidate(folder, article_id)
+        while found is None:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return None
+            if fd < 0:
+                time.sleep(min(poll_interval, remaining))
+                found = _candidate(folder, article_id)
+                continue
+            ready, _, _ = select.select([fd], [], [], remaining)
+            if not ready:
+                continue
+            buf = os.read(fd, 64 * 1024)
+            offset = 0
+            while offset < len(buf) and found is None:
+                _, _, _, name_len = _EVENT.unpack_from(buf, offset)
+                offset += _EVENT.size
+                name = buf[offset:offset + name_len].rstrip(b"\0").decode(errors="replace")
+                offset += name_len
+                found = _candidate(folder, article_id, name)
+        return found
+    finally:
+        if fd >= 0:
+            os.close(fd)
@@ -0,0 +1,106 @@
+"""
+Stuck-UI watchdog for the ready waits.
+
+A wait normally ends when the ready button comes back, or after `assume_ready_after` (600s) of
+polling, after which the next prompt is typed into whatever the page shows. The watchdog
+follows each wait and declares a stall early when:
+- an error-state class (error banner, login button, ...) is detected without a ready button, or
+- the screen has not changed (`frame_diff` of downsampled polls) for `frozen_seconds`, once the
+  wait has run past the expected generation window (`expected_seconds`).
+
+The first `reloads` stalls of a wait reload the page (F5), which restores the conversation and
+usually brings back the ready button. After that the wait fails, so the article is abandoned and
+its tab gets a fresh chat instead of burning the rest of the 600 seconds.
+"""
+import logging
+from .backend import gui
+from .settle import THRESHOLD, snapshot, wait_until_stable
+from ..config import Settings
+from ..imaging.compare import frame_diff
+
+log = logging.getLogger(__name__)
+
+class Watch:
+    """Activity/error state of one wait."""
+
+    def __init__(self, dog: "StallWatchdog", t: float):
+        self.dog = dog
+        self.start = self.since = self.changed = t
+        self.prev = None
+        self.stalls = 0
+
+    def check(self, dets: dict, frame, t: float) -> str | None:
+        """Feed one poll (detections + downsampled frame); returns the stall reason or None."""
+        if self.prev is None or frame_diff(self.prev, frame) > self.dog.threshold:
+            self.changed = t
+        self.prev = frame
+        errors = [c for c in self.dog.error_labels if dets.get(c)]
+        if errors:
+            return errors[0]
+        if (self.dog.frozen_seconds and t - self.since >= self.dog.expected_seconds
+                and t - self.changed >= self.dog.frozen_seconds):
+            return "frozen"
+        return None
+
+    def stall(self, ctx, reason: str, t: float) -> bool:
+        """Handle a declared stall; True if the page was reloaded and the wait should go on."""
+        from .flows import flight_dump
+        self.stalls += 1
+        self.dog.stalls += 1
+        self.dog.reasons[reason] = self.dog.reasons.get(reason, 0) + 1
+        log.warning("🐕 Stall detected (%s) after %.0fs, screen unchanged for %.0fs",
+                    reason, t - self.start, t - self.changed)
+        flight_dump(ctx, f"stall_{reason}")
+        if self.stalls > self.dog.reloads:
+            return False
+        self.dog.reloads_done += 1
+        before = snapshot(ctx.region)
+        gui.press("f5")
+        wait_until_stable(ctx.region, max_wait=15, baseline=before)
+        self.since = self.changed = gui.time()
+        self.prev = None
+        return True
+
+    def finish(self, t: float, horizon: float | None):
+        """Close the wait; credits the time the old fixed wait would have spent on top."""
+        if self.stalls and horizon:
+            self.dog.seconds_saved += max(0.0, horizon - (t - self.start))
+
+class StallWatchdog:
+    def __init__(self, *, expected_seconds=120, frozen_seconds=120, error_labels=("error_banner",),
+                 reloads=1, threshold=THRESHOLD):
+        self.expected_seconds = expected_seconds
+        self.frozen_seconds = frozen_seconds
+        self.error_labels = tuple(error_labels)
+        self.reloads = reloads
+        self.threshold = threshold
+        self.stalls = self.reloads_done = 0
+        self.reasons = {}
+        self.seconds_saved = 0.0
+
+    def watch(self, t: float | None = None) -> Watch:
+        return Watch(self, gui.time() if t is None else t)
+
+    def stats(self) -> dict:
+        return {"stalls": self.stalls, "reloads": self.reloads_done,
+                "seconds_saved": round(self.seconds_saved), **self.reasons}
+
+_watchdog: StallWatchdog | None = None
+_configured = False
+
+def get_watchdog() -> StallWatchdog | None:
+    """The process watchdog, or None when WATCHDOG_FROZEN_SECONDS is 0 and no error labels are set."""
+    global _watchdog, _configured
+    if not _configured:
+        _configured = True
+        s = Settings.default()
+        labels = [c.strip() for c in s.watchdog_error_labels.split(",") if c.strip()]
+        if s.watchdog_frozen_seconds > 0 or labels:
+            _watchdog = StallWatchdog(expected_seconds=s.watchdog_expected_seconds,
+                                      frozen_seconds=s.watchdog_frozen_seconds,
+                                      error_labels=labels, reloads=s.watchdog_reloads)
+    return _watchdog
+
+def set_watchdog(watchdog: StallWatchdog | None):
+    global _watchdog, _configured
+    _watchdog, _configured = watchdog, True
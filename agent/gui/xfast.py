@@ -0,0 +1,226 @@
+"""
+Low-latency X11 input backend (GUI_FAST=1).
+
+Same calls as `PyAutoGuiBackend`, but:
+- one persistent X connection sends XTest events directly; a whole action (hotkey chord,
+  typed string, scroll burst, or a `gui.batch()` block) is flushed with a single round trip
+- no cursor animation and no pyautogui PAUSE between calls
+- the clipboard is served by our own CLIPBOARD selection owner thread (no xclip process per
+  copy); paste reads the selection over the same persistent connection
+- one mss instance is reused for captures
+
+python-xlib ships with pyautogui on Linux. Measure with `python -m agent.bench.input`.
+"""
+import contextlib, threading, time
+from .backend import PyAutoGuiBackend
+
+# pyautogui key names -> X keysym names
+KEYSYMS = {
+    "enter": "Return", "return": "Return", "esc": "Escape", "escape": "Escape", "tab": "Tab",
+    "space": "space", "backspace": "BackSpace", "delete": "Delete", "del": "Delete",
+    "up": "Up", "down": "Down", "left": "Left", "right": "Right",
+    "pageup": "Prior", "pagedown": "Next", "home": "Home", "end": "End", "insert": "Insert",
+    "ctrl": "Control_L", "ctrlleft": "Control_L", "ctrlright": "Control_R",
+    "shift": "Shift_L", "shiftleft": "Shift_L", "shiftright": "Shift_R",
+    "alt": "Alt_L", "altleft": "Alt_L", "altright": "Alt_R", "win": "Super_L", "super": "Super_L",
+    **{f"f{i}": f"F{i}" for i in range(1, 25)},
+}
+SCROLL_UP, SCROLL_DOWN = 4, 5
+# python-xlib cannot send more than this in one ChangeProperty without INCR
+MAX_SELECTION_BYTES = 250_000
+
+class ClipboardOwner:
+    """Owns CLIPBOARD on its own connection and answers SelectionRequests from a daemon thread."""
+
+    def __init__(self, display_name=None):
+        from Xlib import X, Xatom, display
+        self._X, self._Xatom = X, Xatom
+        self.d = display.Display(display_name)
+        self.win = self.d.screen().root.create_window(0, 0, 1, 1, 0, X.CopyFromParent)
+        self.CLIPBOARD = self.d.intern_atom("CLIPBOARD")
+        self.TARGETS = self.d.intern_atom("TARGETS")
+        self.UTF8 = self.d.intern_atom("UTF8_STRING")
+        self.TEXT = self.d.intern_atom("TEXT")
+        self.text = b""
+        self.owned = False
+        threading.Thread(target=self._serve, name="clipboard-owner", daemon=True).start()
+
+    def set(self, text: str):
+        self.text = text.encode("utf-8")
+        self.win.set_selection_owner(self.CLIPBOARD, self._X.CurrentTime)
+        self.d.sync()
+        self.owned = self.d.get_selection_owner(self.CLIPBOARD) == self.win
+
+    def _serve(self):
+        from Xlib.protocol import event
+        X, Xatom = self._X, self._Xatom
+        while True:
+            e = self.d.next_event()
+            if e.type == X.SelectionClear:
+                self.owned = False  # someone else (e.g. Chrome on ctrl+c) took the clipboard
+            elif e.type == X.SelectionRequest:
+                prop = e.property or e.target
+                if e.target == self.TARGETS:
+                    e.requestor.change_property(prop, Xatom.ATOM, 32, [self.TARGETS, self.UTF8, Xatom.STRING])
+                elif e.target in (self.UTF8, self.TEXT, Xatom.STRING):
+                    e.requestor.change_property(prop, e.target, 8, self.text)
+                else:
+                    prop = X.NONE
+                e.requestor.send_event(event.SelectionNotify(
+                    time=e.time, requestor=e.requestor, selection=e.selection, target=e.target, property=prop))
+                self.d.flush()
+
+class XTestBackend(PyAutoGuiBackend):
+    def __init__(self, display_name=None):
+        super().__init__()
+        import Xlib.threaded  # noqa: F401  (must precede Display() for cross-thread use)
+        from Xlib import X, XK, display
+        from Xlib.ext import xtest
+        self._pg.PAUSE = 0  # only used by fallbacks now
+        self._X, self._XK, self._xtest = X, XK, xtest
+        self.d = display.Display(display_name)
+        self.root = self.d.screen().root
+        self._win = self.root.create_window(0, 0, 1, 1, 0, X.CopyFromParent)
+        self._prop = self.d.intern_atom("AGENT_PASTE")
+        self._clip = ClipboardOwner(display_name)
+        self._sct = self._mss.mss()
+        self._depth = 0
+        self._keycodes = {}
+        self.fallbacks = 0
+
+    # -- batching
+    @contextlib.contextmanager
+    def batch(self):
+        """Send everything inside the block with one round trip."""
+        self._depth += 1
+        try:
+            yield
+        finally:
+            self._depth -= 1
+            self._flush()
+
+    def _flush(self):
+        if not self._depth:
+            self.d.sync()
+
+    # -- keys
+    def _keycode(self, key: str):
+        """(keycode, needs_shift) for a pyautogui key name or single character, or None."""
+        if key in self._keycodes:
+            return self._keycodes[key]
+        name = KEYSYMS.get(key.lower(), key)
+        keysym = self._XK.string_to_keysym(name)
+        if not keysym and len(key) == 1:
+            # Latin-1 keysyms equal the code point; others live at 0x01000000 + code point
+            keysym = ord(key) if ord(key) < 0x100 else 0x01000000 + ord(key)
+        code = self.d.keysym_to_keycode(keysym) if keysym else 0
+        result = None
+        if code:
+            result = (code, self.d.keycode_to_keysym(code, 0) != keysym)
+        self._keycodes[key] = result
+        return result
+
+    def _tap(self, code, shift=False):
+        X, fake = self._X, self._xtest.fake_input
+        if shift:
+            fake(self.d, X.KeyPress, self._keycode("shift")[0])
+        fake(self.d, X.KeyPress, code)
+        fake(self.d, X.KeyRelease, code)
+        if shift:
+            fake(self.d, X.KeyRelease, self._keycode("shift")[0])
+
+    def press(self, key, presses=1):
+        kc = self._keycode(key)
+        if kc is None:
+            self.fallbacks += 1
+            return super().press(key, presses=presses)
+        for _ in range(presses):
+            self._tap(*kc)
+        self._flush()
+
+    def hotkey(self, *keys):
+        codes = [self._keycode(k) for k in keys]
+        if None in codes:
+            self.fallbacks += 1
+            return super().hotkey(*keys)
+        X, fake = self._X, self._xtest.fake_input
+        for code, _ in codes:
+            fake(self.d, X.KeyPress, code)
+        for code, _ in reversed(codes):
+            fake(self.d, X.KeyRelease, code)
+        self._flush()
+
+    def typewrite(self, text):
+        codes = [self._keycode("enter" if ch == "\n" else ch) for ch in text]
+        if None in codes:
+            self.fallbacks += 1
+            return self._pg.typewrite(text, interval=0)
+        for code, shift in codes:
+            self._tap(code, shift)
+        self._flush()
+
+    # -- mouse
+    def moveTo(self, x, y, duration=0.0):
+        # no animation in fast mode
+        self._xtest.fake_input(self.d, self._X.MotionNotify, x=int(x), y=int(y))
+        self._flush()
+
+    def position(self):
+        p = self.root.query_pointer()
+        return int(p.root_x), int(p.root_y)
+
+    def _button(self, button, count=1):
+        X, fake = self._X, self._xtest.fake_input
+        for _ in range(count):
+            fake(self.d, X.ButtonPress, button)
+            fake(self.d, X.ButtonRelease, button)
+        self._flush()
+
+    def click(self):
+        self._button(1)
+
+    def rightClick(self):
+        self._button(3)
+
+    def scroll(self, amount):
+        # pyautogui semantics: positive = up, one wheel click per unit; sent as one burst
+        self._button(SCROLL_UP if amount > 0 else SCROLL_DOWN, abs(int(amount)))
+
+    # -- capture / clipboard
+    def grab(self, region):
+        from PIL import Image
+        shot = self._sct.grab(region)
+        return Image.frombytes("RGB", shot.size, shot.rgb)
+
+    def copy(self, text):
+        if len(text.encode("utf-8")) > MAX_SELECTION_BYTES:
+            self.fallbacks += 1
+            return super().copy(text)
+        self._clip.set(text)
+        if not self._clip.owned:
+            self.fallbacks += 1
+            super().copy(text)
+
+    def paste(self, timeout=1.0) -> str:
+        if self._clip.owned:
+            return self._clip.text.decode("utf-8")
+        X = self._X
+        self._win.convert_selection(self._clip.CLIPBOARD, self._clip.UTF8, self._prop, X.CurrentTime)
+        self.d.flush()
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if not self.d.pending_events():
+                time.sleep(0.002)
+                continue
+            e = self.d.next_event()
+            if e.type != X.SelectionNotify:
+                continue
+            if e.property == X.NONE:
+                return ""
+            prop = self._win.get_full_property(self._prop, X.AnyPropertyType)
+            if prop is None or prop.property_type == self.d.intern_atom("INCR"):
+                break  # large transfer: let xclip handle it
+            value = prop.value
+            return value.decode("utf-8", "replace") if isinstance(value, bytes) else str(value)
+        self.fallbacks += 1
+        return super().paste()
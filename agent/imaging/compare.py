@@ -1,11 +1,19 @@
+import logging
 from PIL import Image, ImageChops, ImageStat
 
+log = logging.getLogger(__name__)
+
+def frame_diff(im1: Image.Image, im2: Image.Image) -> float:
+    """Mean absolute per-channel difference (0..255) between two same-mode frames."""
+    if im1.size != im2.size:
+        return 255.0
+    stat = ImageStat.Stat(ImageChops.difference(im1, im2))
+    return sum(stat.mean) / len(stat.mean)
+
 def images_are_similar(p1: str, p2: str, tolerance=5) -> bool:
     with Image.open(p1).convert("RGB") as im1, Image.open(p2).convert("RGB") as im2:
         if im1.size != im2.size:
             return False
-        diff = ImageChops.difference(im1, im2)
-        stat = ImageStat.Stat(diff)
-        mean_diff = sum(stat.mean) / len(stat.mean)
-        print(f"📸 Mean pixel diff: {mean_diff}")
+        mean_diff = frame_diff(im1, im2)
+        log.debug("📸 Mean pixel diff: %.2f", mean_diff)
         return mean_diff <= tolerance
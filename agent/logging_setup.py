@@ -1,8 +1,142 @@
-import logging, sys
-
-def setup_logging(level=logging.INFO):
-    logging.basicConfig(
-        level=level,
-        format="%(asctime)s %(levelname)s %(name)s - %(message)s",
-        handlers=[logging.StreamHandler(sys.stdout)]
-    )
+"""
+Non-blocking structured logging.
+
+Records are put on a bounded queue by a `QueueHandler` (never blocks: when the queue is
+full the record is dropped and counted) and written by a `QueueListener` thread. Each
+record carries the current `article_id` / `agent` from `log_context`, polling messages that
+opt in with `extra=RATE_LIMITED` (e.g. "Not ready yet") are rate-limited, and LOG_JSON=1
+switches the output to one JSON object per line.
+"""
+import atexit, contextlib, contextvars, json, logging, queue, sys, threading, time
+from logging.handlers import QueueHandler, QueueListener
+
+article_id_var = contextvars.ContextVar("article_id", default="")
+agent_var = contextvars.ContextVar("agent", default="")
+RATE_LIMITED = {"ratelimit": True}  # log.info(..., extra=RATE_LIMITED) for repeated polling messages
+
+@contextlib.contextmanager
+def log_context(**fields):
+    """Attach `article_id` and/or `agent` to every record logged inside the block."""
+    tokens = [(var, var.set(fields[name])) for name, var in (("article_id", article_id_var), ("agent", agent_var))
+              if name in fields]
+    try:
+        yield
+    finally:
+        for var, token in reversed(tokens):
+            var.reset(token)
+
+class ContextFilter(logging.Filter):
+    # runs in the caller's thread, where the context variables are set
+    def filter(self, record):
+        record.article_id = article_id_var.get()
+        record.agent = agent_var.get()
+        return True
+
+class RateLimitFilter(logging.Filter):
+    """
+    Let an opted-in record (`extra=RATE_LIMITED`) through at most once per `interval` seconds
+    per call site, message text and article/agent; the next one that passes reports how many were
+    suppressed. Other records and ERROR and above always pass.
+    """
+    def __init__(self, interval=10.0):
+        super().__init__()
+        self.interval = interval
+        # (pathname, lineno, message, article_id, agent) -> (last_emit, suppressed), oldest emit first
+        self._seen = {}
+        self._lock = threading.Lock()
+
+    def filter(self, record):
+        if self.interval <= 0 or record.levelno >= logging.ERROR or not getattr(record, "ratelimit", False):
+            return True
+        key = (record.pathname, record.lineno, record.getMessage(), article_id_var.get(), agent_var.get())
+        now = time.monotonic()
+        with self._lock:
+            last, suppressed = self._seen.get(key, (None, 0))
+            if last is not None and now - last < self.interval:
+                self._seen[key] = (last, suppressed + 1)
+                return False
+            self._seen.pop(key, None)
+            self._seen[key] = (now, 0)
+            # keys of finished articles would pile up: drop the ones whose window is over
+            while (oldest := next(iter(self._seen))) != key and now - self._seen[oldest][0] >= self.interval:
+                del self._seen[oldest]
+        if suppressed:
+            record.suppressed = suppressed
+        return True
+
+class DroppingQueueHandler(QueueHandler):
+    def __init__(self, q):
+        super().__init__(q)
+        self.dropped = 0
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+    def prepare(self, record):
+        # format the message in the caller (args may be mutated later) but keep the record's fields
+        record = super().prepare(record)
+        if getattr(record, "suppressed", 0):
+            record.msg = f"{record.msg} (+{record.suppressed} similar suppressed)"
+        return record
+
+class TextFormatter(logging.Formatter):
+    def format(self, record):
+        ctx = "/".join(v for v in (getattr(record, "article_id", ""), getattr(record, "agent", "")) if v)
+        record.ctx = f" [{ctx}]" if ctx else ""
+        return super().format(record)
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record):
+        out = {
+            "ts": round(record.created, 3),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+        }
+        for key in ("article_id", "agent"):
+            if getattr(record, key, ""):
+                out[key] = getattr(record, key)
+        if record.exc_info:
+            out["exc"] = self.formatException(record.exc_info)
+        return json.dumps(out, ensure_ascii=False)
+
+_listener: QueueListener | None = None
+_handler: DroppingQueueHandler | None = None
+
+def setup_logging(level=None, *, json_output=None, rate_limit_seconds=None, queue_size=10000):
+    """Install the queue pipeline on the root logger (idempotent; later calls only adjust the level)."""
+    global _listener, _handler
+    from .config import Settings
+    settings = Settings.default()
+    root = logging.getLogger()
+    root.setLevel(level or settings.log_level)
+    if _listener is not None:
+        return _handler
+    json_output = settings.log_json if json_output is None else json_output
+    rate_limit_seconds = settings.log_rate_limit_seconds if rate_limit_seconds is None else rate_limit_seconds
+
+    stream = logging.StreamHandler(sys.stdout)
+    stream.setFormatter(JsonFormatter() if json_output else
+                        TextFormatter("%(asctime)s %(levelname)s %(name)s%(ctx)s - %(message)s"))
+    _handler = DroppingQueueHandler(queue.Queue(maxsize=queue_size))
+    _handler.addFilter(ContextFilter())
+    _handler.addFilter(RateLimitFilter(rate_limit_seconds))
+    for h in list(root.handlers):
+        root.removeHandler(h)
+    root.addHandler(_handler)
+    _listener = QueueListener(_handler.queue, stream, respect_handler_level=True)
+    _listener.start()
+    atexit.register(shutdown_logging)
+    return _handler
+
+def shutdown_logging():
+    """Flush queued records and stop the writer thread."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+        if _handler is not None and _handler.dropped:
+            print(f"⚠️ {_handler.dropped} log records dropped (queue full)", file=sys.stderr)
@@ -1,108 +1,282 @@
-import os, time
+import logging, os, time
+_T0 = time.perf_counter()
 os.environ.setdefault("DISPLAY", ":1")
-import pyautogui
-pyautogui.FAILSAFE = False
 
 from pathlib import Path
 from .config import Settings
 from .context import Context
-from .logging_setup import setup_logging
+from .logging_setup import setup_logging, article_id_var, log_context
 from .pipeline.topics import load_trending_topics
-from .pipeline.agents import generate_agents_for_topic
-from .vision.detector import Detector
-from .gui.flows import run_agent, automate_text_capture, reset_interface
+from .pipeline.agents import plan_turns, load_pipeline, with_context
+from .pipeline.cache import ResponseCache, cached_prefix, store_turns
+from .pipeline.dedup import NearDupIndex, headline
+from .gui.backend import gui, set_backend
+from .gui.settle import wait_until_stable
+from .gui.tabs import TabScheduler
+from .gui.watchdog import get_watchdog
+from .artifacts import get_store, disk_usage
+from .recorder import get_recorder
+from .catalog import Catalog, get_catalog, set_catalog
 from .parsing.blocks import extract_and_save_blocks
 from .parsing.preprocess import preprocess_article
-from .wordpress.publish import publish_article_html_auto
-from .gui.flows import run_agent, automate_text_capture, reset_interface, wait_for_ready
+from .gui.flows import submit_agent, automate_text_capture, reset_interface, flight_dump
 from .gui.downloader import image_downloader
-def parse_ai_response(ctx, agents_list):
+from .gui.browser import BrowserLifecycle, wait_for_browser
+
+log = logging.getLogger(__name__)
+
+def parse_ai_response(ctx, agents_list, *, cache=None, topic=None, upstream="") -> list[str]:
+    """Split the captured transcript into output files; returns the outputs saved."""
     input_txt = ctx.screenshots_dir / f"{ctx.article_id}.txt"
     if not input_txt.exists():
-        print(f"❌ Input file not found: {input_txt}")
-        return
+        log.error("❌ Input file not found: %s", input_txt)
+        return []
     content = input_txt.read_text(encoding="utf-8").replace("\r\n", "\n")
-    extract_and_save_blocks(content, agents_list, ctx.article_dir)
+    saved = extract_and_save_blocks(content, agents_list, ctx.article_dir)
+    if cache is not None:
+        store_turns(cache, topic, agents_list, ctx.article_dir, upstream)
+    catalog = get_catalog()
+    if catalog is not None:
+        for p in sorted(ctx.article_dir.glob("*.txt")):
+            catalog.add_artifact(ctx.article_id, "output", p)
+        catalog.article(ctx.article_id, status="captured")
+    return saved
 
-def run():
+def run(*, backend=None, detector=None, topics_path=None, base_dir=".", publish=True, max_topics=None,
+        tabs=None, lifecycle=None):
+    """
+    Process every trending topic end to end.
+
+    `backend`/`detector` override the real X11 backend and YOLO model (see `agent.gui.sim`),
+    `publish=False` stops after the image download, `max_topics` caps the run, `tabs` overrides TABS.
+    `lifecycle` replaces the Chrome restart policy (built from CHROME_* for the real browser).
+    """
     setup_logging()
     settings = Settings.default()
+    if backend is not None:
+        set_backend(backend)
 
-    topics_path = Path(__file__).resolve().parents[0] / "data" / "trending_topics.json"
+    topics_path = Path(topics_path or Path(__file__).resolve().parents[0] / "data" / "trending_topics.json")
     if not topics_path.exists():
-        print(f"⚠️ No trending_topics.json found at {topics_path}. Create one to proceed.")
+        log.warning("⚠️ No trending_topics.json found at %s. Create one to proceed.", topics_path)
         return
     trending_topics = load_trending_topics(topics_path)
+    pipeline = load_pipeline(settings.pipeline_path)
+    cache = None
+    if settings.response_cache_ttl_hours > 0:
+        cache = ResponseCache(Path(base_dir) / settings.response_cache_dir,
+                              ttl_seconds=settings.response_cache_ttl_hours * 3600,
+                              max_bytes=int(settings.response_cache_max_mb * 2**20))
+
+    dedup = None
+    if settings.dedup_threshold > 0:
+        dedup = NearDupIndex(Path(base_dir) / settings.dedup_index_path,
+                             threshold=settings.dedup_threshold, window_days=settings.dedup_window_days)
+        added = dedup.sync(Path(base_dir) / "article_content")
+        log.info("🪞 Duplicate index: %d documents (%d new articles)", len(dedup.docs), added)
+    catalog = Catalog(Path(base_dir) / settings.catalog_path) if settings.catalog_path else None
+    set_catalog(catalog)
+
+    if detector is None and settings.detector_socket:
+        from .vision.service import DetectorClient
+        detector = DetectorClient(settings.detector_socket)
+    elif detector is None:
+        # ultralytics/torch are imported here only; load + warm up while the browser boots
+        from .vision.detector import Detector
+        detector = Detector(settings.weights_path, background=True)
+    if settings.detector_track:
+        from .vision.tracker import TrackingDetector
+        detector = TrackingDetector(detector, refresh_every=settings.detector_track_refresh,
+                                    refresh_diff=settings.detector_track_refresh_diff)
+
+    if backend is None:
+        if not wait_for_browser(timeout=120):
+            log.warning("⚠️ No Chrome process found after 120s, continuing anyway.")
+        wait_until_stable(settings.screen_region, max_wait=15, min_wait=1.0)
+    store = get_store()
+    recorder = get_recorder()
+    if recorder is not None:
+        recorder.install_signal()  # kill -USR1 <pid> dumps the ring on demand
+    screenshots_root = Path(base_dir) / "screenshots"
+    max_bytes = int(settings.artifact_max_gb * 1e9) if settings.artifact_max_gb else None
+
+    def articles():
+        processed = 0
+        for category, topics in trending_topics.items():
+            for topic in topics:
+                if max_topics is not None and processed >= max_topics:
+                    return
+                match = dedup.query(topic) if dedup is not None else None
+                if match:
+                    log.info("🪞 Skipping near-duplicate topic: %s  ~  %s (%s, score %.2f)",
+                             topic, match["label"], match["id"], match["score"])
+                    continue
+                processed += 1
+                # with TABS>1 other articles are still writing their screenshots: never touch those
+                freed = store.enforce_retention(screenshots_root, max_bytes=max_bytes,
+                                                max_age_days=settings.artifact_max_age_days, exclude=active)
+                if freed:
+                    log.info("🧹 Retention removed %.1f MB of old screenshots", freed / 1e6)
+                ctx = Context.new(base_dir=base_dir, region=settings.screen_region)
+                yield ctx, tracked(ctx, article_flow(ctx, category, topic))
+
+    active = set()  # screenshots_dir of every article in flight
 
-    detector = Detector(settings.weights_path)
+    def tracked(ctx, flow):
+        active.add(ctx.screenshots_dir)
+        try:
+            return (yield from flow)
+        finally:
+            active.discard(ctx.screenshots_dir)
 
-    for category, topics in trending_topics.items():
-        for topic in topics:
-            ctx = Context.new(base_dir=".", region=settings.screen_region)
-            print(f"🔄 Processing article: {topic}  |  ARTICLE_ID={ctx.article_id}")
+    first_turn = [True]
 
-            agents_list = generate_agents_for_topic(topic)
-            published = False
-            # ✅ Reset interface before starting agents
+    def article_flow(ctx, category, topic):
+        """
+        One article in the current tab. Yields a screenshot folder each time it has sent a
+        prompt and needs the reply (the tab scheduler resumes it once the chat is ready).
+        """
+        article_id_var.set(ctx.article_id)
+        log.info("🔄 Processing article: %s  |  ARTICLE_ID=%s", topic, ctx.article_id)
+        if catalog is not None:
+            catalog.article(ctx.article_id, topic=topic, category=category, created=time.time(), status="started")
+
+        def timed(stage, t0, ok=True):
+            if catalog is not None:
+                catalog.record_stage(ctx.article_id, stage, t0, gui.time() - t0, ok)
+
+        turns = plan_turns(topic, category, pipeline)
+        log.info("🧭 %d turns: %s", len(turns), " → ".join(t["name"] for t in turns))
+        upstream = ""
+        if cache is not None:
+            planned = len(turns)
+            turns, cached_outputs, upstream = cached_prefix(cache, topic, turns, ctx.article_dir)
+            if len(turns) < planned:
+                log.info("♻️ %d/%d turns answered from the response cache", planned - len(turns), planned)
+        published = not turns
+        # ✅ Reset interface before starting agents
+        reset_interface(ctx)
+        if first_turn[0]:
+            first_turn[0] = False
+            ready = detector.wait_ready() if hasattr(detector, "wait_ready") else True
+            log.info("⏱️ Time to first agent turn: %.1fs (detector %s)",
+                     time.perf_counter() - _T0, "ready" if ready else "FAILED")
+        ok = yield ctx.screenshots_dir / "reset_interface"
+        for i, turn in enumerate(turns):
+            if i == 0 and upstream:
+                turn = with_context(turn, cached_outputs, turns)
+            if not ok:
+                log.error("⏰ Timeout: '%s' never reached ready state.", turn["name"])
+                break
+            t0 = gui.time()
+            with log_context(agent=turn["name"]):
+                submit_agent(ctx, detector, turn)
+            ok = yield ctx.screenshots_dir / turn["name"]
+            timed(turn["name"], t0, ok)
+            if i == len(turns) - 1 and ok:
+                published = True
+
+        if not published:
+            if catalog is not None:
+                catalog.article(ctx.article_id, status="failed")
+            return 0
+        # ✅ Ensure UI is back to ready state before copying text
+        if turns:
+            wait_until_stable(ctx.region, max_wait=5)
+            automate_text_capture(ctx)
+            saved = parse_ai_response(ctx, turns, cache=cache, topic=topic, upstream=upstream)
+            missing = [n for t in turns for n in t.get("html", ()) if n not in saved]
+            if missing:
+                log.error("❌ No %s output captured; not publishing this article.", ", ".join(missing))
+                if catalog is not None:
+                    catalog.article(ctx.article_id, status="failed")
+                flight_dump(ctx, "missing_output")
+                return 0
+        image_turn = pipeline["image_turn"]
+        if image_turn.get("new_chat"):
             reset_interface(ctx)
-            for agent in list(agents_list):
-                ok = run_agent(ctx, detector, agent)
-                if agent["name"] == "article_image_generator" and ok:
-                    published = True
-                    break
-
-            if published:
-                # ✅ Ensure UI is back to ready state before copying text
-                # wait_for_ready(
-                #     ctx, detector,
-                #     folder=ctx.screenshots_dir / "pre_capture_wait",
-                #     poll_seconds=5,
-                #     timeout_seconds=600,
-                #     conf=0.6
-                # )
-                time.sleep(5)
-                automate_text_capture(ctx)
-                parse_ai_response(ctx, agents_list)
-                reset_interface(ctx)
-                time.sleep(2)
-
-                image_prompt_path = ctx.article_dir / "article_image_generator.txt"
-                if image_prompt_path.exists():
-                    image_prompt = "Generate this realistic image : " + image_prompt_path.read_text(encoding="utf-8").strip()
-                else:
-                    image_prompt = "Fallback prompt."
-                    #continue  # Skip if no image prompt file found
-                # Re-run image agent with composed prompt (optional UI step)
-                run_agent(ctx, detector, {"name": "article_image_generator", "prompt": image_prompt})
-
-                # Download image
-                print("🖼️ Image generation complete. Downloading image...")
-                image_downloader(ctx)
-
-                # Publish
-                html_content = preprocess_article(ctx.article_dir, ctx.article_id)
+            yield ctx.screenshots_dir / "reset_interface"
+
+        image_prompt_path = ctx.article_dir / "article_image_generator.txt"
+        if image_prompt_path.exists():
+            image_prompt = image_turn["prompt"].format(
+                image_prompt=image_prompt_path.read_text(encoding="utf-8").strip())
+        else:
+            image_prompt = "Fallback prompt."
+            #continue  # Skip if no image prompt file found
+        # Image generation turn (same chat unless the pipeline asks for a fresh one)
+        t0 = gui.time()
+        with log_context(agent="image_generation"):
+            submit_agent(ctx, detector, {"name": "image_generation", "prompt": image_prompt})
+        ok = yield ctx.screenshots_dir / "image_generation"
+        timed("image_generation", t0, ok)
+
+        # Download image (the helper opens the image in a new tab)
+        log.info("🖼️ Image generation complete. Downloading image...")
+        t0 = gui.time()
+        image_path = image_downloader(ctx)
+        timed("image_download", t0, image_path is not None)
+
+        # Publish
+        if publish:
+            from .wordpress.publish import publish_article_html_auto
+            html_content = preprocess_article(ctx.article_dir, ctx.article_id)
+            t0 = gui.time()
+            try:
                 result = publish_article_html_auto(
                     html_content=html_content,
                     site_url=settings.wp_site_url,
                     username=settings.wp_user,
                     app_password=settings.wp_app_password,
                     article_id=ctx.article_id,
-                    local_image_dir=Path("screenshots/generated_images"),
-                    default_image_url=settings.default_image_url
+                    image_path=image_path,
+                    local_image_dir=Path(base_dir) / "screenshots" / "generated_images",
+                    default_image_url=settings.default_image_url,
+                    verify_seo=settings.yoast_verify,
+                    article_dir=ctx.article_dir,
                 )
-                print(f"✅ Draft created. Post ID: {result['id']}  |  Title: {result['title']}  |  Link: {result['link']}")
-
-            # Prepare for next article
-            pyautogui.hotkey('ctrl', 't')
-            time.sleep(1)
-            pyautogui.typewrite('chatgpt.com')
-            time.sleep(0.5)
-            pyautogui.press('enter')
-            reset_interface(ctx)
-            time.sleep(3)
+            except Exception:
+                timed("publish", t0, False)
+                if catalog is not None:
+                    catalog.article(ctx.article_id, status="failed")
+                flight_dump(ctx, "publish_failed")
+                raise
+            timed("publish", t0)
+            log.info("✅ Draft created. Post ID: %s  |  Title: %s  |  Link: %s",
+                     result["id"], result["title"], result["link"])
+            if dedup is not None:
+                dedup.add(f"topic:{ctx.article_id}", topic)
+                dedup.add(f"article:{ctx.article_id}", headline(html_content),
+                          kind="article", label=ctx.article_id)
+        else:
+            log.info("⏭️ Publishing disabled for this run.")
+        if settings.artifact_pack:
+            store.pack(ctx.screenshots_dir)
+        return 1
+
+    if lifecycle is None and backend is None and (settings.chrome_max_rss_mb or settings.chrome_restart_every):
+        lifecycle = BrowserLifecycle(max_rss_mb=settings.chrome_max_rss_mb,
+                                     restart_every=settings.chrome_restart_every,
+                                     profile_dir=settings.chrome_profile_dir)
+    scheduler = TabScheduler(detector, settings.screen_region, tabs=tabs or settings.tabs, lifecycle=lifecycle)
+    scheduler.run(articles())
+    log.info("🗂️ Tabs: %s", ", ".join(f"{k}={v}" for k, v in scheduler.stats().items()))
+    if lifecycle is not None:
+        lifecycle.sample()
+        log.info("🧠 Chrome: %s", ", ".join(f"{k}={v}" for k, v in lifecycle.stats().items()))
+    watchdog = get_watchdog()
+    if watchdog is not None:
+        log.info("🐕 Watchdog: %s", ", ".join(f"{k}={v}" for k, v in watchdog.stats().items()))
+
+    report = store.report()
+    report["screenshots_mb_on_disk"] = round(disk_usage(screenshots_root) / 1e6, 1) if screenshots_root.exists() else 0.0
+    article_id_var.set("")
+    log.info("💾 Artifacts: %s", ", ".join(f"{k}={v}" for k, v in report.items()))
+    if hasattr(detector, "fast_runs"):
+        log.info("🎯 Tracker: %s", ", ".join(f"{k}={v}" for k, v in detector.stats().items()))
 
     # Shutdown
-    pyautogui.hotkey('alt', 'f4')
+    gui.hotkey('alt', 'f4')
 
 if __name__ == "__main__":
     run()
@@ -1,6 +1,11 @@
-import re
+import logging, re
 from pathlib import Path
 
+log = logging.getLogger(__name__)
+
+SECTION_RE = re.compile(r"^[ \t]*@@@[ \t]*(\w+)[ \t]*@@@[ \t]*$", flags=re.MULTILINE)
+HTML_RE = re.compile(r"<(?:html|body|article|h1|h2|p)\b", flags=re.IGNORECASE)
+
 def _next_block(text: str, start_pos: int = 0):
     x = re.search(r"ChatGPT said\s*:\s*", text[start_pos:], flags=re.IGNORECASE)
     if not x: return None, start_pos
@@ -9,14 +14,49 @@ def _next_block(text: str, start_pos: int = 0):
     block_end = block_start + (y.start() if y else len(text))
     return text[block_start:block_end].strip(), block_end
 
-def extract_and_save_blocks(content: str, agents_list: list[dict], out_dir: Path):
+def split_sections(block: str, outputs: list[str], html: list[str] = ()) -> dict[str, str]:
+    """
+    Split a merged-turn reply on its `@@@ name @@@` marker lines. `html` lists the outputs that
+    are HTML; without markers, an HTML-looking reply goes to the last of them and anything else
+    to none of them (the article then fails instead of publishing a misfiled reply).
+    """
+    if len(outputs) == 1:
+        return {outputs[0]: block}
+    marks = list(SECTION_RE.finditer(block))
+    sections = {}
+    for i, m in enumerate(marks):
+        end = marks[i + 1].start() if i + 1 < len(marks) else len(block)
+        if m.group(1) in outputs:
+            sections[m.group(1)] = block[m.end():end].strip()
+    if not sections:
+        html = [n for n in outputs if n in html]
+        if not html:
+            # model ignored the markers: keep the whole reply under the last output
+            sections[outputs[-1]] = block
+        elif HTML_RE.search(block):
+            log.warning("⚠️ No section markers in the reply; saving it as %s", html[-1])
+            sections[html[-1]] = block
+        else:
+            log.error("❌ No section markers and no HTML in the reply for %s", ", ".join(outputs))
+    return sections
+
+def extract_and_save_blocks(content: str, agents_list: list[dict], out_dir: Path) -> list[str]:
+    """
+    Save one file per agent output and return the names saved. `agents_list` holds one entry per
+    chat turn in order; merged turns list their agents under "outputs" (default: the turn's own name).
+    """
     out_dir.mkdir(parents=True, exist_ok=True)
     footer = "No file chosenNo file chosen\nChatGPT can make mistakes. Check important info. See Cookie Preferences."
     content = content.replace(footer, "").rstrip()
     skipped, cursor = _next_block(content, 0)
+    saved = []
     if skipped is None:
-        print("⚠️ no blocks found"); return
+        log.warning("⚠️ no blocks found"); return saved
     for agent in agents_list:
         block_text, cursor = _next_block(content, cursor)
         if block_text is None: break
-        (out_dir / f"{agent['name']}.txt").write_text(block_text, encoding="utf-8")
+        outputs = agent.get("outputs") or [agent["name"]]
+        for name, text in split_sections(block_text, outputs, agent.get("html", ())).items():
+            (out_dir / f"{name}.txt").write_text(text, encoding="utf-8")
+            saved.append(name)
+    return saved
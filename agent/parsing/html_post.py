@@ -0,0 +1,165 @@
+"""
+Single-pass HTML post-processing for published article bodies.
+
+Run after metadata extraction (category/tags comments, meta description, title):
+- drops comments, doctype, <meta>/<title>/<link> and the html/head/body wrappers
+- collapses redundant whitespace (not inside pre/code/textarea/script/style)
+- re-escapes text, so bare ampersands ("S&P 500") come out as valid HTML and entities survive
+- adds loading/decoding to <img>, plus width/height and srcset/sizes when the image
+  is a WordPress media item whose sizes are known
+"""
+import re
+from html import escape
+from html.parser import HTMLParser
+
+BLOCK_TAGS = {
+    "address", "article", "aside", "blockquote", "div", "dl", "dt", "dd", "figure", "figcaption",
+    "footer", "form", "h1", "h2", "h3", "h4", "h5", "h6", "header", "hr", "li", "main", "nav",
+    "ol", "p", "pre", "section", "table", "tbody", "thead", "tfoot", "tr", "td", "th", "ul", "br",
+}
+PRESERVE_TAGS = {"pre", "code", "textarea", "script", "style"}
+DROP_TAGS = {"meta", "link", "title", "base"}
+UNWRAP_TAGS = {"html", "head", "body"}
+SPACE = re.compile(r"[ \t\n\r\f]+")  # HTML whitespace; a decoded &nbsp; must survive the collapse
+
+def _text(data: str) -> str:
+    """Decoded text back to HTML (&, <, > escaped; non-breaking spaces kept visible)."""
+    return escape(data, quote=False).replace("\xa0", "&nbsp;")
+
+def _attrs(attrs) -> str:
+    return "".join(f' {k}' if v is None else f' {k}="{escape(v, quote=True)}"' for k, v in attrs)
+
+def media_srcset(media: dict) -> tuple[str, int | None, int | None]:
+    """srcset string plus full width/height from a /wp/v2/media response."""
+    details = media.get("media_details") or {}
+    sizes = details.get("sizes") or {}
+    cands = {}
+    for s in sizes.values():
+        if s.get("source_url") and s.get("width"):
+            cands[int(s["width"])] = s["source_url"]
+    if details.get("width") and media.get("source_url"):
+        cands[int(details["width"])] = media["source_url"]
+    srcset = ", ".join(f"{url} {w}w" for w, url in sorted(cands.items()))
+    return srcset, details.get("width"), details.get("height")
+
+class _Optimizer(HTMLParser):
+    def __init__(self, media_by_src: dict):
+        super().__init__(convert_charrefs=True)
+        self.media = media_by_src
+        self.out = []
+        self.preserve = 0
+        self.dropping = 0  # inside <title> etc.
+        self.after_block = True
+        self.images = 0
+        self.stats = {"comments": 0, "dropped_tags": 0, "images": 0, "srcset": 0}
+
+    # -- helpers
+    def _emit(self, s: str, block=False):
+        self.out.append(s)
+        self.after_block = block
+
+    def _img(self, attrs):
+        d = dict(attrs)
+        self.images += 1
+        self.stats["images"] += 1
+        media = self.media.get(d.get("src") or "")
+        if media:
+            srcset, w, h = media_srcset(media)
+            if media.get("source_url"):
+                d["src"] = media["source_url"]
+            if srcset and "srcset" not in d:
+                d["srcset"] = srcset
+                d["sizes"] = f"(max-width: {w}px) 100vw, {w}px" if w else "100vw"
+                self.stats["srcset"] += 1
+            if w and h and "width" not in d and "height" not in d:
+                d["width"], d["height"] = str(w), str(h)
+        # the first image is likely above the fold; lazy-load the rest
+        d.setdefault("loading", "eager" if self.images == 1 else "lazy")
+        d.setdefault("decoding", "async")
+        return list(d.items())
+
+    # -- parser callbacks
+    def handle_starttag(self, tag, attrs):
+        if tag in DROP_TAGS:
+            self.stats["dropped_tags"] += 1
+            if tag == "title":
+                self.dropping += 1
+            return
+        if tag in UNWRAP_TAGS or self.dropping:
+            return
+        if tag == "img":
+            self._emit(f"<img{_attrs(self._img(attrs))}>")
+            return
+        if tag in PRESERVE_TAGS:
+            self.preserve += 1
+        self._emit(self.get_starttag_text(), block=tag in BLOCK_TAGS)
+
+    def handle_startendtag(self, tag, attrs):
+        if tag in DROP_TAGS:
+            self.stats["dropped_tags"] += 1
+            return
+        if tag == "img":
+            self._emit(f"<img{_attrs(self._img(attrs))}>")
+            return
+        if not self.dropping and tag not in UNWRAP_TAGS:
+            self._emit(self.get_starttag_text(), block=tag in BLOCK_TAGS)
+
+    def handle_endtag(self, tag):
+        if tag == "title":
+            self.dropping = max(0, self.dropping - 1)
+            return
+        if tag in DROP_TAGS or tag in UNWRAP_TAGS or self.dropping:
+            return
+        if tag in BLOCK_TAGS and self.out and not self.out[-1].startswith("<") and not self.preserve:
+            # trailing space before a block close is not rendered
+            self.out[-1] = self.out[-1].rstrip(" ")
+        if tag in PRESERVE_TAGS:
+            self.preserve = max(0, self.preserve - 1)
+        self._emit(f"</{tag}>", block=tag in BLOCK_TAGS)
+
+    def handle_data(self, data):
+        if self.dropping:
+            return
+        if self.cdata_elem:
+            self._emit(data)  # script/style content is raw, never decoded
+            return
+        if self.preserve:
+            self._emit(_text(data))
+            return
+        collapsed = SPACE.sub(" ", data).strip(" ")
+        if not collapsed:
+            if not self.after_block and data and (not self.out or self.out[-1] != " "):
+                self._emit(" ")
+            return
+        if SPACE.match(data) and not self.after_block and (not self.out or not self.out[-1].endswith(" ")):
+            collapsed = " " + collapsed
+        if SPACE.match(data[-1:]):
+            collapsed += " "
+        self._emit(_text(collapsed))
+
+    def handle_comment(self, data):
+        self.stats["comments"] += 1
+
+    def handle_decl(self, decl):
+        pass  # <!DOCTYPE html>
+
+    def handle_pi(self, data):
+        pass
+
+def optimize_html(html: str, media_by_src: dict | None = None, chunk_size: int = 64 * 1024) -> tuple[str, dict]:
+    """
+    Post-process `html` in one streaming pass. `media_by_src` maps an <img src> to the
+    WordPress media object it was uploaded as. Returns (html, stats).
+
+    >>> optimize_html("<p>S&P 500 &amp; AT&T,  it&#8217;s&nbsp;up &lt;1%</p>")[0]
+    '<p>S&amp;P 500 &amp; AT&amp;T, it’s&nbsp;up &lt;1%</p>'
+    >>> optimize_html("<pre>a &amp;&amp; b</pre><script>if (a && b) {}</script>")[0]
+    '<pre>a &amp;&amp; b</pre><script>if (a && b) {}</script>'
+    """
+    p = _Optimizer(media_by_src or {})
+    for i in range(0, len(html), chunk_size):
+        p.feed(html[i:i + chunk_size])
+    p.close()
+    out = "".join(p.out).strip()
+    p.stats.update(bytes_in=len(html.encode("utf-8")), bytes_out=len(out.encode("utf-8")))
+    return out, p.stats
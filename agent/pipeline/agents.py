@@ -1,13 +1,121 @@
 # This code snippet is part of a modular agent system that generates agents for a specific topic.
-# It includes a function to create a list of agents, each with a specific role and prompt related to the topic.
+# It includes a declarative pipeline of agents (role, prompt, upstream dependencies) and a planner
+# that turns it into the minimal list of chat turns for a topic.
+import json
+from pathlib import Path
+
+SECTION_MARK = "@@@ {name} @@@"
+
+AGENTS = [
+    {"name": "trend_watcher", "needs": [], "prompt": "You are an expert analyst with access to a real-time web search tool. Use your web access tool to search for today’s trending topic in : {topic}. you extract all relevant information related to this topic."},
+    {"name": "news_curator", "needs": ["trend_watcher"], "prompt": "You are a skilled analyst specializing in breaking news. Your job is to take your previous output and extract the full picture so your team can build informed reports from it.Provide a detailed summary including the event’s key facts, involved parties, timeline, geopolitical, business or cultural context if applicable."},
+    {"name": "story_fact_verifier", "needs": ["news_curator"], "prompt": "You are known for your commitment to truth and precision. You meticulously cross-check facts and sources to ensure that no misinformation is published.Validate the claims and data in the previous output to ensure all content is credible and trustworthy."},
+    {"name": "article_writer", "needs": ["news_curator", "story_fact_verifier"], "prompt": "You are a professional writer who transforms the previous outputs into clear, compelling narratives that inform and captivate readers while taking Key Corrections and Editorial Guidance from last output into consideration. Craft a well-structured, engaging, and informative article based on verified facts. Each section must include at least 3 to 4 detailed paragraphs with:- Background and historical context - Quantitative data or verified reports - Reactions or commentary from credible institutions or experts - Geopolitical and economic implicationsAvoid brief overviews. Make each section thorough and insightful.Adjust the writing style to match a journalistic and professional tone."},
+    {"name": "article_publisher", "needs": ["article_writer", "story_fact_verifier"], "prompt": "You are a WordPress article formatter. Prepare a complete HTML article from last two outputs.✅ Output format:- Output **pure HTML** with no explanations or extra text.- Use <h1> for the title, <h2> for sections, <p> for content, and <blockquote> or <cite> for quotes.- Use WordPress Newspaper theme shortcodes 📝 Include optional HTML comments like:<!-- category: Technology --><!-- tags: AI, journalism, WordPress --><meta name=\"description\" content=\"...\"> ❌ Do not return JSON ❌ Do not return Markdown ✅ Return only HTML", "html": True},
+    {"name": "seo_optimizer", "needs": ["article_publisher"], "prompt": "You are a digital marketing strategist with deep expertise in SEO best practices. You shape content that ranks well while remaining valuable and human-readable. Ensure keyphrase usage in title, slug, intro, subheading, alt tag, meta description; add 1 internal link and 2 reputable external links; avoid passive voice; keep the category/tags comments and add <!-- keyphrase: ... --> with the focus keyphrase at the top; output final HTML only.", "html": True},
+    {"name": "article_image_generator", "needs": ["article_writer"], "prompt": "Give me a prompt for a dall e model to generate an image for this article. output only the prompt without any additional text or explanation."},
+]
+
+# Pipeline definition; can be overridden with a JSON file of the same shape (PIPELINE_PATH).
+# - required: outputs consumed after the chat (publish HTML, image prompt); everything else
+#   only runs if a required agent transitively needs it
+# - merge: groups of agents asked in ONE chat turn when they end up adjacent in the plan
+# - skip: {agent_name: [categories]} where categories match the trending_topics.json key or the
+#   "Trending:/Evergreen:/Opinion:" prefix of the topic
+DEFAULT_PIPELINE = {
+    "required": ["seo_optimizer", "article_image_generator"],
+    "merge": [
+        ["trend_watcher", "news_curator"],
+        ["article_publisher", "seo_optimizer", "article_image_generator"],
+    ],
+    "skip": {},
+    "image_turn": {"prompt": "Generate this realistic image : {image_prompt}", "new_chat": False},
+}
+
+def load_pipeline(path: str | Path | None = None) -> dict:
+    pipeline = dict(DEFAULT_PIPELINE)
+    if path and Path(path).exists():
+        pipeline.update(json.loads(Path(path).read_text(encoding="utf-8")))
+    return pipeline
 
 def generate_agents_for_topic(topic: str):
-    return [
-        {"name": "trend_watcher", "prompt": f"You are an expert analyst with access to a real-time web search tool. Use your web access tool to search for today’s trending topic in : {topic}. you extract all relevant information related to this topic."},
-         {"name": "news_curator", "prompt": "You are a skilled analyst specializing in breaking news. Your job is to take your previous output and extract the full picture so your team can build informed reports from it.Provide a detailed summary including the event’s key facts, involved parties, timeline, geopolitical, business or cultural context if applicable."},
-         {"name": "story_fact_verifier", "prompt": "You are known for your commitment to truth and precision. You meticulously cross-check facts and sources to ensure that no misinformation is published.Validate the claims and data in the previous output to ensure all content is credible and trustworthy."},
-         {"name": "article_writer", "prompt": "You are a professional writer who transforms the previous outputs into clear, compelling narratives that inform and captivate readers while taking Key Corrections and Editorial Guidance from last output into consideration. Craft a well-structured, engaging, and informative article based on verified facts. Each section must include at least 3 to 4 detailed paragraphs with:- Background and historical context - Quantitative data or verified reports - Reactions or commentary from credible institutions or experts - Geopolitical and economic implicationsAvoid brief overviews. Make each section thorough and insightful.Adjust the writing style to match a journalistic and professional tone."},
-         {"name": "article_publisher", "prompt": "You are a WordPress article formatter. Prepare a complete HTML article from last two outputs.✅ Output format:- Output **pure HTML** with no explanations or extra text.- Use <h1> for the title, <h2> for sections, <p> for content, and <blockquote> or <cite> for quotes.- Use WordPress Newspaper theme shortcodes 📝 Include optional HTML comments like:<!-- category: Technology --><!-- tags: AI, journalism, WordPress --><meta name=\"description\" content=\"...\"> ❌ Do not return JSON ❌ Do not return Markdown ✅ Return only HTML"},
-         {"name": "seo_optimizer", "prompt": "You are a digital marketing strategist with deep expertise in SEO best practices. You shape content that ranks well while remaining valuable and human-readable. Ensure keyphrase usage in title, slug, intro, subheading, alt tag, meta description; add 1 internal link and 2 reputable external links; avoid passive voice; output final HTML only."},
-         {"name": "article_image_generator", "prompt": "Give me a prompt for a dall e model to generate an image for this article. output only the prompt without any additional text or explanation."},
-    ]
+    """Every agent as its own turn, in pipeline order (the original linear chain)."""
+    return [{"name": a["name"], "prompt": a["prompt"].format(topic=topic)} for a in AGENTS]
+
+def _categories(topic: str, category: str | None) -> set:
+    cats = {category} if category else set()
+    if ":" in topic:
+        cats.add(topic.split(":", 1)[0].strip())
+    return {c.lower() for c in cats}
+
+def plan_turns(topic: str, category: str | None = None, pipeline: dict | None = None) -> list[dict]:
+    """
+    Minimal list of chat turns for `topic`.
+
+    Each turn is {"name", "prompt", "agents", "outputs", "html"}; `outputs` are the agent names whose text
+    the turn's reply contains (in order), `html` those of them that are HTML. Agents merged into a turn whose output is only consumed
+    inside that same turn are folded in as instructions and not emitted.
+    """
+    pipeline = pipeline or DEFAULT_PIPELINE
+    by_name = {a["name"]: a for a in AGENTS}
+    cats = _categories(topic, category)
+    skipped = {name for name, skip_cats in pipeline.get("skip", {}).items()
+               if cats & {c.lower() for c in skip_cats}}
+
+    # required agents plus everything they transitively need, minus skipped ones
+    keep, stack = set(), [n for n in pipeline["required"] if n not in skipped]
+    while stack:
+        name = stack.pop()
+        if name in keep:
+            continue
+        keep.add(name)
+        stack.extend(n for n in by_name[name]["needs"] if n not in skipped)
+    order = [a["name"] for a in AGENTS if a["name"] in keep]
+
+    # group adjacent agents listed together in a merge rule
+    groups, i = [], 0
+    while i < len(order):
+        group = [order[i]]
+        for rule in pipeline.get("merge", []):
+            if order[i] == rule[0]:
+                members = [n for n in rule if n in keep]
+                if order[i:i + len(members)] == members:
+                    group = members
+                break
+        groups.append(group)
+        i += len(group)
+
+    required = set(pipeline["required"])
+    turns = []
+    for gi, group in enumerate(groups):
+        later = {n for g in groups[gi + 1:] for m in g for n in by_name[m]["needs"]}
+        outputs = [n for n in group if n in required or n in later or n == group[-1]]
+        prompts = [by_name[n]["prompt"].format(topic=topic) for n in group]
+        steps = "\n\n".join(f"Step {k} ({n}): {p}" for k, (n, p) in enumerate(zip(group, prompts), 1))
+        if len(group) == 1:
+            prompt = prompts[0]
+        elif len(outputs) == 1:
+            prompt = (f"Complete the following steps in order in a single reply and output only the "
+                      f"result of the last step.\n\n{steps}")
+        else:
+            marks = ", ".join(SECTION_MARK.format(name=n) for n in outputs)
+            prompt = (f"Complete the following steps in order in a single reply. "
+                      f"Only output the results of: {', '.join(outputs)}. "
+                      f"Start each of those results with its own marker line exactly as written: {marks}.\n\n{steps}")
+        turns.append({"name": "+".join(group), "prompt": prompt, "agents": group, "outputs": outputs,
+                      "html": [n for n in outputs if by_name[n].get("html")]})
+    return turns
+
+def with_context(turn: dict, outputs: dict, remaining: list[dict]) -> dict:
+    """
+    Copy of `turn` whose prompt carries cached upstream outputs still needed by the
+    `remaining` turns (used when earlier turns were answered from the response cache and
+    the chat therefore does not contain them).
+    """
+    by_name = {a["name"]: a for a in AGENTS}
+    needed = {n for t in remaining for a in t.get("agents", [t["name"]]) for n in by_name.get(a, {}).get("needs", [])}
+    parts = [f"[{name}]\n{text}" for name, text in outputs.items() if name in needed]
+    if not parts:
+        return turn
+    context = "Use these results from earlier steps as your previous outputs:\n\n" + "\n\n".join(parts)
+    return dict(turn, prompt=f"{context}\n\n{turn['prompt']}")
@@ -0,0 +1,203 @@
+"""
+Content-addressed cache of agent responses.
+
+A turn's key is sha256(topic, turn name, prompt hash, upstream digest) where the upstream
+digest chains the outputs of every earlier turn, so a cached turn is only reused when
+everything it was built on is identical. Values are the turn's outputs ({agent: text}) as
+gzip-compressed JSON under `<root>/<k[:2]>/<k>.json.gz`. Outputs that look like a failed capture
+(empty, an error page or a refusal, no HTML for an HTML output) are never stored or replayed.
+
+Off by default (RESPONSE_CACHE_TTL_HOURS=0). Drop a topic's or an article's entries with:
+
+    python -m agent.pipeline.cache invalidate --topic "Trending: ..." [--category Tech]
+    python -m agent.pipeline.cache invalidate --article article_20261019_084903_422
+    python -m agent.pipeline.cache clear
+"""
+import argparse, gzip, hashlib, json, logging, os, shutil, sys, time
+from pathlib import Path
+from ..parsing.blocks import HTML_RE
+
+log = logging.getLogger(__name__)
+
+# start of an output that is a ChatGPT error page or a refusal rather than an answer
+ERROR_MARKERS = (
+    "something went wrong", "an error occurred", "network error", "error in message stream",
+    "too many requests", "you've reached our limit", "you've hit your limit",
+    "i'm sorry, but i can't", "i'm sorry, but i cannot", "i can't help with that", "i cannot help with that",
+)
+
+def _sha(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+def turn_key(topic: str, turn: dict, upstream: str) -> str:
+    return _sha(json.dumps([topic, turn["name"], _sha(turn["prompt"]), upstream]))
+
+def invalid_reason(turn: dict, outputs: dict) -> str | None:
+    """Why `outputs` of `turn` must not be cached, or None when they look like real answers."""
+    for name, text in outputs.items():
+        if not text.strip():
+            return f"{name} is empty"
+        head = text[:300].lower().replace("\u2019", "'")
+        if any(m in head for m in ERROR_MARKERS):
+            return f"{name} looks like an error or a refusal"
+        if name in turn.get("html", ()) and not HTML_RE.search(text):
+            return f"{name} has no HTML"
+    return None
+
+def chain(upstream: str, outputs: dict) -> str:
+    """Digest of everything produced so far, fed into the next turn's key."""
+    return _sha(upstream + json.dumps(outputs, sort_keys=True))
+
+class ResponseCache:
+    def __init__(self, root: str | Path, ttl_seconds: float = 7 * 86400, max_bytes: int = 200 * 2**20):
+        self.root = Path(root)
+        self.ttl = ttl_seconds
+        self.max_bytes = max_bytes
+        self.hits = self.misses = 0
+
+    def _path(self, key: str) -> Path:
+        return self.root / key[:2] / f"{key}.json.gz"
+
+    def get(self, key: str) -> dict | None:
+        p = self._path(key)
+        try:
+            st = p.stat()
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+        if self.ttl and time.time() - st.st_mtime > self.ttl:
+            p.unlink(missing_ok=True)
+            self.misses += 1
+            return None
+        try:
+            value = json.loads(gzip.decompress(p.read_bytes()).decode("utf-8"))
+        except Exception:
+            p.unlink(missing_ok=True)
+            self.misses += 1
+            return None
+        # atime drives LRU eviction; mtime stays the creation time for the TTL
+        os.utime(p, (time.time(), st.st_mtime))
+        self.hits += 1
+        return value
+
+    def delete(self, key: str) -> dict | None:
+        """Remove an entry; returns its value (needed to walk a chain), None if absent."""
+        p = self._path(key)
+        try:
+            value = json.loads(gzip.decompress(p.read_bytes()).decode("utf-8"))
+        except FileNotFoundError:
+            return None
+        except Exception:
+            value = None
+        p.unlink(missing_ok=True)
+        return value
+
+    def put(self, key: str, outputs: dict):
+        p = self._path(key)
+        p.parent.mkdir(parents=True, exist_ok=True)
+        tmp = p.with_suffix(".tmp")
+        tmp.write_bytes(gzip.compress(json.dumps(outputs).encode("utf-8"), compresslevel=6))
+        os.replace(tmp, p)
+        self.evict()
+
+    def evict(self) -> int:
+        """Drop expired entries, then least recently used ones until under `max_bytes`."""
+        entries, total, now = [], 0, time.time()
+        for p in self.root.glob("*/*.json.gz"):
+            st = p.stat()
+            if self.ttl and now - st.st_mtime > self.ttl:
+                p.unlink(missing_ok=True)
+                continue
+            entries.append((st.st_atime, st.st_size, p))
+            total += st.st_size
+        removed = 0
+        for _, size, p in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            p.unlink(missing_ok=True)
+            total -= size
+            removed += 1
+        return removed
+
+def cached_prefix(cache: ResponseCache, topic: str, turns: list[dict], out_dir: Path):
+    """
+    Replay the longest prefix of `turns` that is cached: write its outputs to `out_dir` and
+    return (remaining turns, cached outputs, upstream digest for the first remaining turn).
+    """
+    upstream, outputs = "", {}
+    for i, turn in enumerate(turns):
+        key = turn_key(topic, turn, upstream)
+        hit = cache.get(key)
+        if hit is not None and (reason := invalid_reason(turn, hit)):
+            log.warning("🗑️ Dropping cached %s: %s", turn["name"], reason)
+            cache.delete(key)
+            hit = None
+        if hit is None:
+            return turns[i:], outputs, upstream
+        for name, text in hit.items():
+            (out_dir / f"{name}.txt").write_text(text, encoding="utf-8")
+        outputs.update(hit)
+        upstream = chain(upstream, hit)
+    return [], outputs, upstream
+
+def store_turns(cache: ResponseCache, topic: str, turns: list[dict], out_dir: Path, upstream: str):
+    """Cache the outputs of turns that just ran (read back from the parsed block files)."""
+    for turn in turns:
+        outputs = {}
+        for name in turn.get("outputs") or [turn["name"]]:
+            p = out_dir / f"{name}.txt"
+            if not p.exists():
+                return  # incomplete capture: never cache a partial chain
+            outputs[name] = p.read_text(encoding="utf-8")
+        if reason := invalid_reason(turn, outputs):
+            log.warning("⚠️ Not caching %s: %s", turn["name"], reason)
+            return  # later turns were built on it
+        cache.put(turn_key(topic, turn, upstream), outputs)
+        upstream = chain(upstream, outputs)
+
+def invalidate(cache: ResponseCache, topic: str, turns: list[dict]) -> int:
+    """Delete the cached chain of `topic` (every turn of `turns` that is cached); returns the count."""
+    upstream, removed = "", 0
+    for turn in turns:
+        outputs = cache.delete(turn_key(topic, turn, upstream))
+        if outputs is None:
+            break
+        removed += 1
+        upstream = chain(upstream, outputs)
+    return removed
+
+def main(argv=None):
+    from ..config import Settings
+    from .agents import load_pipeline, plan_turns
+    settings = Settings.default()
+    ap = argparse.ArgumentParser(description="Manage the agent response cache")
+    ap.add_argument("--dir", type=Path, default=Path(settings.response_cache_dir))
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    p = sub.add_parser("invalidate", help="drop the cached turns of one topic")
+    who = p.add_mutually_exclusive_group(required=True)
+    who.add_argument("--topic")
+    who.add_argument("--article", help="article id; its topic and category come from the catalog")
+    p.add_argument("--category", help="trending_topics.json category of --topic (only matters with skip rules)")
+    sub.add_parser("clear", help="drop every cached turn")
+    args = ap.parse_args(argv)
+
+    cache = ResponseCache(args.dir)
+    if args.cmd == "clear":
+        n = sum(1 for _ in args.dir.glob("*/*.json.gz"))
+        shutil.rmtree(args.dir, ignore_errors=True)
+        print(f"Removed {n} cached turns from {args.dir}")
+        return 0
+    topic, category = args.topic, args.category
+    if args.article:
+        from ..catalog import Catalog
+        row = Catalog(settings.catalog_path).get(args.article) if settings.catalog_path else None
+        if not row or not row.get("topic"):
+            print(f"{args.article} has no topic in the catalog", file=sys.stderr)
+            return 1
+        topic, category = row["topic"], row.get("category")
+    turns = plan_turns(topic, category, load_pipeline(settings.pipeline_path))
+    print(f"Removed {invalidate(cache, topic, turns)} cached turns for {topic!r}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
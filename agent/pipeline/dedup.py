@@ -0,0 +1,121 @@
+"""
+Near-duplicate index for topics and published articles (MinHash + LSH).
+
+Every indexed document is reduced to a 64-value MinHash signature over its normalised
+word set and bucketed into LSH bands. Documents are past topic strings and, for each
+article under `article_content/`, its headline text (title, focus keyphrase and meta
+description from `seo_optimizer.txt`). A new topic is a duplicate when the estimated
+share of its words found in an indexed document within the time window reaches the
+threshold. Queries take well under a millisecond.
+
+The index is an append-only JSONL file; `add()` and `sync()` are incremental.
+"""
+import hashlib, json, re, time
+from pathlib import Path
+
+NUM_PERM = 64
+BANDS, ROWS = 32, 2  # candidate probability 1-(1-J^2)^32: ~0.73 at J=0.2, ~0.99 at J=0.4
+_MASK = (1 << 64) - 1
+_PERMS = [(int.from_bytes(hashlib.blake2b(f"a{i}".encode(), digest_size=8).digest(), "big") | 1,
+           int.from_bytes(hashlib.blake2b(f"b{i}".encode(), digest_size=8).digest(), "big"))
+          for i in range(NUM_PERM)]
+
+STOPWORDS = set("""a an and are as at be by for from has have in into is it its of on or over
+that the their to was were will with after amid about against between during new""".split())
+PREFIX_RE = re.compile(r"^\s*(trending|evergreen|opinion)\s*:\s*", re.I)
+WORD_RE = re.compile(r"[a-z0-9][a-z0-9.%'-]*")
+
+def tokens(text: str) -> set:
+    text = PREFIX_RE.sub("", text).lower().replace("’", "'")
+    words = (w.strip(".'-") for w in WORD_RE.findall(text))
+    # crude plural folding so "tariffs"/"tariff" match
+    return {w[:-1] if len(w) > 4 and w.endswith("s") else w for w in words if w and w not in STOPWORDS}
+
+def signature(words: set) -> list[int]:
+    hashes = [int.from_bytes(hashlib.blake2b(w.encode(), digest_size=8).digest(), "big") for w in words]
+    if not hashes:
+        return [_MASK] * NUM_PERM
+    return [min(((a * h + b) & _MASK) for h in hashes) for a, b in _PERMS]
+
+def jaccard(sig1: list[int], sig2: list[int]) -> float:
+    return sum(x == y for x, y in zip(sig1, sig2)) / NUM_PERM
+
+def headline(html: str) -> str:
+    """Title, focus keyphrase and meta description of an article (no HTML parser needed)."""
+    parts = []
+    for pattern in (r"<h1[^>]*>(.*?)</h1>", r"<!--\s*(?:focus\s*)?keyphrase\s*:\s*(.*?)\s*-->",
+                    r'<meta\s+name="description"\s+content="(.*?)"'):
+        m = re.search(pattern, html, re.I | re.S)
+        if m:
+            parts.append(re.sub(r"<[^>]+>", " ", m.group(1)))
+    return " ".join(parts)
+
+class NearDupIndex:
+    def __init__(self, path: str | Path, *, threshold=0.6, window_days=14.0):
+        self.path = Path(path)
+        self.threshold = threshold
+        self.window = window_days * 86400 if window_days else None
+        self.docs = []  # {"id", "kind", "label", "t", "size", "sig"}
+        self.ids = set()
+        self._buckets = {}
+        if self.path.exists():
+            for line in self.path.read_text(encoding="utf-8").splitlines():
+                if line.strip():
+                    self._insert(json.loads(line))
+
+    def _insert(self, doc: dict):
+        i = len(self.docs)
+        self.docs.append(doc)
+        self.ids.add(doc["id"])
+        sig = doc["sig"]
+        for band in range(BANDS):
+            self._buckets.setdefault((band, *sig[band * ROWS:(band + 1) * ROWS]), []).append(i)
+
+    def add(self, doc_id: str, text: str, *, kind="topic", label=None, t=None) -> bool:
+        """Index `text` under `doc_id` (ignored if already indexed); appended to the file immediately."""
+        if doc_id in self.ids:
+            return False
+        words = tokens(text)
+        if not words:
+            return False
+        doc = {"id": doc_id, "kind": kind, "label": (label or text)[:200],
+               "t": t or time.time(), "size": len(words), "sig": signature(words)}
+        self._insert(doc)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self.path.open("a", encoding="utf-8") as f:
+            f.write(json.dumps(doc, separators=(",", ":")) + "\n")
+        return True
+
+    def sync(self, article_root: str | Path) -> int:
+        """Index published articles under `article_root` that are not in the index yet."""
+        added = 0
+        for p in Path(article_root).glob("*/seo_optimizer.txt"):
+            doc_id = f"article:{p.parent.name}"
+            if doc_id in self.ids:
+                continue
+            text = headline(p.read_text(encoding="utf-8", errors="replace"))
+            added += self.add(doc_id, text, kind="article", label=p.parent.name, t=p.stat().st_mtime)
+        return added
+
+    def query(self, text: str, now=None) -> dict | None:
+        """Best match for `text` at or above the threshold, or None."""
+        words = tokens(text)
+        if not words:
+            return None
+        sig = signature(words)
+        cutoff = (now or time.time()) - self.window if self.window else None
+        candidates = set()
+        for band in range(BANDS):
+            candidates.update(self._buckets.get((band, *sig[band * ROWS:(band + 1) * ROWS]), ()))
+        best = None
+        for i in candidates:
+            doc = self.docs[i]
+            if cutoff is not None and doc["t"] < cutoff:
+                continue
+            j = jaccard(sig, doc["sig"])
+            # share of the query's words found in the document: |A∩B| = J(|A|+|B|)/(1+J)
+            score = min(1.0, j * (len(words) + doc["size"]) / ((1 + j) * len(words)))
+            if score >= self.threshold and (best is None or score > best["score"]):
+                best = {"id": doc["id"], "kind": doc["kind"], "label": doc["label"],
+                        "score": round(score, 3), "jaccard": round(j, 3)}
+        return best
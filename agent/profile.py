@@ -0,0 +1,241 @@
+"""
+Sampling profiler for the agent's entry points.
+
+A daemon thread samples the Python stacks (`sys._current_frames`) every few milliseconds while
+the target runs, so the overhead stays around 1-2% and C extensions (mss, PIL, YOLO) show up
+under the Python call that entered them. Each sample is also tagged with a pipeline stage
+(capture, settle, encode, detect, parse, http, idle, other) from the innermost frame that matches
+the rules below; `--stage` keeps only one stage's samples, so two builds can be compared.
+
+Writes `collapsed.txt` (flamegraph.pl / speedscope input), `speedscope.json` and `top.txt` to
+`--out`, and prints the stage breakdown and the top-N functions:
+
+    python -m agent.profile run --sim --max-topics 3
+    python -m agent.profile run --max-topics 1                       # real GUI + model
+    python -m agent.profile replay screenshots/<article_id> --limit 200
+    python -m agent.profile --stage parse publish article_content/<article_id> --standin
+"""
+import argparse, json, os, sys, threading, time
+from collections import Counter
+from datetime import datetime
+from pathlib import Path
+
+# (stage, substrings of "path:function"); checked innermost frame first, first match wins
+STAGES = (
+    ("idle", ("agent/gui/backend.py:sleep", "threading.py:wait", "queue.py:get")),
+    ("http", ("/requests/", "/urllib3/", "/http/client.py", "/ssl.py", "/socket.py")),
+    ("parse", ("/bs4/", "/html/parser.py", "/lxml/", "agent/parsing/")),
+    ("detect", ("/ultralytics/", "/torch/", "/cv2/", "agent/vision/")),
+    ("encode", ("agent/artifacts.py", "Image.py:save", "PngImagePlugin", "WebPImagePlugin",
+                "JpegImagePlugin", "ImageFile.py")),
+    ("capture", ("/mss/", "agent/gui/screenshot.py", "agent/gui/xfast.py:grab", "agent/gui/backend.py:grab")),
+    ("settle", ("agent/gui/settle.py", "agent/imaging/")),
+    ("http", ("agent/wordpress/",)),
+)
+STAGE_NAMES = tuple(dict.fromkeys(name for name, _ in STAGES)) + ("other",)
+ROOT = str(Path(__file__).resolve().parents[1]) + os.sep
+
+def _label(code) -> str:
+    path = code.co_filename
+    path = path[len(ROOT):] if path.startswith(ROOT) else path
+    return f"{code.co_name} ({path}:{code.co_firstlineno})".replace(";", ",")
+
+def _stage(stack: tuple) -> str:
+    for code in reversed(stack):
+        key = f"{code.co_filename.replace(os.sep, '/')}:{code.co_name}"
+        for name, needles in STAGES:
+            if any(n in key for n in needles):
+                return name
+    return "other"
+
+class Sampler:
+    def __init__(self, interval=0.005, *, all_threads=False):
+        self.interval = interval
+        self.all_threads = all_threads
+        self.stacks = Counter()  # (thread name, (code, ...) outermost first) -> samples
+        self.samples = 0
+        self.seconds = 0.0
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _run(self, target_ident):
+        me = threading.get_ident()
+        names = {}
+        while not self._stop.wait(self.interval):
+            for ident, frame in sys._current_frames().items():
+                if ident == me or (not self.all_threads and ident != target_ident):
+                    continue
+                stack = []
+                while frame is not None:
+                    stack.append(frame.f_code)
+                    frame = frame.f_back
+                if ident not in names:
+                    names[ident] = next((t.name for t in threading.enumerate() if t.ident == ident), str(ident))
+                self.stacks[(names[ident], tuple(reversed(stack)))] += 1
+            self.samples += 1
+
+    def __enter__(self):
+        self._t0 = time.perf_counter()
+        self._thread = threading.Thread(target=self._run, args=(threading.get_ident(),),
+                                        name="profiler", daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+        self.seconds = time.perf_counter() - self._t0
+
+    # -- reports
+    def filtered(self, stage: str | None = None) -> Counter:
+        if not stage:
+            return self.stacks
+        return Counter({k: n for k, n in self.stacks.items() if _stage(k[1]) == stage})
+
+    def stages(self) -> Counter:
+        out = Counter()
+        for (_, stack), n in self.stacks.items():
+            out[_stage(stack)] += n
+        return out
+
+    def collapsed(self, stacks: Counter) -> str:
+        lines = Counter()
+        for (thread, stack), n in stacks.items():
+            lines[";".join([thread, *map(_label, stack)])] += n
+        return "".join(f"{k} {n}\n" for k, n in lines.most_common())
+
+    def speedscope(self, stacks: Counter, name: str) -> dict:
+        frames, index = [], {}
+        samples, weights = [], []
+        ms = self.interval * 1000
+        for (thread, stack), n in stacks.most_common():
+            ids = []
+            for code in stack:
+                key = _label(code)
+                if key not in index:
+                    index[key] = len(frames)
+                    frames.append({"name": code.co_name, "file": code.co_filename, "line": code.co_firstlineno})
+                ids.append(index[key])
+            samples.append(ids)
+            weights.append(n * ms)
+        total = sum(weights)
+        return {"$schema": "https://www.speedscope.app/file-format-schema.json",
+                "shared": {"frames": frames},
+                "profiles": [{"type": "sampled", "name": name, "unit": "milliseconds",
+                              "startValue": 0, "endValue": total, "samples": samples, "weights": weights}],
+                "name": name, "activeProfileIndex": 0, "exporter": "agent.profile"}
+
+    def top(self, stacks: Counter, n=25) -> list[dict]:
+        own, total = Counter(), Counter()
+        count = sum(stacks.values()) or 1
+        for (_, stack), k in stacks.items():
+            if stack:
+                own[_label(stack[-1])] += k
+            for label in set(map(_label, stack)):
+                total[label] += k
+        rows = sorted(total, key=lambda f: (own[f], total[f]), reverse=True)[:n]
+        return [{"function": f, "self_pct": round(100 * own[f] / count, 1),
+                 "total_pct": round(100 * total[f] / count, 1), "self_samples": own[f]} for f in rows]
+
+# -- targets
+def _target_run(argv):
+    ap = argparse.ArgumentParser(prog="agent.profile run")
+    ap.add_argument("--sim", action="store_true", help="use the simulated GUI backend (no X, no model)")
+    ap.add_argument("--max-topics", type=int)
+    ap.add_argument("--base-dir", default=None)
+    ap.add_argument("--no-publish", action="store_true")
+    args, rest = ap.parse_known_args(argv)
+    if args.sim:
+        sim_argv = ["--base-dir", args.base_dir or "sim_run", *rest]
+        if args.max_topics is not None:
+            sim_argv += ["--max-topics", str(args.max_topics)]
+        if not args.no_publish and os.getenv("WP_SITE_URL"):
+            sim_argv.append("--publish")
+        from .gui.sim import main as sim_main
+        return lambda: sim_main(sim_argv)
+    from .main import run
+    return lambda: run(base_dir=args.base_dir or ".", publish=not args.no_publish, max_topics=args.max_topics)
+
+def _target_replay(argv):
+    from .bench.replay import main as replay_main
+    return lambda: replay_main(argv)
+
+def _target_publish(argv):
+    ap = argparse.ArgumentParser(prog="agent.profile publish")
+    ap.add_argument("article_dir", type=Path, help="article_content/<article_id>")
+    ap.add_argument("--standin", action="store_true", help="publish to an in-process WordPress stand-in")
+    ap.add_argument("--repeat", type=int, default=1, help="publish the article N times")
+    args = ap.parse_args(argv)
+    from .catalog import Catalog, set_catalog
+    from .config import Settings
+    from .logging_setup import setup_logging
+    from .parsing.preprocess import preprocess_article
+    from .wordpress.publish import publish_article_html_auto
+    setup_logging()
+    settings = Settings.default()
+    article_id = args.article_dir.name
+    site_url = settings.wp_site_url
+    if args.standin:
+        from .wordpress.standin import make_server
+        server = make_server("127.0.0.1")
+        threading.Thread(target=server.serve_forever, name="wp-standin", daemon=True).start()
+        site_url = server.state.base_url
+    if not site_url:
+        raise SystemExit("WP_SITE_URL is not set (or pass --standin)")
+    base_dir = args.article_dir.resolve().parents[1]
+    set_catalog(Catalog(base_dir / settings.catalog_path) if settings.catalog_path else None)
+
+    def target():
+        for _ in range(args.repeat):
+            html = preprocess_article(args.article_dir, article_id)
+            publish_article_html_auto(
+                html_content=html, site_url=site_url, username=settings.wp_user or "profile",
+                app_password=settings.wp_app_password or "profile", article_id=article_id,
+                local_image_dir=base_dir / "screenshots" / "generated_images",
+                default_image_url=settings.default_image_url, verify_seo=settings.yoast_verify,
+                article_dir=args.article_dir)
+    return target
+
+TARGETS = {"run": _target_run, "replay": _target_replay, "publish": _target_publish}
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Sample-profile an agent entry point",
+                                 usage="python -m agent.profile [options] {run,replay,publish} [target args]")
+    ap.add_argument("target", choices=sorted(TARGETS))
+    ap.add_argument("args", nargs=argparse.REMAINDER, help="arguments for the target")
+    ap.add_argument("--interval-ms", type=float, default=5.0, help="sampling interval")
+    ap.add_argument("--stage", choices=STAGE_NAMES, help="keep only samples of this pipeline stage")
+    ap.add_argument("--all-threads", action="store_true", help="also sample worker threads")
+    ap.add_argument("--top", type=int, default=25)
+    ap.add_argument("--out", type=Path, help="output folder (default profiles/<target>_<time>)")
+    args = ap.parse_args(argv)
+
+    fn = TARGETS[args.target](args.args)
+    out = args.out or Path("profiles") / f"{args.target}_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+    with Sampler(args.interval_ms / 1000, all_threads=args.all_threads) as sampler:
+        try:
+            fn()
+        except SystemExit:
+            pass
+    stacks = sampler.filtered(args.stage)
+    name = f"agent.profile {args.target}" + (f" [{args.stage}]" if args.stage else "")
+    top = sampler.top(stacks, args.top)
+
+    out.mkdir(parents=True, exist_ok=True)
+    (out / "collapsed.txt").write_text(sampler.collapsed(stacks), encoding="utf-8")
+    (out / "speedscope.json").write_text(json.dumps(sampler.speedscope(stacks, name)), encoding="utf-8")
+    stages = sampler.stages()
+    total = sum(stages.values()) or 1
+    lines = [f"{name}: {sampler.seconds:.2f}s, {sampler.samples} samples every {args.interval_ms:g} ms"
+             f" ({sum(stacks.values())} kept)", "",
+             "stage      samples    share"]
+    lines += [f"{s:<9} {stages[s]:>8} {100 * stages[s] / total:>7.1f}%" for s in STAGE_NAMES if stages[s]]
+    lines += ["", f"{'self%':>6} {'total%':>7}  function"]
+    lines += [f"{r['self_pct']:>6.1f} {r['total_pct']:>7.1f}  {r['function']}" for r in top]
+    report = "\n".join(lines) + "\n"
+    (out / "top.txt").write_text(report, encoding="utf-8")
+    print(report + f"\nWrote {out}/collapsed.txt, speedscope.json, top.txt")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,85 @@
+"""
+Flight recorder for vision polls (FLIGHT_FRAMES=N).
+
+Polls keep the last N raw frames and their compact detections in a bounded in-memory ring
+instead of writing a screenshot, an annotated render and a dets.json each time. On a failure
+event (ready timeout, fallback click, publish error) or SIGUSR1 the ring is rendered with
+the detection boxes and dumped to `<article screenshots>/flight/<time>_<reason>/`.
+
+A 2560x1440 RGB frame is ~11 MB of memory, so N=20 costs ~220 MB.
+"""
+import logging, signal, time
+from collections import deque
+from datetime import datetime
+from pathlib import Path
+from PIL import Image, ImageDraw
+from .artifacts import get_store
+from .config import Settings
+
+log = logging.getLogger(__name__)
+
+COLORS = {"ready_button": "lime", "start_button": "lime", "input_zone": "deepskyblue"}
+
+def render(im: Image.Image, dets: dict) -> Image.Image:
+    """Copy of `im` with every detection box and its class/confidence drawn on it."""
+    out = im.copy()
+    draw = ImageDraw.Draw(out)
+    for cls, boxes in dets.items():
+        color = COLORS.get(cls, "orange")
+        for b in boxes:
+            x0, y0 = b["center_x"] - b["width"] // 2, b["center_y"] - b["height"] // 2
+            draw.rectangle((x0, y0, x0 + b["width"], y0 + b["height"]), outline=color, width=3)
+            draw.text((x0 + 2, max(0, y0 - 12)), f"{cls} {b['conf']:.2f}", fill=color)
+    return out
+
+class FlightRecorder:
+    def __init__(self, capacity: int):
+        self.ring = deque(maxlen=capacity)
+        self.default_dir = None  # where on-demand (signal) dumps go
+        self.dumps = 0
+
+    def record(self, im: Image.Image, dets: dict, folder: Path, t: float):
+        self.ring.append((t, Path(folder), im, dets))
+        self.default_dir = Path(folder).parent
+
+    def dump(self, reason: str, out_dir: Path | None = None) -> Path | None:
+        """Render and write the ring (oldest first); returns the dump folder."""
+        frames = list(self.ring)
+        base = Path(out_dir) if out_dir else self.default_dir
+        if not frames or base is None:
+            return None
+        t0 = time.perf_counter()
+        stamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        target = base / "flight" / f"{stamp}_{reason}"
+        store = get_store()
+        index = []
+        for i, (t, folder, im, dets) in enumerate(frames):
+            ts = datetime.fromtimestamp(t).strftime("%H%M%S_%f")[:-3]
+            stem = f"{i:03d}_{folder.name}_{ts}"
+            path = store.save_frame(render(im, dets), target, f"{stem}_ann")
+            index.append({"frame": path.name, "t": t, "step": folder.name, "dets": dets})
+        store.save_json({"reason": reason, "frames": index}, target / "flight.json")
+        self.dumps += 1
+        log.warning("🛩️ Flight recorder: %d frames dumped to %s (%s, %.1fs)",
+                    len(frames), target, reason, time.perf_counter() - t0)
+        return target
+
+    def install_signal(self, signum=signal.SIGUSR1):
+        signal.signal(signum, lambda *_: self.dump("signal"))
+
+_recorder: FlightRecorder | None = None
+_configured = False
+
+def get_recorder() -> FlightRecorder | None:
+    """The process recorder, or None when FLIGHT_FRAMES is 0 (every poll is written to disk)."""
+    global _recorder, _configured
+    if not _configured:
+        _configured = True
+        frames = Settings.default().flight_frames
+        if frames > 0:
+            _recorder = FlightRecorder(frames)
+    return _recorder
+
+def set_recorder(recorder: FlightRecorder | None):
+    global _recorder, _configured
+    _recorder, _configured = recorder, True
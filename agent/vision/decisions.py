@@ -0,0 +1,36 @@
+READY_LABELS = ("ready_button", "start_button")
+
+def collect_detections(results, names, conf=0.6) -> dict:
+    """Flatten YOLO results into {class_name: [box dict, ...]} keeping boxes >= conf."""
+    by_class = {}
+    if not results:
+        return by_class
+    for r in results:
+        # guard: some results may have no boxes
+        boxes = getattr(r, "boxes", None)
+        if not boxes:
+            continue
+        for b in boxes:
+            c = float(b.conf[0])
+            if c < conf:
+                continue
+            cls = names[int(b.cls[0])]
+            x, y, w, h = b.xywh[0].tolist()
+            by_class.setdefault(cls, []).append({
+                "center_x": int(x),
+                "center_y": int(y),
+                "width": int(w),
+                "height": int(h),
+                "conf": c,
+            })
+    return by_class
+
+def found_ready(dets: dict, labels=READY_LABELS) -> bool:
+    return any(dets.get(label) for label in labels)
+
+def pick_input_zone(dets: dict):
+    """Prefer the input_zone with the largest center_y (closest to bottom)."""
+    zs = dets.get("input_zone") or dets.get("input_zones")  # just in case
+    if not zs:
+        return None
+    return max(zs, key=lambda d: d["center_y"])
@@ -1,9 +1,58 @@
-from ultralytics import YOLO
+import logging, threading, time
 from .schema import Detection
+from .decisions import collect_detections
+
+log = logging.getLogger(__name__)
 
 class Detector:
-    def __init__(self, weights_path: str):
-        self.model = YOLO(weights_path)
+    """
+    YOLO wrapper. With `background=True` the model is loaded and warmed up with a dummy
+    frame on a daemon thread; `ready` is set when done and the first use of `model` blocks
+    until then. ultralytics/torch are only imported by that loader.
+    """
+
+    def __init__(self, weights_path: str, *, background=False, warmup_shape=(1440, 2560, 3)):
+        self.weights_path = weights_path
+        self.warmup_shape = warmup_shape
+        self.ready = threading.Event()
+        self.load_seconds = None
+        self._model = None
+        self._error = None
+        if background:
+            threading.Thread(target=self._load, name="detector-warmup", daemon=True).start()
+        else:
+            self._load()
+            if self._error is not None:
+                raise self._error
+
+    def _load(self):
+        t0 = time.perf_counter()
+        try:
+            from ultralytics import YOLO
+            import numpy as np
+            model = YOLO(self.weights_path)
+            if self.warmup_shape:
+                # first inference pays graph/allocator warm-up; do it before the first real poll
+                model(np.zeros(self.warmup_shape, dtype=np.uint8), verbose=False)
+            self._model = model
+            self.load_seconds = time.perf_counter() - t0
+            log.info("🧠 Detector ready in %.1fs (%s)", self.load_seconds, self.weights_path)
+        except Exception as e:
+            self._error = e
+            log.error("❌ Detector failed to load %s: %s", self.weights_path, e)
+        finally:
+            self.ready.set()
+
+    def wait_ready(self, timeout=None) -> bool:
+        """Block until loading finished; True if the model is usable."""
+        return self.ready.wait(timeout) and self._error is None
+
+    @property
+    def model(self):
+        self.ready.wait()
+        if self._error is not None:
+            raise RuntimeError(f"Detector failed to load {self.weights_path}") from self._error
+        return self._model
 
     def predict_map(self, image_path: str, conf=0.6) -> dict[str, Detection]:
         results = self.model(image_path)
@@ -22,3 +71,15 @@ class Detector:
 
     def raw(self, image_path: str):
         return self.model(image_path)
+
+    def detect(self, image, conf=0.6):
+        """Run inference on a path or frame; returns (raw results, {class: [box, ...]})."""
+        model = self.model
+        results = model(image, verbose=False)
+        return results, collect_detections(results, model.names, conf=conf)
+
+    def detect_batch(self, images: list, conf=0.6) -> list[dict]:
+        """One forward pass over several paths/frames; returns flattened detections per image."""
+        model = self.model
+        results = model(images, verbose=False)
+        return [collect_detections([r], model.names, conf=conf) for r in results]
@@ -0,0 +1,266 @@
+"""
+Shared local detection service.
+
+One server process owns the YOLO model; worker sessions send frames through
+`multiprocessing.shared_memory` (the pixels are never serialised) and receive compact
+detections over a local socket. Concurrent requests are micro-batched within a small
+latency window.
+
+    python -m agent.vision.service serve --weights models/best.pt --socket /tmp/agent-detector.sock
+    python -m agent.vision.service stats --socket /tmp/agent-detector.sock
+
+Workers use `DetectorClient(socket_path)` as a drop-in for `Detector` (set DETECTOR_SOCKET).
+Connections authenticate with DETECTOR_AUTHKEY, or else with a random key the server writes to
+`<socket>.key` (mode 0600, like the socket), so only the owner can drive the server.
+"""
+import argparse, logging, os, queue, secrets, sys, threading, time
+from collections import Counter
+from multiprocessing import connection, resource_tracker, shared_memory
+from ..config import Settings
+
+log = logging.getLogger(__name__)
+
+def _authkey(address: str, *, create=False) -> bytes:
+    """DETECTOR_AUTHKEY, else the key in `<address>.key` (a fresh one when the server starts)."""
+    if key := os.getenv("DETECTOR_AUTHKEY"):
+        return key.encode()
+    path = f"{address}.key"
+    if create:
+        key = secrets.token_hex(32)
+        if os.path.exists(path):
+            os.unlink(path)
+        fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+        with os.fdopen(fd, "w") as f:
+            f.write(key)
+        return key.encode()
+    try:
+        with open(path) as f:
+            return f.read().strip().encode()
+    except FileNotFoundError:
+        raise RuntimeError(f"no detection service key at {path} (is the server running, or set DETECTOR_AUTHKEY)")
+
+def _attach(name: str) -> shared_memory.SharedMemory:
+    shm = shared_memory.SharedMemory(name=name)
+    # the client owns the segment; stop this process' tracker from unlinking it on exit
+    try:
+        resource_tracker.unregister(shm._name, "shared_memory")
+    except Exception:
+        pass
+    return shm
+
+class DetectionServer:
+    def __init__(self, detector, address: str, *, window_ms=5.0, max_batch=8):
+        self.detector = detector
+        self.address = address
+        self.window = window_ms / 1000.0
+        self.max_batch = max_batch
+        self._queue = queue.Queue()
+        self._segments = {}
+        self._lock = threading.Lock()
+        self.batch_sizes = Counter()
+        self.requests = 0
+        self.latencies_ms = []
+        self.started = time.time()
+
+    # -- metrics
+    def stats(self) -> dict:
+        with self._lock:
+            batches = sum(self.batch_sizes.values())
+            lat = sorted(self.latencies_ms[-1000:])
+        return {
+            "queue_depth": self._queue.qsize(),
+            "requests": self.requests,
+            "batches": batches,
+            "mean_batch_size": round(self.requests / batches, 2) if batches else 0.0,
+            "batch_size_histogram": dict(sorted(self.batch_sizes.items())),
+            "latency_ms_p50": round(lat[len(lat) // 2], 2) if lat else 0.0,
+            "latency_ms_p95": round(lat[int(len(lat) * 0.95) - 1], 2) if lat else 0.0,
+            "uptime_s": round(time.time() - self.started, 1),
+        }
+
+    # -- batching
+    def _frame(self, name, shape, dtype):
+        import numpy as np
+        shm = self._segments.get(name)
+        if shm is None:
+            shm = self._segments[name] = _attach(name)
+        return np.ndarray(shape, dtype=dtype, buffer=shm.buf)
+
+    def _batch_loop(self):
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.perf_counter() + self.window
+            while len(batch) < self.max_batch:
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            frames = [self._frame(*req["frame"]) for req in batch]
+            try:
+                results = self.detector.detect_batch(frames, conf=min(req["conf"] for req in batch))
+                replies = [{"dets": _filter(dets, req["conf"])} for dets, req in zip(results, batch)]
+            except Exception as e:
+                replies = [{"error": repr(e)}] * len(batch)
+            del frames  # views into the segments; a segment cannot be closed while they exist
+            done = time.perf_counter()
+            with self._lock:
+                self.batch_sizes[len(batch)] += 1
+                self.requests += len(batch)
+                self.latencies_ms.extend((done - req["t0"]) * 1000 for req in batch)
+                del self.latencies_ms[:-5000]
+            for req, reply in zip(batch, replies):
+                req["reply"].put(reply)
+
+    # -- connections
+    def _release(self, name: str):
+        shm = self._segments.pop(name, None)
+        if shm is not None:
+            try:
+                shm.close()
+            except BufferError:
+                log.warning("⚠️ Segment %s still in use, left mapped", name)
+
+    def _serve_client(self, conn):
+        reply = queue.Queue(maxsize=1)
+        attached = set()  # segments of this client, released when it disconnects (even by crashing)
+        try:
+            while True:
+                msg = conn.recv()
+                if msg["op"] == "detect":
+                    attached.add(msg["frame"][0])
+                    self._queue.put({"frame": msg["frame"], "conf": msg["conf"],
+                                     "reply": reply, "t0": time.perf_counter()})
+                    conn.send(reply.get())
+                elif msg["op"] == "stats":
+                    conn.send(self.stats())
+                elif msg["op"] == "release":
+                    attached.discard(msg["name"])
+                    self._release(msg["name"])
+                    conn.send({"ok": True})
+                else:
+                    conn.send({"error": f"unknown op {msg['op']!r}"})
+        except (EOFError, ConnectionResetError, BrokenPipeError):
+            pass
+        finally:
+            for name in attached:
+                self._release(name)
+            conn.close()
+
+    def serve_forever(self):
+        threading.Thread(target=self._batch_loop, name="detector-batcher", daemon=True).start()
+        if os.path.exists(self.address):
+            os.unlink(self.address)
+        authkey = _authkey(self.address, create=True)
+        with connection.Listener(self.address, family="AF_UNIX", authkey=authkey) as listener:
+            os.chmod(self.address, 0o600)
+            log.info("🛰️ Detection service listening on %s (window %.1f ms, max batch %d)",
+                     self.address, self.window * 1000, self.max_batch)
+            while True:
+                try:
+                    conn = listener.accept()
+                except (connection.AuthenticationError, OSError) as e:
+                    log.warning("⚠️ Rejected detection client: %s", e)
+                    continue
+                threading.Thread(target=self._serve_client, args=(conn,), daemon=True).start()
+
+def _filter(dets: dict, conf: float) -> dict:
+    """Batches run at the lowest requested conf; re-apply each caller's own threshold."""
+    out = {}
+    for cls, boxes in dets.items():
+        kept = [b for b in boxes if b["conf"] >= conf]
+        if kept:
+            out[cls] = kept
+    return out
+
+class DetectorClient:
+    """Drop-in for `Detector.detect` backed by a running `DetectionServer`."""
+
+    def __init__(self, address: str):
+        self.address = address
+        self._conn = connection.Client(address, family="AF_UNIX", authkey=_authkey(address))
+        self._shm = None
+
+    def wait_ready(self, timeout=None) -> bool:
+        return True
+
+    def _to_frame(self, image):
+        import numpy as np
+        if isinstance(image, np.ndarray):
+            return np.ascontiguousarray(image)
+        from PIL import Image
+        with Image.open(image) as im:
+            # BGR, same as cv2.imread / what YOLO sees for a file path
+            return np.ascontiguousarray(np.asarray(im.convert("RGB"))[:, :, ::-1])
+
+    def _segment(self, nbytes: int):
+        if self._shm is None or self._shm.size < nbytes:
+            self.close_segment()
+            self._shm = shared_memory.SharedMemory(create=True, size=nbytes)
+        return self._shm
+
+    def detect(self, image, conf=0.6):
+        import numpy as np
+        frame = self._to_frame(image)
+        shm = self._segment(frame.nbytes)
+        np.ndarray(frame.shape, dtype=frame.dtype, buffer=shm.buf)[...] = frame
+        self._conn.send({"op": "detect", "conf": conf, "frame": (shm.name, frame.shape, frame.dtype.str)})
+        reply = self._conn.recv()
+        if "error" in reply:
+            raise RuntimeError(f"detection service error: {reply['error']}")
+        return [], reply["dets"]
+
+    def stats(self) -> dict:
+        self._conn.send({"op": "stats"})
+        return self._conn.recv()
+
+    def close_segment(self):
+        if self._shm is not None:
+            try:
+                self._conn.send({"op": "release", "name": self._shm.name})
+                self._conn.recv()
+            except (OSError, EOFError):
+                pass
+            self._shm.close()
+            self._shm.unlink()
+            self._shm = None
+
+    def close(self):
+        self.close_segment()
+        self._conn.close()
+
+def main(argv=None):
+    settings = Settings.default()
+    ap = argparse.ArgumentParser(description="Shared local YOLO detection service")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    s = sub.add_parser("serve")
+    s.add_argument("--weights", default=settings.weights_path)
+    s.add_argument("--socket", default=settings.detector_socket or "/tmp/agent-detector.sock")
+    s.add_argument("--window-ms", type=float, default=5.0, help="micro-batch collection window")
+    s.add_argument("--max-batch", type=int, default=8)
+    st = sub.add_parser("stats")
+    st.add_argument("--socket", default=settings.detector_socket or "/tmp/agent-detector.sock")
+    args = ap.parse_args(argv)
+
+    if args.cmd == "stats":
+        client = DetectorClient(args.socket)
+        for k, v in client.stats().items():
+            print(f"{k:>22}: {v}")
+        client.close()
+        return 0
+
+    from ..logging_setup import setup_logging
+    from .detector import Detector
+    setup_logging()
+    server = DetectionServer(Detector(args.weights), args.socket,
+                             window_ms=args.window_ms, max_batch=args.max_batch)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,189 @@
+"""
+Template-matching fast path in front of a YOLO detector.
+
+Once a full detection has seen `ready_button` / `start_button` / `input_zone` with high
+confidence, their crops are kept as grayscale templates. Later polls match each template
+in a small window around its last position (`cv2.matchTemplate`, a few ms) instead of
+running the network. A full detection runs again every `refresh_every` frames, when a
+tracked element's score drops into the ambiguous band, when the frame size changes, or when a
+region where an untracked class was seen changed a lot since the last full run (`refresh_diff`).
+
+The tracked classes (the ones `found_ready` and `pick_input_zone` look at) are matched on the
+fast path; other classes the last full run saw are repeated as they were, since the screen has
+not changed much, and the raw results are empty there. Only the boxes where full runs saw
+untracked classes (error banner, login button for the stall watchdog) are diffed: those widgets
+come back in the same place, while a streaming reply changes the rest of the screen on every
+poll. A class in a place never seen before waits for the next `refresh_every` full run.
+"""
+import time
+from .decisions import READY_LABELS, pick_input_zone
+
+TRACKED = (*READY_LABELS, "input_zone")
+
+class TrackingDetector:
+    """
+    Drop-in for `Detector.detect` that wraps any detector (local model or `DetectorClient`).
+
+    - `refresh_every`: at most this many fast-path frames between full detections
+    - `match_score`: normalised correlation needed to report a template as present
+    - `absent_score`: below this an element confirmed missing by the last full run stays missing;
+      scores between the two force a full detection
+    - `template_conf`: minimum YOLO confidence for a box to become a template
+    - `margin`: search window padding in pixels around the last known box
+    - `refresh_diff`: mean abs gray difference (0..255) inside any box where an untracked class
+      was seen, against the last full run, that forces a full detection; 0 disables the check
+    """
+
+    def __init__(self, detector, *, classes=TRACKED, refresh_every=10, match_score=0.85,
+                 absent_score=0.6, template_conf=0.8, margin=48, refresh_diff=12.0):
+        self.detector = detector
+        self.classes = tuple(classes)
+        self.refresh_every = refresh_every
+        self.match_score = match_score
+        self.absent_score = absent_score
+        self.template_conf = template_conf
+        self.margin = margin
+        self.refresh_diff = refresh_diff
+        self._ref = None  # downsampled gray frame of the last full run
+        self._untracked = {}  # its detections of classes without templates
+        self._watch = []  # boxes (in _ref pixels) where untracked classes have been seen
+        self._templates = {}  # class -> (gray crop, box dict)
+        self._present = set()  # classes seen by the last full run (or re-found since)
+        self._absent = {}  # class -> gray crop at its box when a full run confirmed it missing
+        self._shape = None
+        self._since_full = 0
+        self.full_runs = self.fast_runs = self.diff_refreshes = 0
+        self.full_seconds = self.fast_seconds = 0.0
+
+    def __getattr__(self, name):
+        # wait_ready, ready, detect_batch, model, ... come from the wrapped detector
+        return getattr(self.detector, name)
+
+    # -- frames
+    @staticmethod
+    def _gray(image):
+        import cv2
+        import numpy as np
+        if isinstance(image, np.ndarray):
+            return cv2.cvtColor(image, cv2.COLOR_BGR2GRAY) if image.ndim == 3 else image
+        gray = cv2.imread(str(image), cv2.IMREAD_GRAYSCALE)
+        if gray is None:
+            raise FileNotFoundError(image)
+        return gray
+
+    def _learn(self, gray, dets: dict):
+        """Refresh templates from a full detection."""
+        if gray.shape != self._shape:
+            self._watch = []
+        self._shape = gray.shape
+        self._ref = gray[::4, ::4].astype("int16")
+        self._untracked = {cls: boxes for cls, boxes in dets.items() if cls not in self.classes}
+        for boxes in self._untracked.values():
+            for b in boxes:
+                box = (max(0, (b["center_x"] - b["width"] // 2) // 4), max(0, (b["center_y"] - b["height"] // 2) // 4),
+                       (b["center_x"] + (b["width"] + 1) // 2) // 4 + 1, (b["center_y"] + (b["height"] + 1) // 2) // 4 + 1)
+                if not any(w[0] <= box[0] and w[1] <= box[1] and w[2] >= box[2] and w[3] >= box[3]
+                           for w in self._watch):
+                    self._watch = [w for w in self._watch if not (box[0] <= w[0] and box[1] <= w[1]
+                                                                  and box[2] >= w[2] and box[3] >= w[3])]
+                    self._watch.append(box)
+        self._present = {cls for cls in self.classes if dets.get(cls)}
+        for cls in self._present:
+            self._absent.pop(cls, None)
+            box = pick_input_zone(dets) if cls == "input_zone" else max(dets[cls], key=lambda d: d["conf"])
+            if box["conf"] < self.template_conf:
+                continue
+            crop = self._crop(gray, box)
+            # flat crops (blank frames) give meaningless correlation scores
+            if crop.size and crop.std() > 2.0:
+                self._templates[cls] = (crop.copy(), dict(box))
+        # what sits there instead (the stop button while a reply streams) is known not to be it
+        for cls in self._templates.keys() - self._present:
+            crop = self._crop(gray, self._templates[cls][1])
+            if crop.shape == self._templates[cls][0].shape and crop.std() > 2.0:
+                self._absent[cls] = crop.copy()
+
+    @staticmethod
+    def _crop(gray, box):
+        h, w = gray.shape
+        x0 = max(0, box["center_x"] - box["width"] // 2)
+        y0 = max(0, box["center_y"] - box["height"] // 2)
+        return gray[y0:min(h, y0 + box["height"]), x0:min(w, x0 + box["width"])]
+
+    def _match(self, gray, cls, tmpl=None):
+        import cv2
+        tmpl = self._templates[cls][0] if tmpl is None else tmpl
+        box = self._templates[cls][1]
+        th, tw = tmpl.shape
+        h, w = gray.shape
+        x0 = max(0, box["center_x"] - tw // 2 - self.margin)
+        y0 = max(0, box["center_y"] - th // 2 - self.margin)
+        x1 = min(w, box["center_x"] + (tw + 1) // 2 + self.margin)
+        y1 = min(h, box["center_y"] + (th + 1) // 2 + self.margin)
+        window = gray[y0:y1, x0:x1]
+        if window.shape[0] < th or window.shape[1] < tw:
+            return 0.0, None
+        scores = cv2.matchTemplate(window, tmpl, cv2.TM_CCOEFF_NORMED)
+        _, score, _, (mx, my) = cv2.minMaxLoc(scores)
+        found = dict(box, center_x=x0 + mx + tw // 2, center_y=y0 + my + th // 2, conf=float(score))
+        return float(score), found
+
+    def _changed(self, gray) -> float:
+        """Largest mean abs difference inside the watched boxes against the last full run's frame."""
+        small = gray[::4, ::4]
+        return max((float(abs(small[y0:y1, x0:x1].astype("int16") - self._ref[y0:y1, x0:x1]).mean())
+                    for x0, y0, x1, y1 in self._watch if x1 > x0 and y1 > y0), default=0.0)
+
+    def _fast(self, gray, conf):
+        """Detections from template matching, or None when a full run is needed."""
+        if gray.shape != self._shape or self._since_full >= self.refresh_every:
+            return None
+        if self.refresh_diff and self._changed(gray) > self.refresh_diff:
+            self.diff_refreshes += 1
+            return None  # a banner came or went where one was seen before
+        dets = {cls: kept for cls, boxes in self._untracked.items()
+                if (kept := [b for b in boxes if b["conf"] >= conf])}
+        for cls in self.classes:
+            if cls not in self._templates:
+                if cls in self._present:
+                    return None  # seen but not trackable
+                continue
+            score, found = self._match(gray, cls)
+            if score >= max(self.match_score, conf):
+                dets[cls] = [found]
+                self._templates[cls] = (self._templates[cls][0], found)
+                self._present.add(cls)
+            elif cls in self._present:
+                return None  # lost a tracked element: ask the network
+            elif score > self.absent_score and not (
+                    cls in self._absent and self._match(gray, cls, self._absent[cls])[0] >= self.match_score):
+                return None  # ambiguous, and not what the last full run saw there instead
+        return dets
+
+    def detect(self, image, conf=0.6):
+        t0 = time.perf_counter()
+        gray = self._gray(image)
+        dets = self._fast(gray, conf) if self._templates else None
+        if dets is not None:
+            self._since_full += 1
+            self.fast_runs += 1
+            self.fast_seconds += time.perf_counter() - t0
+            return [], dets
+        results, dets = self.detector.detect(image, conf=conf)
+        self._learn(gray, dets)
+        self._since_full = 0
+        self.full_runs += 1
+        self.full_seconds += time.perf_counter() - t0
+        return results, dets
+
+    def stats(self) -> dict:
+        total = self.full_runs + self.fast_runs
+        return {
+            "full_runs": self.full_runs,
+            "fast_runs": self.fast_runs,
+            "fast_ratio": round(self.fast_runs / total, 3) if total else 0.0,
+            "diff_refreshes": self.diff_refreshes,
+            "full_ms_mean": round(self.full_seconds * 1000 / self.full_runs, 2) if self.full_runs else 0.0,
+            "fast_ms_mean": round(self.fast_seconds * 1000 / self.fast_runs, 2) if self.fast_runs else 0.0,
+            "templates": sorted(self._templates),
+        }
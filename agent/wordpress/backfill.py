@@ -0,0 +1,161 @@
+"""
+Headless backfill: publish generated articles that never reached WordPress.
+
+Scans `article_content/<article_id>/seo_optimizer.txt`, skips articles the catalog already has
+a post for, and publishes the rest concurrently with the regular client code (preprocess,
+metadata, taxonomy, media, HTML post-processing, post create). Taxonomy terms and uploaded
+media are cached process-wide, so N articles sharing categories and tags cost one lookup per
+term. Each draft is created with a slug made of its title plus a short hash of its article id.
+Before publishing, a lookup of that slug finds the article's own draft left by an earlier run
+that the catalog missed, so re-runs never create duplicates, while distinct articles that share
+a title (or have none) are all published.
+
+Only the WordPress client, parsing and the catalog are imported (no torch, no GUI stack):
+
+    python -m agent.wordpress.backfill --base-dir . --workers 6
+    python -m agent.wordpress.backfill --dry-run
+"""
+import argparse, hashlib, logging, sys, threading, time, unicodedata, re
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+
+import requests
+
+from ..bench.replay import _percentile
+from ..catalog import Catalog, get_catalog, set_catalog
+from ..config import Settings
+from ..logging_setup import setup_logging, log_context
+from ..parsing.preprocess import preprocess_article
+from .auth import get_auth_headers
+from .publish import extract_metadata_from_html, publish_article_html_auto
+
+log = logging.getLogger(__name__)
+
+POST_STATUSES = "draft,pending,publish,future,private"
+
+def slugify(title: str) -> str:
+    """Close to WordPress' sanitize_title for plain-text titles."""
+    text = unicodedata.normalize("NFKD", title).encode("ascii", "ignore").decode()
+    return re.sub(r"[^a-z0-9]+", "-", text.lower()).strip("-")[:190]
+
+def article_slug(title: str, article_id: str) -> str:
+    """Title slug with a suffix only this article has, so a slug hit is always its own post."""
+    suffix = hashlib.sha1(article_id.encode("utf-8")).hexdigest()[:8]
+    return "-".join(filter(None, (slugify(title)[:180].strip("-"), suffix)))
+
+def find_post_by_slug(site_url: str, headers: dict, slug: str) -> dict | None:
+    r = requests.get(f"{site_url}/wp-json/wp/v2/posts", headers=headers, timeout=30,
+                     params={"slug": slug, "status": POST_STATUSES, "context": "edit",
+                             "_fields": "id,slug,link,title"})
+    r.raise_for_status()
+    return next((p for p in r.json() if p.get("slug") == slug), None)
+
+def find_image(base_dir: Path, article_id: str, catalog: Catalog | None) -> Path | None:
+    if catalog is not None and (image := catalog.image_for(article_id)) is not None:
+        return image
+    # one article's files, not a scan of the whole folder
+    for suffix in (".png", ".jpg", ".jpeg", ".webp"):
+        p = base_dir / "screenshots" / "generated_images" / f"{article_id}{suffix}"
+        if p.exists():
+            return p
+    return None
+
+def pending_articles(base_dir: Path, catalog: Catalog | None) -> list[Path]:
+    """Article folders with a final HTML output and no post recorded in the catalog."""
+    out = []
+    for html in sorted(Path(base_dir, "article_content").glob("*/seo_optimizer.txt")):
+        if catalog is None or not catalog.find_post(html.parent.name):
+            out.append(html.parent)
+    return out
+
+def backfill(base_dir: Path, *, site_url: str, username: str, app_password: str, workers=4,
+             limit=None, dry_run=False, default_image_url="") -> dict:
+    catalog = get_catalog()
+    headers = get_auth_headers(username, app_password)
+    todo = pending_articles(base_dir, catalog)[:limit]
+    results = {"published": [], "existing": [], "skipped": [], "failed": []}
+    latencies = []
+    lock = threading.Lock()
+    done = [0]
+
+    def one(article_dir: Path):
+        article_id = article_dir.name
+        with log_context(article_id=article_id, agent="backfill"):
+            html = preprocess_article(article_dir, article_id)
+            if not html.strip():
+                return "skipped", "empty seo_optimizer.txt"
+            meta = extract_metadata_from_html(html, default_image_url=default_image_url)
+            slug = article_slug(meta["title"], article_id)
+            existing = find_post_by_slug(site_url, headers, slug)
+            if existing:
+                if catalog is not None:
+                    catalog.article(article_id, status="published", post_id=existing["id"],
+                                    link=existing.get("link"), title=meta["title"])
+                return "existing", f"post {existing['id']} ({slug})"
+            if dry_run:
+                return "skipped", f"would publish '{meta['title']}'"
+            if catalog is not None:
+                catalog.article(article_id, created=article_dir.stat().st_mtime)
+            t0 = time.perf_counter()
+            post = publish_article_html_auto(
+                html_content=html, site_url=site_url, username=username, app_password=app_password,
+                article_id=article_id, local_image_dir=base_dir / "screenshots" / "generated_images",
+                image_path=find_image(base_dir, article_id, catalog), default_image_url=default_image_url,
+                slug=slug, article_dir=article_dir)
+            with lock:
+                latencies.append(time.perf_counter() - t0)
+            return "published", f"post {post['id']}"
+
+    t0 = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="backfill") as pool:
+        futures = {pool.submit(one, d): d.name for d in todo}
+        for f in as_completed(futures):
+            article_id = futures[f]
+            try:
+                outcome, detail = f.result()
+            except Exception as e:
+                outcome, detail = "failed", repr(e)
+            with lock:
+                results[outcome].append(article_id)
+                done[0] += 1
+                n = done[0]
+            elapsed = time.perf_counter() - t0
+            log.info("📤 [%d/%d] %s %s: %s (%.1f articles/min)", n, len(todo), article_id, outcome, detail,
+                     60 * len(results["published"]) / elapsed if elapsed else 0.0)
+    wall = time.perf_counter() - t0
+    return {
+        "pending": len(todo),
+        **{k: len(v) for k, v in results.items()},
+        "workers": workers,
+        "wall_s": round(wall, 2),
+        "articles_per_min": round(60 * len(results["published"]) / wall, 1) if wall else 0.0,
+        "publish_p50_s": round(_percentile(latencies, 0.5), 2),
+        "publish_p95_s": round(_percentile(latencies, 0.95), 2),
+        "failed_ids": results["failed"],
+    }
+
+def main(argv=None):
+    settings = Settings.default()
+    ap = argparse.ArgumentParser(description="Publish article_content folders that never reached WordPress")
+    ap.add_argument("--base-dir", type=Path, default=Path("."), help="folder holding article_content/ and screenshots/")
+    ap.add_argument("--site-url", default=settings.wp_site_url)
+    ap.add_argument("--workers", type=int, default=4)
+    ap.add_argument("--limit", type=int, help="publish at most N articles")
+    ap.add_argument("--dry-run", action="store_true", help="check what would be published, create nothing")
+    args = ap.parse_args(argv)
+    if not args.site_url:
+        ap.error("WP_SITE_URL is not set (or pass --site-url)")
+
+    setup_logging()
+    if settings.catalog_path:
+        set_catalog(Catalog(args.base_dir / settings.catalog_path))
+    report = backfill(args.base_dir, site_url=args.site_url.rstrip("/"), username=settings.wp_user,
+                      app_password=settings.wp_app_password, workers=args.workers, limit=args.limit,
+                      dry_run=args.dry_run, default_image_url=settings.default_image_url)
+    log.info("📊 Backfill: %s", ", ".join(f"{k}={v}" for k, v in report.items() if k != "failed_ids"))
+    for article_id in report["failed_ids"]:
+        log.error("❌ Not published: %s", article_id)
+    return 1 if report["failed"] else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,135 @@
+"""
+Load test for the publish path against the local WordPress stand-in.
+
+Drives concurrent `publish_article_html_auto` calls (the real client code: taxonomy
+lookups, media upload, HTML post-processing, post create) and reports throughput,
+latency percentiles and REST requests per article.
+
+    python -m agent.wordpress.loadtest --articles 200 --workers 8 --latency-ms 40 --jitter-ms 20
+    python -m agent.wordpress.loadtest --site-url http://127.0.0.1:8089   # already running stand-in
+"""
+import argparse, json, random, sys, tempfile, threading, time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+
+import requests
+from PIL import Image
+
+from ..bench.replay import _percentile
+from ..catalog import Catalog, use_catalog
+from ..logging_setup import setup_logging
+from .publish import publish_article_html_auto
+from .standin import make_server
+
+CATEGORIES = ["Technology", "Business", "Science", "Politics", "Health"]
+TAGS = ["AI", "journalism", "WordPress", "markets", "policy", "research", "energy", "climate"]
+
+def sample_article(i: int, rng: random.Random, paragraphs: int = 12) -> str:
+    tags = ", ".join(rng.sample(TAGS, 3))
+    body = "\n".join(f"<h2>Section {k}</h2>\n<p>  Paragraph {k} of article {i}: "
+                     + "lorem ipsum dolor sit amet " * 20 + "</p>" for k in range(paragraphs))
+    return (f"<!-- category: {rng.choice(CATEGORIES)} -->\n<!-- tags: {tags} -->\n"
+            f"<!-- keyphrase: load test {i} -->\n"
+            f'<meta name="description" content="Synthetic article {i} for the publish load test.">\n'
+            f"<h1>Load test article {i}</h1>\n{body}\n")
+
+def _stats(site_url: str) -> dict:
+    return requests.get(f"{site_url}/__stats", timeout=10).json()
+
+def run_load(site_url: str, *, articles=50, workers=4, seed=0) -> dict:
+    rng = random.Random(seed)
+    docs = [sample_article(i, rng) for i in range(articles)]
+    before = _stats(site_url)
+    latencies, errors = [], []
+    lock = threading.Lock()
+
+    # the run registers fake articles: keep them in a throwaway catalog, not CATALOG_PATH
+    with tempfile.TemporaryDirectory(prefix="wp-loadtest-") as tmp, \
+            use_catalog(Catalog(Path(tmp) / "catalog.sqlite")) as catalog:
+        work = Path(tmp)
+        image = work / "featured.jpg"
+        Image.new("RGB", (1792, 1008), (40, 90, 160)).save(image, quality=85)
+        # one distinct file per article (bytes after the JPEG end marker), so the media cache does
+        # not collapse the uploads into one
+        base = image.read_bytes()
+        images = []
+        for i in range(articles):
+            images.append(work / f"featured_{i}.jpg")
+            images[-1].write_bytes(base + str(i).encode())
+
+        def one(i: int):
+            s = time.perf_counter()
+            try:
+                publish_article_html_auto(html_content=docs[i], site_url=site_url, username="loadtest",
+                                          app_password="loadtest", article_id=f"article_{i}",
+                                          local_image_dir=work, image_path=images[i])
+            except Exception as e:
+                with lock:
+                    errors.append(repr(e))
+                return
+            with lock:
+                latencies.append((time.perf_counter() - s) * 1000)
+
+        t0 = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            for f in as_completed([pool.submit(one, i) for i in range(articles)]):
+                f.result()
+        wall = time.perf_counter() - t0
+        catalog.db.close()
+
+    after = _stats(site_url)
+    per_route = {k: v - before.get(k, 0) for k, v in after.items()
+                 if k != "GET /__stats" and v - before.get(k, 0)}
+    total = sum(v for k, v in per_route.items() if k != "injected_errors")
+    return {
+        "articles": articles,
+        "workers": workers,
+        "published": len(latencies),
+        "failed": len(errors),
+        "wall_seconds": round(wall, 3),
+        "articles_per_second": round(len(latencies) / wall, 2) if wall else 0.0,
+        "latency_ms_p50": round(_percentile(latencies, 0.50), 1),
+        "latency_ms_p95": round(_percentile(latencies, 0.95), 1),
+        "latency_ms_p99": round(_percentile(latencies, 0.99), 1),
+        "requests_total": total,
+        "requests_per_article": round(total / articles, 2) if articles else 0.0,
+        "requests_by_route": dict(sorted(per_route.items())),
+        "first_errors": errors[:3],
+    }
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Concurrent publish load test against the WordPress stand-in")
+    ap.add_argument("--site-url", help="use a running stand-in instead of starting one in-process")
+    ap.add_argument("--articles", type=int, default=50)
+    ap.add_argument("--workers", type=int, default=4)
+    ap.add_argument("--latency-ms", type=float, default=20.0, help="stand-in latency per request")
+    ap.add_argument("--jitter-ms", type=float, default=10.0)
+    ap.add_argument("--error-rate", type=float, default=0.0)
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--verbose", action="store_true", help="show the publish path's INFO logs")
+    ap.add_argument("--json", type=Path, help="also write the report to this file")
+    args = ap.parse_args(argv)
+    setup_logging("INFO" if args.verbose else "ERROR")
+
+    server = None
+    site_url = args.site_url
+    if not site_url:
+        server = make_server(latency_ms=args.latency_ms, jitter_ms=args.jitter_ms, error_rate=args.error_rate)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        site_url = server.state.base_url
+    try:
+        report = run_load(site_url, articles=args.articles, workers=args.workers,
+                          seed=args.seed)
+    finally:
+        if server:
+            server.shutdown()
+    report["site_url"] = site_url
+
+    for k, v in report.items():
+        print(f"{k:>22}: {v}")
+    if args.json:
+        args.json.write_text(json.dumps(report, indent=2), encoding="utf-8")
+    return 0 if not report["failed"] else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
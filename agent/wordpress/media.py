@@ -1,7 +1,35 @@
+import hashlib, logging, threading
 import requests
 from pathlib import Path
 
-def upload_featured_image(image_url: str, site_url: str, headers: dict) -> int | None:
+log = logging.getLogger(__name__)
+
+# (site_url, image URL or file SHA-256) -> uploaded media object, shared by every publish in the
+# process so a repeated image (e.g. the default featured image) is uploaded once; a fixed set of
+# striped locks (key hash) so concurrent publishes wait for an upload in flight instead of repeating it
+_MEDIA: dict[tuple, dict] = {}
+_MEDIA_LOCKS = [threading.Lock() for _ in range(32)]
+_MEDIA_LOCK = threading.Lock()
+
+def _once(key: tuple, upload) -> dict | None:
+    with _MEDIA_LOCK:
+        if key in _MEDIA:
+            return _MEDIA[key]
+    with _MEDIA_LOCKS[hash(key) % len(_MEDIA_LOCKS)]:
+        with _MEDIA_LOCK:
+            if key in _MEDIA:
+                return _MEDIA[key]
+        media = upload()
+        if media:
+            with _MEDIA_LOCK:
+                _MEDIA[key] = media
+    return media
+
+def upload_featured_media(image_url: str, site_url: str, headers: dict) -> dict | None:
+    """Upload a remote image; returns the /wp/v2/media object (id, source_url, media_details.sizes)."""
+    return _once((site_url, image_url), lambda: _upload_remote(image_url, site_url, headers))
+
+def _upload_remote(image_url: str, site_url: str, headers: dict) -> dict | None:
     try:
         image_data = requests.get(image_url, timeout=60).content
         media_headers = dict(headers)
@@ -10,12 +38,21 @@ def upload_featured_image(image_url: str, site_url: str, headers: dict) -> int |
         r = requests.post(f"{site_url}/wp-json/wp/v2/media", headers=media_headers,
                           files={"file": ("featured.jpg", image_data, "image/jpeg")}, timeout=120)
         if r.status_code == 201:
-            return r.json()["id"]
+            return r.json()
     except Exception as e:
-        print(f"⚠️ Remote image upload failed: {e}")
+        log.warning("⚠️ Remote image upload failed: %s", e)
     return None
 
-def upload_local_featured_image(image_path: Path, site_url: str, headers: dict) -> int | None:
+def upload_local_media(image_path: Path, site_url: str, headers: dict) -> dict | None:
+    """Upload a local image; returns the /wp/v2/media object."""
+    try:
+        digest = hashlib.sha256(Path(image_path).read_bytes()).hexdigest()
+    except OSError as e:
+        log.warning("⚠️ Local image unreadable: %s", e)
+        return None
+    return _once((site_url, digest), lambda: _upload_local(image_path, site_url, headers))
+
+def _upload_local(image_path: Path, site_url: str, headers: dict) -> dict | None:
     try:
         media_headers = dict(headers)
         media_headers.pop("Content-Type", None)
@@ -23,9 +60,17 @@ def upload_local_featured_image(image_path: Path, site_url: str, headers: dict)
         with open(image_path, "rb") as f:
             r = requests.post(f"{site_url}/wp-json/wp/v2/media", headers=media_headers,
                               files={"file": (image_path.name, f, "image/jpeg")}, timeout=120)
-        print(f"📤 Image upload status: {r.status_code}")
+        log.info("📤 Image upload status: %s", r.status_code)
         if r.status_code == 201:
-            return r.json()["id"]
+            return r.json()
     except Exception as e:
-        print(f"⚠️ Local image upload exception: {e}")
+        log.warning("⚠️ Local image upload exception: %s", e)
     return None
+
+def upload_featured_image(image_url: str, site_url: str, headers: dict) -> int | None:
+    media = upload_featured_media(image_url, site_url, headers)
+    return media["id"] if media else None
+
+def upload_local_featured_image(image_path: Path, site_url: str, headers: dict) -> int | None:
+    media = upload_local_media(image_path, site_url, headers)
+    return media["id"] if media else None
@@ -1,15 +1,21 @@
-import re, requests
+import json, logging, re, requests, time
 from pathlib import Path
 from bs4 import BeautifulSoup
 from .auth import get_auth_headers
 from .taxonomy import get_or_create_term_id
-from .media import upload_local_featured_image, upload_featured_image
+from .media import upload_local_media, upload_featured_media
+from .seo import derive_yoast_meta, verify_yoast_meta
+from ..parsing.html_post import optimize_html
+from ..catalog import get_catalog
+
+log = logging.getLogger(__name__)
 
 def extract_metadata_from_html(html: str, default_image_url: str):
     soup = BeautifulSoup(html, "html.parser")
     header = html[:1000]
     cat = re.search(r'<!--\s*category\s*:\s*(.*?)\s*-->', header, re.I)
     tags = re.search(r'<!--\s*tags\s*:\s*(.*?)\s*-->', header, re.I)
+    keyphrase = re.search(r'<!--\s*(?:focus\s*)?keyphrase\s*:\s*(.*?)\s*-->', header, re.I)
 
     category = (cat.group(1).strip() if cat else "Uncategorized")
     tag_list = [t.strip() for t in (tags.group(1).split(",") if tags else []) if t.strip()]
@@ -17,37 +23,73 @@ def extract_metadata_from_html(html: str, default_image_url: str):
     meta = soup.find("meta", attrs={"name": "description"})
     title_tag = soup.find("h1")
     img_tag = soup.find("img")
+    first_p = soup.find("p")
 
     return {
         "title": title_tag.get_text(strip=True) if title_tag else "Untitled Article",
         "meta_description": (meta.get("content","").strip() if meta else ""),
         "category": category,
         "tags": tag_list,
+        "keyphrase": (keyphrase.group(1).strip() if keyphrase else ""),
+        "summary": (first_p.get_text(" ", strip=True) if first_p else ""),
         "featured_image_url": (img_tag.get("src") if img_tag and img_tag.has_attr("src") else default_image_url)
     }
 
 def publish_article_html_auto(*, html_content: str, site_url: str, username: str, app_password: str,
-                              article_id: str, local_image_dir: Path, default_image_url: str = ""):
+                              article_id: str, local_image_dir: Path, default_image_url: str = "",
+                              image_path: Path | None = None, verify_seo: bool = False, slug: str | None = None,
+                              article_dir: Path | None = None):
+    """Create the article's draft. The HTML sent and its metadata are kept in `article_dir` when given."""
     headers = get_auth_headers(username, app_password)
     meta = extract_metadata_from_html(html_content, default_image_url=default_image_url or "")
+    catalog = get_catalog()
 
-    Path("debug").mkdir(exist_ok=True)
-    Path("debug/html_output.html").write_text(html_content, encoding="utf-8")
-    Path("debug/metadata.json").write_text(str(meta), encoding="utf-8")
+    if article_dir is not None:
+        article_dir = Path(article_dir)
+        article_dir.mkdir(parents=True, exist_ok=True)
+        (article_dir / "publish_input.html").write_text(html_content, encoding="utf-8")
+        (article_dir / "publish_metadata.json").write_text(json.dumps(meta, ensure_ascii=False, indent=2),
+                                                           encoding="utf-8")
 
     category_id = get_or_create_term_id(meta["category"], "categories", site_url, headers)
     tag_ids = [get_or_create_term_id(t, "tags", site_url, headers) for t in meta["tags"]]
 
     featured_media_id = None
-    local = list(local_image_dir.glob(f"{article_id}.*"))
+    media_by_src = {}
+    # image_path comes from the download watcher, else the catalog; the glob still runs when neither
+    # has one (an image Chrome finished saving after the download watcher timed out)
+    if image_path is None and catalog is not None:
+        image_path = catalog.image_for(article_id)
+    if image_path is not None:
+        local = [image_path]
+    else:
+        local = [p for p in local_image_dir.glob(f"{article_id}.*") if not p.name.endswith(".crdownload")]
+        if local and catalog is not None:
+            digest = catalog.add_artifact(article_id, "image", local[0])
+            catalog.article(article_id, image_path=str(local[0]), image_sha256=digest)
     if local:
-        featured_media_id = upload_local_featured_image(local[0], site_url, headers)
+        media = upload_local_media(local[0], site_url, headers)
     elif meta["featured_image_url"]:
-        featured_media_id = upload_featured_image(meta["featured_image_url"], site_url, headers)
+        media = upload_featured_media(meta["featured_image_url"], site_url, headers)
+        if media:
+            # the body's <img> was uploaded: serve it from WordPress with its generated sizes
+            media_by_src[meta["featured_image_url"]] = media
+    else:
+        media = None
+    if media:
+        featured_media_id = media["id"]
+
+    # metadata is extracted above; now strip comments/meta, minify and tune <img> tags
+    content, stats = optimize_html(html_content, media_by_src)
+    if article_dir is not None:
+        (article_dir / "published.html").write_text(content, encoding="utf-8")
+    log.info("🪶 HTML %d → %d bytes (%d comments, %d meta tags removed, %d images, %d with srcset)",
+             stats["bytes_in"], stats["bytes_out"], stats["comments"], stats["dropped_tags"],
+             stats["images"], stats["srcset"])
 
     post_data = {
         "title": meta["title"],
-        "content": html_content,
+        "content": content,
         "status": "draft",
         "excerpt": meta["meta_description"],
         "categories": [category_id],
@@ -56,10 +98,25 @@ def publish_article_html_auto(*, html_content: str, site_url: str, username: str
     }
     if featured_media_id:
         post_data["featured_media"] = featured_media_id
+    if slug:
+        # drafts get no slug from WordPress; setting one makes them findable (see backfill.py)
+        post_data["slug"] = slug
+    # Yoast fields ride along in the create request (no separate update round trip)
+    post_data["meta"] = derive_yoast_meta(meta)
 
     r = requests.post(f"{site_url}/wp-json/wp/v2/posts", headers=headers, json=post_data, timeout=120)
-    print(f"📬 Response status code: {r.status_code}")
-    print(f"📨 Response text: {r.text[:500]}")
+    if not r.ok:
+        log.error("📬 Post create failed: HTTP %s %s", r.status_code, r.text[:200])
     r.raise_for_status()
     post = r.json()
+    if catalog is not None:
+        for name, data in (("publish_input.html", html_content), ("published.html", content)):
+            catalog.add_artifact(article_id, "publish", article_dir / name if article_dir else None,
+                                 name=name, data=data)
+        catalog.article(article_id, status="published", published=time.time(), post_id=post["id"],
+                        media_id=featured_media_id, title=post["title"]["rendered"], link=post["link"])
+        if local:
+            catalog.article(article_id, image_path=str(local[0]))
+    if verify_seo:
+        verify_yoast_meta(site_url, post["id"], headers, post_data["meta"])
     return {"id": post["id"], "title": post["title"]["rendered"], "link": post["link"]}
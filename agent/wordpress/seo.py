@@ -0,0 +1,53 @@
+"""
+Yoast SEO fields for the production publish path.
+
+Values are derived from the extracted article metadata and sent in the post-create
+request's `meta` object (keys exposed by yoast-rest-bridge.php), so SEO costs no extra
+round trip. `verify_yoast_meta` is an optional `_fields`-restricted read-back.
+"""
+import logging
+import requests
+
+log = logging.getLogger(__name__)
+
+FOCUSKW = "_yoast_wpseo_focuskw"
+TITLE = "_yoast_wpseo_title"
+METADESC = "_yoast_wpseo_metadesc"
+
+def short_desc(text: str, max_len: int = 155) -> str:
+    text = ' '.join(text.split())
+    if len(text) <= max_len:
+        return text
+    # Try to cut at last space before max_len
+    cut = text[:max_len].rsplit(' ', 1)[0]
+    return cut if cut else text[:max_len]
+
+def derive_yoast_meta(meta: dict) -> dict:
+    """Focus keyphrase, SEO title and meta description from `extract_metadata_from_html` output."""
+    title = meta.get("title") or ""
+    keyphrase = meta.get("keyphrase") or (meta.get("tags") or [""])[0] or " ".join(title.split()[:4])
+    description = meta.get("meta_description") or meta.get("summary") or title
+    return {
+        FOCUSKW: keyphrase.strip(),
+        TITLE: short_desc(title, 60),
+        METADESC: short_desc(description),
+    }
+
+def verify_yoast_meta(site_url: str, post_id: int, headers: dict, expected: dict) -> bool:
+    """
+    Read back only id+meta and report keys that did not stick (e.g. bridge plugin missing).
+    Advisory: the post already exists, so a failed read-back is a warning, never an error.
+    """
+    try:
+        r = requests.get(f"{site_url}/wp-json/wp/v2/posts/{post_id}", headers=headers,
+                         params={"_fields": "id,meta", "context": "edit"}, timeout=30)
+        r.raise_for_status()
+        stored = r.json().get("meta") or {}
+    except (requests.RequestException, ValueError) as e:
+        log.warning("⚠️ Yoast meta read-back failed for post %s: %s", post_id, e)
+        return False
+    missing = [k for k, v in expected.items() if stored.get(k) != v]
+    if missing:
+        log.warning("⚠️ Yoast meta not stored for post %s: %s (is yoast-rest-bridge.php installed?)",
+                    post_id, ", ".join(missing))
+    return not missing
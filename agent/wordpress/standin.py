@@ -0,0 +1,227 @@
+"""
+Local WordPress REST stand-in for benchmarks and load tests.
+
+Emulates the endpoints the pipeline and the Yoast scripts use:
+/wp/v2/posts, /wp/v2/media, /wp/v2/categories, /wp/v2/tags and /yoast/v1/get_head, with configurable latency and error injection. Any Basic auth is
+accepted. GET /__stats returns request counts per endpoint.
+
+    python -m agent.wordpress.standin --port 8089 --latency-ms 40 --jitter-ms 20 --error-rate 0.02
+"""
+import argparse, json, random, re, sys, threading, time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+MEDIA_SIZES = {"thumbnail": 150, "medium": 300, "medium_large": 768, "large": 1024}
+
+class WordPressState:
+    def __init__(self, base_url: str):
+        self.base_url = base_url
+        self.lock = threading.Lock()
+        self.ids = 100
+        self.posts, self.media = {}, {}
+        self.terms = {"categories": {}, "tags": {}}
+        self.counts = Counter()
+
+    def next_id(self) -> int:
+        self.ids += 1
+        return self.ids
+
+    # -- resources
+    def create_post(self, body: dict) -> tuple[int, dict]:
+        pid = self.next_id()
+        slug = body.get("slug") or re.sub(r"[^a-z0-9]+", "-", str(body.get("title", "")).lower()).strip("-") or str(pid)
+        post = {
+            "id": pid, "slug": slug, "status": body.get("status", "draft"),
+            "link": f"{self.base_url}/?p={pid}",
+            "title": {"rendered": body.get("title", ""), "raw": body.get("title", "")},
+            "content": {"rendered": body.get("content", ""), "raw": body.get("content", "")},
+            "excerpt": {"rendered": body.get("excerpt", "")},
+            "categories": body.get("categories", []), "tags": body.get("tags", []),
+            "featured_media": body.get("featured_media", 0), "author": body.get("author", 1),
+            "meta": dict(body.get("meta") or {}),
+        }
+        self.posts[pid] = post
+        return 201, post
+
+    def update_post(self, pid: int, body: dict) -> tuple[int, dict]:
+        post = self.posts.get(pid)
+        if post is None:
+            return 404, {"code": "rest_post_invalid_id", "message": "Invalid post ID."}
+        for k, v in body.items():
+            if k == "meta":
+                post["meta"].update(v or {})
+            elif k in ("title", "content"):
+                post[k] = {"rendered": v, "raw": v}
+            else:
+                post[k] = v
+        return 200, post
+
+    def create_media(self, filename: str, size: int) -> tuple[int, dict]:
+        mid = self.next_id()
+        url = f"{self.base_url}/wp-content/uploads/{filename}"
+        stem, _, ext = filename.rpartition(".")
+        sizes = {name: {"width": w, "height": w * 9 // 16,
+                        "source_url": f"{self.base_url}/wp-content/uploads/{stem}-{w}x{w * 9 // 16}.{ext}"}
+                 for name, w in MEDIA_SIZES.items()}
+        media = {"id": mid, "source_url": url, "media_type": "image",
+                 "media_details": {"width": 1792, "height": 1008, "filesize": size, "sizes": sizes}}
+        self.media[mid] = media
+        return 201, media
+
+    def terms_search(self, kind: str, search: str) -> list:
+        s = search.lower()
+        return [t for t in self.terms[kind].values() if s in t["name"].lower()]
+
+    def create_term(self, kind: str, name: str) -> tuple[int, dict]:
+        existing = next((t for t in self.terms[kind].values() if t["name"] == name), None)
+        if existing:
+            return 400, {"code": "term_exists", "message": "A term with the name provided already exists.",
+                         "data": {"status": 400, "term_id": existing["id"]}}
+        tid = self.next_id()
+        term = {"id": tid, "name": name, "slug": re.sub(r"[^a-z0-9]+", "-", name.lower()).strip("-")}
+        self.terms[kind][tid] = term
+        return 201, term
+
+    def yoast_head(self, url: str) -> tuple[int, dict]:
+        post = next((p for p in self.posts.values() if p["link"] == url), None)
+        if post is None:
+            return 404, {"code": "wpseo_rest_api_no_url", "message": "URL not found."}
+        meta = post["meta"]
+        return 200, {"status": 200, "json": {
+            "title": meta.get("_yoast_wpseo_title") or post["title"]["raw"],
+            "description": meta.get("_yoast_wpseo_metadesc", ""),
+            "og_title": meta.get("_yoast_wpseo_title") or post["title"]["raw"],
+        }}
+
+def _fields(obj, query):
+    fields = query.get("_fields")
+    if not fields:
+        return obj
+    keep = fields[0].split(",")
+    if isinstance(obj, list):
+        return [{k: o[k] for k in keep if k in o} for o in obj]
+    return {k: obj[k] for k in keep if k in obj}
+
+def dispatch(state: WordPressState, method: str, path: str, query: dict, body) -> tuple[int, object]:
+    """Route one REST call."""
+    path = path.rstrip("/")
+    with state.lock:
+        m = re.fullmatch(r"/wp-json/wp/v2/(posts|categories|tags|media)(?:/(\d+))?", path)
+        if m:
+            kind, rid = m.group(1), int(m.group(2)) if m.group(2) else None
+            if kind == "posts":
+                if rid is None and method == "GET":
+                    items = list(state.posts.values())
+                    if "slug" in query:
+                        items = [p for p in items if p["slug"] == query["slug"][0]]
+                    return 200, _fields(items, query)
+                if rid is None and method == "POST":
+                    return state.create_post(body or {})
+                if method == "GET":
+                    post = state.posts.get(rid)
+                    return (200, _fields(post, query)) if post else (404, {"code": "rest_post_invalid_id"})
+                if method in ("POST", "PUT", "PATCH"):
+                    return state.update_post(rid, body or {})
+                if method == "DELETE":
+                    post = state.posts.pop(rid, None)
+                    return (200, {"deleted": True, "previous": post}) if post else (404, {"code": "rest_post_invalid_id"})
+            elif kind == "media":
+                if method == "POST":
+                    return state.create_media(*body)
+                media = state.media.get(rid)
+                return (200, media) if media else (404, {"code": "rest_post_invalid_id"})
+            else:
+                if method == "GET":
+                    return 200, state.terms_search(kind, query.get("search", [""])[0])
+                if method == "POST":
+                    return state.create_term(kind, (body or {}).get("name", ""))
+        if path == "/wp-json/yoast/v1/get_head" and method == "GET":
+            return state.yoast_head(query.get("url", [""])[0])
+    return 404, {"code": "rest_no_route", "message": "No route was found matching the URL and request method."}
+
+class StandInHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    state: WordPressState = None
+    latency = (0.0, 0.0)
+    error_rate = 0.0
+
+    def log_message(self, fmt, *args):
+        pass
+
+    def _send(self, status: int, obj):
+        data = json.dumps(obj).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=UTF-8")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _body(self):
+        n = int(self.headers.get("Content-Length") or 0)
+        raw = self.rfile.read(n) if n else b""
+        ctype = self.headers.get("Content-Type", "")
+        if ctype.startswith("multipart/form-data"):
+            m = re.search(rb'filename="([^"]+)"', raw)
+            return (m.group(1).decode() if m else "upload.jpg", len(raw))
+        if raw and "json" in ctype:
+            return json.loads(raw)
+        return None
+
+    def _handle(self, method: str):
+        parts = urlsplit(self.path)
+        query = parse_qs(parts.query)
+        body = self._body()
+        route = re.sub(r"/\d+", "/{id}", parts.path.rstrip("/"))
+        with self.state.lock:
+            self.state.counts[f"{method} {route}"] += 1
+        if parts.path == "/__stats":
+            with self.state.lock:
+                return self._send(200, dict(self.state.counts))
+
+        base, jitter = self.latency
+        if base or jitter:
+            time.sleep(max(0.0, base + random.uniform(-jitter, jitter)))
+        if self.error_rate and random.random() < self.error_rate:
+            with self.state.lock:
+                self.state.counts["injected_errors"] += 1
+            return self._send(random.choice((500, 502, 503)), {"code": "injected_error"})
+
+        return self._send(*dispatch(self.state, method, parts.path, query, body))
+
+    def do_GET(self): self._handle("GET")
+    def do_POST(self): self._handle("POST")
+    def do_PUT(self): self._handle("PUT")
+    def do_PATCH(self): self._handle("PATCH")
+    def do_DELETE(self): self._handle("DELETE")
+
+def make_server(host="127.0.0.1", port=0, *, latency_ms=0.0, jitter_ms=0.0, error_rate=0.0) -> ThreadingHTTPServer:
+    """Build (not start) a stand-in server; port 0 picks a free port."""
+    handler = type("Handler", (StandInHandler,), {})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    handler.state = WordPressState(f"http://{host}:{server.server_address[1]}")
+    handler.latency = (latency_ms / 1000.0, jitter_ms / 1000.0)
+    handler.error_rate = error_rate
+    server.state = handler.state
+    return server
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Local WordPress REST stand-in")
+    ap.add_argument("--host", default="127.0.0.1")
+    ap.add_argument("--port", type=int, default=8089)
+    ap.add_argument("--latency-ms", type=float, default=0.0)
+    ap.add_argument("--jitter-ms", type=float, default=0.0)
+    ap.add_argument("--error-rate", type=float, default=0.0, help="fraction of requests answered with 5xx")
+    args = ap.parse_args(argv)
+    server = make_server(args.host, args.port, latency_ms=args.latency_ms,
+                         jitter_ms=args.jitter_ms, error_rate=args.error_rate)
+    print(f"🧪 WordPress stand-in on {server.state.base_url} (WP_SITE_URL)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,12 +1,39 @@
+import threading
 import requests
 
+# (site_url, endpoint, lower-cased name) -> term id, shared by every publish in the process;
+# striped locks (key hash) so concurrent publishes wait for a lookup in flight instead of repeating it
+_TERMS: dict[tuple, int] = {}
+_TERM_LOCKS = [threading.Lock() for _ in range(32)]
+_TERMS_LOCK = threading.Lock()
+
 def get_or_create_term_id(term_name: str, endpoint: str, site_url: str, headers: dict) -> int:
+    key = (site_url, endpoint, term_name.strip().lower())
+    with _TERMS_LOCK:
+        if key in _TERMS:
+            return _TERMS[key]
+    with _TERM_LOCKS[hash(key) % len(_TERM_LOCKS)]:
+        with _TERMS_LOCK:
+            if key in _TERMS:
+                return _TERMS[key]
+        term_id = _lookup_or_create(term_name, endpoint, site_url, headers)
+        with _TERMS_LOCK:
+            _TERMS[key] = term_id
+    return term_id
+
+def _lookup_or_create(term_name: str, endpoint: str, site_url: str, headers: dict) -> int:
     url = f"{site_url}/wp-json/wp/v2/{endpoint}?search={term_name}"
     r = requests.get(url, headers=headers, timeout=30)
     r.raise_for_status()
     res = r.json()
     if isinstance(res, list) and res:
-        return res[0]["id"]
-    cr = requests.post(f"{site_url}/wp-json/wp/v2/{endpoint}", headers=headers, json={"name": term_name}, timeout=30)
-    cr.raise_for_status()
-    return cr.json()["id"]
+        term_id = res[0]["id"]
+    else:
+        cr = requests.post(f"{site_url}/wp-json/wp/v2/{endpoint}", headers=headers, json={"name": term_name}, timeout=30)
+        if cr.status_code == 400 and cr.json().get("code") == "term_exists":
+            # created concurrently (or search missed it); WordPress returns the existing id
+            term_id = cr.json()["data"]["term_id"]
+        else:
+            cr.raise_for_status()
+            term_id = cr.json()["id"]
+    return term_id
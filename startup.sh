@@ -24,6 +24,11 @@ done
 
 echo "✅ X is ready"
 
+# Start the automation early: it loads and warms up the YOLO model in the background
+# and waits for Chrome itself before the first agent turn.
+python3 -m agent.main &
+echo "🤖 agent/main.py started (model warm-up overlaps browser boot)"
+
 # Launch Fluxbox
 fluxbox > /root/fluxbox.log 2>&1 &
 echo "🎨 Fluxbox launched"
@@ -81,10 +86,6 @@ fi
 
 echo "✅ Chrome launched with persistent profile"
 
-# Start your automation script
-python3 -m agent.main &
-echo "🤖 agent/main.py started"
-
 # Start noVNC
 echo "🌐 Starting noVNC on http://localhost:6080"
 nohup /opt/novnc/utils/novnc_proxy --vnc localhost:5901 --listen 6080 > /dev/null 2>&1 &